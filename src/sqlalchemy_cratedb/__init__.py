@@ -21,12 +21,14 @@
 
 from .compat.api13 import monkeypatch_add_exec_driver_sql
 from .dialect import dialect
+from .exceptions import StatementTimeout
 from .predicate import match
+from .retry import RetryPolicy
 from .sa_version import SA_1_4, SA_VERSION
 from .support import insert_bulk
-from .type.array import ObjectArray
+from .type.array import LazyObjectArray, ObjectArray, ReadOnlyObjectArray
 from .type.geo import Geopoint, Geoshape
-from .type.object import ObjectType
+from .type.object import ObjectType, ReadOnlyObjectType
 from .type.vector import FloatVector, knn_match
 
 if SA_VERSION < SA_1_4:
@@ -72,8 +74,13 @@ __all__ = [
     FloatVector,
     Geopoint,
     Geoshape,
+    LazyObjectArray,
     ObjectArray,
     ObjectType,
+    ReadOnlyObjectArray,
+    ReadOnlyObjectType,
+    RetryPolicy,
+    StatementTimeout,
     match,
     knn_match,
     insert_bulk,
@@ -76,7 +76,7 @@ def rewrite_update(clauseelement, multiparams, params):
 
 @sa.event.listens_for(sa.engine.Engine, "before_execute", retval=True)
 def crate_before_execute(conn, clauseelement, multiparams, params, *args, **kwargs):
-    is_crate = type(conn.dialect).__name__ == "CrateDialect"
+    is_crate = conn.dialect.name == "crate"
     if is_crate and isinstance(clauseelement, sa.sql.expression.Update):
         if SA_VERSION >= SA_1_4:
             if params is None:
@@ -19,12 +19,18 @@
 # with Crate these terms will supersede the license and you may use the
 # software solely pursuant to the terms of the relevant commercial agreement.
 
+import asyncio
 import logging
+import typing as t
 import warnings
-from datetime import date, datetime, time
+import zoneinfo
+from datetime import date, datetime, time, tzinfo
+from time import monotonic, sleep
 
+from crate.client import exceptions
 from sqlalchemy import types as sqltypes
 from sqlalchemy.engine import default, reflection
+from sqlalchemy.engine import result as engine_result
 from sqlalchemy.exc import SQLAlchemyError
 from sqlalchemy.sql import functions
 from sqlalchemy.util import asbool, to_list
@@ -34,8 +40,23 @@ from .compiler import (
     CrateIdentifierPreparer,
     CrateTypeCompiler,
 )
+from .driver.cache import ServerInfoCache
+from .driver.codec import CODECS, get_codec
+from .driver.cursor import ServerSideCursor
+from .driver.jobs import kill_job, new_tag
+from .driver.limiter import AdaptiveLimiter
+from .driver.routing import NodeRouter
+from .exceptions import StatementTimeout, StatementTimeoutError
+from .retry import RetryPolicy
 from .sa_version import SA_1_4, SA_2_0, SA_VERSION
 from .type import FloatVector, ObjectArray, ObjectType
+from .type.timestamp import (
+    AwareTimestampDecoder,
+    DateDecoder,
+    TimestampDecoder,
+    get_timezone,
+    to_epoch_ms,
+)
 from .util import SSLMode
 
 # For SQLAlchemy >= 1.1.
@@ -52,8 +73,8 @@ TYPES_MAP = {
     "long": sqltypes.BIGINT,
     "bigint": sqltypes.BIGINT,
     "float": sqltypes.FLOAT,
-    "double": sqltypes.DECIMAL,
-    "double precision": sqltypes.DECIMAL,
+    "double": sqltypes.FLOAT(precision=53),
+    "double precision": sqltypes.FLOAT(precision=53),
     "real": sqltypes.REAL,
     "string": sqltypes.VARCHAR,
     "text": sqltypes.VARCHAR,
@@ -74,6 +95,8 @@ try:
     TYPES_MAP["bigint_array"] = ARRAY(sqltypes.BIGINT)
     TYPES_MAP["float_array"] = ARRAY(sqltypes.FLOAT)
     TYPES_MAP["real_array"] = ARRAY(sqltypes.REAL)
+    TYPES_MAP["double_array"] = ARRAY(sqltypes.FLOAT(precision=53))
+    TYPES_MAP["double precision_array"] = ARRAY(sqltypes.FLOAT(precision=53))
     TYPES_MAP["string_array"] = ARRAY(sqltypes.VARCHAR)
     TYPES_MAP["text_array"] = ARRAY(sqltypes.VARCHAR)
 except Exception:  # noqa: S110
@@ -96,6 +119,9 @@ log = logging.getLogger(__name__)
 
 class Date(sqltypes.Date):
     def bind_processor(self, dialect):
+        if dialect.bind_timestamps == "epoch":
+            return to_epoch_ms
+
         def process(value):
             if value is not None:
                 assert isinstance(value, date)  # noqa: S101
@@ -105,34 +131,14 @@ class Date(sqltypes.Date):
         return process
 
     def result_processor(self, dialect, coltype):
-        def process(value):
-            if not value:
-                return None
-            try:
-                return datetime.utcfromtimestamp(value / 1e3).date()
-            except TypeError:
-                pass
-
-            # Crate doesn't really have datetime or date types but a
-            # timestamp type. The "date" mapping (conversion to long)
-            # is only applied if the schema definition for the column exists
-            # and if the sql insert statement was used.
-            # In case of dynamic mapping or using the rest indexing endpoint
-            # the date will be returned in the format it was inserted.
-            log.warning(
-                "Received timestamp isn't a long value."
-                "Trying to parse as date string and then as datetime string"
-            )
-            try:
-                return datetime.strptime(value, "%Y-%m-%d").date()
-            except ValueError:
-                return datetime.strptime(value, "%Y-%m-%dT%H:%M:%S.%fZ").date()
-
-        return process
+        return DateDecoder()
 
 
 class DateTime(sqltypes.DateTime):
     def bind_processor(self, dialect):
+        if dialect.bind_timestamps == "epoch":
+            return to_epoch_ms
+
         def process(value):
             if isinstance(value, (datetime, date)):
                 return value.strftime("%Y-%m-%dT%H:%M:%S.%f%z")
@@ -141,30 +147,9 @@ class DateTime(sqltypes.DateTime):
         return process
 
     def result_processor(self, dialect, coltype):
-        def process(value):
-            if not value:
-                return None
-            try:
-                return datetime.utcfromtimestamp(value / 1e3)
-            except TypeError:
-                pass
-
-            # Crate doesn't really have datetime or date types but a
-            # timestamp type. The "date" mapping (conversion to long)
-            # is only applied if the schema definition for the column exists
-            # and if the sql insert statement was used.
-            # In case of dynamic mapping or using the rest indexing endpoint
-            # the date will be returned in the format it was inserted.
-            log.warning(
-                "Received timestamp isn't a long value."
-                "Trying to parse as datetime string and then as date string"
-            )
-            try:
-                return datetime.strptime(value, "%Y-%m-%dT%H:%M:%S.%fZ")
-            except ValueError:
-                return datetime.strptime(value, "%Y-%m-%d")
-
-        return process
+        if self.timezone and dialect.result_timezone is not None:
+            return AwareTimestampDecoder(dialect.result_timezone)
+        return TimestampDecoder()
 
 
 class Time(sqltypes.Time):
@@ -186,7 +171,20 @@ class Time(sqltypes.Time):
         return process
 
 
+class Numeric(sqltypes.Numeric):
+    def result_processor(self, dialect, coltype):
+        # CrateDB returns `DOUBLE` values as floats. Only convert them into
+        # `Decimal` objects when the column asks for them, unless turned off
+        # for all columns using `numeric_asdecimal=False`.
+        if not (self.asdecimal and dialect.numeric_asdecimal):
+            return None
+        return super().result_processor(dialect, coltype)
+
+
 colspecs = {
+    sqltypes.Numeric: Numeric,
+    # Keep `Float` types, which return floats unless using `asdecimal=True`.
+    sqltypes.Float: sqltypes.Float,
     sqltypes.Date: Date,
     sqltypes.DateTime: DateTime,
     sqltypes.TIMESTAMP: DateTime,
@@ -207,6 +205,26 @@ else:
     statement_compiler = CrateCompilerSA10
 
 
+class CrateExecutionContext(default.DefaultExecutionContext):
+    def create_server_side_cursor(self):
+        """
+        Stream results using a CrateDB cursor, in pages of `yield_per` rows.
+        """
+        page_size = (
+            self.execution_options.get("yield_per")
+            or self.execution_options.get("max_row_buffer")
+            or 1000
+        )
+        return ServerSideCursor(self._dbapi_connection.cursor(), page_size=page_size)
+
+    if SA_VERSION < SA_1_4:
+
+        def get_result_proxy(self):
+            # `ServerSideCursor` already fetches rows in pages, SQLAlchemy 1.3 would
+            # buffer them again, using its own growing fetch sizes.
+            return engine_result.ResultProxy(self)
+
+
 class CrateDialect(default.DefaultDialect):
     name = "crate"
     driver = "crate-python"
@@ -215,19 +233,67 @@ class CrateDialect(default.DefaultDialect):
     ddl_compiler = CrateDDLCompiler
     type_compiler = CrateTypeCompiler
     preparer = CrateIdentifierPreparer
+    execution_ctx_cls = CrateExecutionContext
     use_insertmanyvalues = True
     use_insertmanyvalues_wo_returning = True
     supports_multivalues_insert = True
     supports_native_boolean = True
     supports_statement_cache = True
+    supports_server_side_cursors = True
+    # Only stream results when requested, SQLAlchemy 1.3 does not define a default.
+    server_side_cursors = False
     colspecs = colspecs
     implicit_returning = True
     insert_returning = True
     update_returning = True
 
-    def __init__(self, **kwargs):
+    kill_timeout = 5.0
+    """Time limit for killing the job of a cancelled statement, in seconds."""
+
+    def __init__(
+        self,
+        retry_policy: t.Optional[RetryPolicy] = None,
+        max_content_length: int = 100 * 1024 * 1024,
+        pre_ping_window: float = 0.0,
+        server_info_ttl: float = 60.0,
+        bind_timestamps: str = "iso",
+        result_timezone: t.Optional[t.Union[str, tzinfo]] = None,
+        numeric_asdecimal: bool = True,
+        **kwargs,
+    ):
         default.DefaultDialect.__init__(self, **kwargs)
 
+        # Send `Date` and `DateTime` parameters as ISO 8601 strings, or as epoch milliseconds.
+        if bind_timestamps not in ("iso", "epoch"):
+            raise SQLAlchemyError("`bind_timestamps` parameter must be one of: iso, epoch")
+        self.bind_timestamps = bind_timestamps
+
+        # Return values of `Numeric` and `DECIMAL` columns as `Decimal` objects,
+        # when their `asdecimal` flag is set, or as floats for all columns.
+        self.numeric_asdecimal = numeric_asdecimal
+
+        # Return values of `DateTime(timezone=True)` columns as aware datetimes in this zone.
+        self.result_timezone = None
+        if result_timezone is not None:
+            try:
+                self.result_timezone = get_timezone(result_timezone)
+            except (ValueError, zoneinfo.ZoneInfoNotFoundError) as ex:
+                raise SQLAlchemyError(
+                    "`result_timezone` parameter must be a time zone: {}".format(result_timezone)
+                ) from ex
+
+        # Share node names and versions between connections for this number of seconds.
+        self.server_info_ttl = server_info_ttl
+
+        # Skip `pool_pre_ping` for connections used within this number of seconds.
+        self.pre_ping_window = pre_ping_window
+
+        # The server's `http.max_content_length` setting, used to size bulk requests.
+        self.max_content_length = max_content_length
+
+        # Retry idempotent statements on transient cluster errors.
+        self.retry_policy = retry_policy or RetryPolicy()
+
         # CrateDB does not need `OBJECT` types to be serialized as JSON.
         # Corresponding data is forwarded 1:1, and will get marshalled
         # by the low-level driver.
@@ -238,6 +304,18 @@ class CrateDialect(default.DefaultDialect):
         # start with _. Adding it here causes sqlalchemy to quote such columns.
         self.identifier_preparer.illegal_initial_characters.add("_")
 
+        # Node health and latency observations, shared by all connections.
+        self._router = None
+
+        # Limits of concurrent requests per node, shared by all connections.
+        self._limiter = None
+
+        # Node names and versions, shared by all connections.
+        self._server_info_cache = None
+
+        # Schema name from the engine URL, as `(url, schema_name)`.
+        self._effective_schema = None
+
     def get_isolation_level_values(self, dbapi_conn):
         return ()
 
@@ -297,17 +375,107 @@ class CrateDialect(default.DefaultDialect):
                 else:
                     kwargs["verify_ssl_cert"] = False
 
+        # Process options `compression` and `compression_threshold`.
+        if "compression" in kwargs or "compression_threshold" in kwargs:
+            compression = kwargs.pop("compression", "gzip")
+            threshold = kwargs.pop("compression_threshold", None)
+            if compression not in ("gzip", "none"):
+                raise SQLAlchemyError("`compression` parameter must be one of: gzip, none")
+            if compression == "none":
+                kwargs["compress"] = False
+            elif threshold is not None:
+                kwargs["compress"] = int(threshold)
+
+        # Process option `json_codec`.
+        codec_name = kwargs.pop("json_codec", "orjson")
+        if codec_name not in CODECS:
+            raise SQLAlchemyError(
+                "`json_codec` parameter must be one of: {}".format(", ".join(CODECS))
+            )
+        kwargs["codec"] = get_codec(codec_name)
+
+        # Process option `routing`.
+        if "routing" in kwargs:
+            routing = kwargs.pop("routing")
+            if routing not in ("roundrobin", "latency"):
+                raise SQLAlchemyError("`routing` parameter must be one of: roundrobin, latency")
+            if routing == "latency":
+                kwargs["router"] = self._get_router()
+
+        # Process option `concurrency`.
+        if "concurrency" in kwargs:
+            concurrency = kwargs.pop("concurrency")
+            if concurrency not in ("unlimited", "adaptive"):
+                raise SQLAlchemyError("`concurrency` parameter must be one of: unlimited, adaptive")
+            if concurrency == "adaptive":
+                kwargs["limiter"] = self._get_limiter()
+
+        if self.server_info_ttl > 0:
+            kwargs["server_info_cache"] = self._get_server_info_cache()
+
         if not servers:
-            servers = [self.dbapi.http.Client.default_server.replace("http://", "")]
+            servers = [self._get_default_server().replace("http://", "")]
         if use_ssl:
             servers = ["https://" + server for server in servers]
-        return self.dbapi.connect(servers=servers, **kwargs)
+        return self._dbapi_connect(servers=servers, **kwargs)
+
+    def _dbapi_connect(self, servers, **kwargs):
+        """
+        Connect using the dialect's amended HTTP client.
+        """
+        from .driver.client import Client
+
+        connection_kwargs = {}
+        for key in ("converter", "time_zone"):
+            if key in kwargs:
+                connection_kwargs[key] = kwargs.pop(key)
+        client = Client(servers, **kwargs)
+        return self.dbapi.connect(client=client, **connection_kwargs)
+
+    def _get_default_server(self):
+        return self.dbapi.http.Client.default_server
+
+    def _get_limiter(self):
+        if self._limiter is None:
+            self._limiter = AdaptiveLimiter()
+        return self._limiter
+
+    def _get_router(self):
+        if self._router is None:
+            self._router = NodeRouter()
+        return self._router
+
+    def _get_server_info_cache(self):
+        if self._server_info_cache is None:
+            self._server_info_cache = ServerInfoCache(ttl=self.server_info_ttl)
+        return self._server_info_cache
+
+    def do_ping(self, dbapi_connection):
+        """
+        Ping using the HTTP root endpoint, instead of an SQL round trip.
+
+        Connections which received a response within `pre_ping_window`
+        seconds are not pinged at all.
+        """
+        client = dbapi_connection.client
+        if self.pre_ping_window and monotonic() - client.last_used < self.pre_ping_window:
+            return True
+        try:
+            self._ping(client)
+        except exceptions.ConnectionError:
+            return False
+        return True
+
+    def _ping(self, client):
+        client.ping()
 
     def do_execute(self, cursor, statement, parameters, context=None):
         """
         Slightly amended to store its response into the request context instance.
         """
-        result = cursor.execute(statement, parameters)
+        result = self._invoke(
+            lambda stmt: cursor.execute(stmt, parameters), cursor, statement, parameters, context
+        )
         if context is not None:
             context.last_result = result
 
@@ -315,7 +483,7 @@ class CrateDialect(default.DefaultDialect):
         """
         Slightly amended to store its response into the request context instance.
         """
-        result = cursor.execute(statement)
+        result = self._invoke(cursor.execute, cursor, statement, None, context)
         if context is not None:
             context.last_result = result
 
@@ -323,20 +491,124 @@ class CrateDialect(default.DefaultDialect):
         """
         Slightly amended to store its response into the request context instance.
         """
-        result = cursor.executemany(statement, parameters)
+        result = self._invoke(
+            lambda stmt: cursor.executemany(stmt, parameters),
+            cursor,
+            statement,
+            parameters,
+            context,
+        )
         if context is not None:
             context.last_result = result
 
+    def _invoke(self, call, cursor, statement, parameters, context):
+        """
+        Invoke a cursor method, retrying idempotent statements on transient errors.
+
+        The number of retries is recorded as `context.retry_count`, which is
+        available to event listeners like `after_cursor_execute` and `handle_error`.
+        """
+        if context is None:
+            return call(statement)
+        options = context.execution_options
+        context.retry_count = 0
+        while True:
+            try:
+                return self._invoke_once(call, cursor, statement, parameters, options)
+            except Exception as ex:
+                policy = self.retry_policy
+                if not policy.should_retry(ex, context.retry_count):
+                    raise
+                idempotent = options.get("idempotent")
+                if idempotent is None:
+                    idempotent = policy.is_idempotent(statement)
+                if not idempotent:
+                    raise
+                delay = policy.delay(context.retry_count)
+                context.retry_count += 1
+                log.warning(
+                    "Retrying statement in %.3f seconds (retry %s of %s) after error: %s",
+                    delay,
+                    context.retry_count,
+                    policy.max_retries,
+                    ex,
+                )
+                self._sleep(delay)
+
+    def _sleep(self, delay: float):
+        sleep(delay)
+
+    def _invoke_once(self, call, cursor, statement, parameters, options):
+        """
+        Invoke a cursor method, bounded by the `timeout` execution option, in seconds.
+
+        When the statement times out, or is interrupted, its server-side job is
+        killed, unless the `kill_on_cancel` execution option is disabled. The
+        client tags the statement with the job tag, in order to find the job.
+        """
+        timeout = options.get("timeout")
+        if not options.get("kill_on_cancel", True):
+            return self._invoke_with_timeout(call, cursor, statement, parameters, timeout)
+
+        dbapi_connection = cursor.connection
+        tag = dbapi_connection.client.running_job = new_tag()
+        try:
+            return self._invoke_with_timeout(call, cursor, statement, parameters, timeout)
+        except (StatementTimeout, KeyboardInterrupt, asyncio.CancelledError):
+            # Untag first, so the statements killing the job are not tagged themselves.
+            dbapi_connection.client.running_job = None
+            kill_job(dbapi_connection, tag, timeout=self.kill_timeout)
+            raise
+        finally:
+            dbapi_connection.client.running_job = None
+
+    def _invoke_with_timeout(self, call, cursor, statement, parameters, timeout):
+        if timeout is None:
+            return call(statement)
+        try:
+            with cursor.connection.client.statement_timeout(float(timeout)):
+                return call(statement)
+        except StatementTimeoutError as ex:
+            raise StatementTimeout(statement, parameters, ex) from ex
+
+    def do_terminate(self, dbapi_connection):
+        """
+        Kill a statement still running on a connection when it gets invalidated.
+        """
+        self._kill_running_job(dbapi_connection)
+        # SQLAlchemy 1.3 does not provide `do_terminate`.
+        do_terminate = getattr(super(), "do_terminate", None)
+        if do_terminate is not None:
+            do_terminate(dbapi_connection)
+        else:
+            self.do_close(dbapi_connection)
+
+    def do_close(self, dbapi_connection):
+        self._kill_running_job(dbapi_connection)
+        super().do_close(dbapi_connection)
+
+    def _kill_running_job(self, dbapi_connection):
+        client = getattr(dbapi_connection, "client", None)
+        tag = getattr(client, "running_job", None)
+        if tag is not None:
+            client.running_job = None
+            kill_job(dbapi_connection, tag, timeout=self.kill_timeout)
+
     def _get_default_schema_name(self, connection):
         return "doc"
 
     def _get_effective_schema_name(self, connection):
-        schema_name_raw = connection.engine.url.query.get("schema")
+        # The URL of an engine is immutable, so parse its query string only once.
+        url = connection.engine.url
+        if self._effective_schema is not None and self._effective_schema[0] is url:
+            return self._effective_schema[1]
+        schema_name_raw = url.query.get("schema")
         schema_name = None
         if isinstance(schema_name_raw, str):
             schema_name = schema_name_raw
         elif isinstance(schema_name_raw, tuple):
             schema_name = schema_name_raw[0]
+        self._effective_schema = (url, schema_name)
         return schema_name
 
     def _get_server_version_info(self, connection):
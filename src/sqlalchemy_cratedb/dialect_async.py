@@ -0,0 +1,70 @@
+# -*- coding: utf-8; -*-
+#
+# Licensed to CRATE Technology GmbH ("Crate") under one or more contributor
+# license agreements.  See the NOTICE file distributed with this work for
+# additional information regarding copyright ownership.  Crate licenses
+# this file to you under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.  You may
+# obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.  See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# However, if you have executed another commercial license agreement
+# with Crate these terms will supersede the license and you may use the
+# software solely pursuant to the terms of the relevant commercial agreement.
+
+import asyncio
+
+from sqlalchemy import pool
+from sqlalchemy.util import await_only
+
+from .dialect import CrateDialect
+
+
+class CrateDialectAsync(CrateDialect):
+    """
+    Asynchronous variant of the CrateDB dialect, to be used with
+    `create_async_engine("crate+async://")`.
+    """
+
+    driver = "async"
+    is_async = True
+    supports_statement_cache = True
+    default_paramstyle = "qmark"
+
+    @classmethod
+    def import_dbapi(cls):
+        from .driver.aio import AsyncAdapt_crate_dbapi
+
+        return AsyncAdapt_crate_dbapi()
+
+    @classmethod
+    def get_pool_class(cls, url):
+        return pool.AsyncAdaptedQueuePool
+
+    def get_driver_connection(self, connection):
+        return connection._connection
+
+    def _sleep(self, delay: float):
+        # Do not block the event loop while backing off.
+        await_only(asyncio.sleep(delay))
+
+    def _ping(self, client):
+        await_only(client.ping())
+
+    def _dbapi_connect(self, servers, **kwargs):
+        return self.dbapi.connect(servers=servers, **kwargs)
+
+    def _get_default_server(self):
+        from .driver.aio import AsyncClient
+
+        return AsyncClient.default_server
+
+
+dialect = CrateDialectAsync
@@ -0,0 +1,673 @@
+# -*- coding: utf-8; -*-
+#
+# Licensed to CRATE Technology GmbH ("Crate") under one or more contributor
+# license agreements.  See the NOTICE file distributed with this work for
+# additional information regarding copyright ownership.  Crate licenses
+# this file to you under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.  You may
+# obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.  See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# However, if you have executed another commercial license agreement
+# with Crate these terms will supersede the license and you may use the
+# software solely pursuant to the terms of the relevant commercial agreement.
+"""
+## About
+Asynchronous HTTP client for CrateDB, and a DB-API adapter on top of it,
+used by the `crate+async://` SQLAlchemy dialect.
+
+## Details
+The client talks to CrateDB's HTTP interface using `httpx.AsyncClient`,
+so a single event loop can keep many requests in flight at the same time.
+The adapter classes follow the same pattern as SQLAlchemy's own asyncio
+dialects, for example `asyncpg`: DB-API calls issued by SQLAlchemy are
+bridged into the event loop using `await_only`.
+
+## References
+- https://cratedb.com/docs/crate/reference/en/latest/interfaces/http.html
+- https://docs.sqlalchemy.org/en/20/orm/extensions/asyncio.html
+"""
+
+import asyncio
+import collections
+import contextlib
+import datetime as dt
+import gzip
+import logging
+import time
+import typing as t
+
+import orjson
+from crate.client import exceptions
+from crate.client.converter import Converter, DataType
+from crate.client.cursor import Cursor
+from sqlalchemy.engine import AdaptedConnection
+from sqlalchemy.util import await_only
+from verlib2 import Version
+
+from ..exceptions import StatementTimeoutError
+from .codec import get_codec, sql_payload
+from .jobs import tag_statement
+from .limiter import is_rejection
+
+if t.TYPE_CHECKING:
+    import httpx
+
+logger = logging.getLogger(__name__)
+
+
+SRV_UNAVAILABLE_STATUSES = {502, 503, 504, 509}
+
+
+def _server_url(server: str) -> str:
+    if not server.lower().startswith(("http://", "https://")):
+        server = "http://" + server
+    return server.rstrip("/")
+
+
+def _raise_for_status(status: int, reason: str, content_type: str, data: bytes):
+    """
+    Raise DB-API exceptions from `crate.client.exceptions` for erroneous responses.
+
+    Mirrors the behaviour of the synchronous driver, so both dialect variants
+    surface the same exception types.
+    """
+    if 400 <= status < 500:
+        message = "%s Client Error: %s" % (status, reason)
+    elif 500 <= status < 600:
+        message = "%s Server Error: %s" % (status, reason)
+    else:
+        return
+    if status == 503:
+        raise exceptions.ConnectionError(message)
+    if content_type.startswith("application/json"):
+        payload = orjson.loads(data)
+        error = payload.get("error", {})
+        error_trace = payload.get("error_trace", None)
+        if "results" in payload:
+            errors = [
+                res["error_message"] for res in payload["results"] if res.get("error_message")
+            ]
+            if errors:
+                raise exceptions.ProgrammingError("\n".join(errors))
+        if isinstance(error, dict):
+            message = error.get("message", "")
+        else:
+            message = error
+        if "DuplicateKeyException" in message:
+            raise exceptions.IntegrityError(message, error_trace=error_trace)
+        raise exceptions.ProgrammingError(message, error_trace=error_trace)
+    raise exceptions.ProgrammingError(message)
+
+
+class AsyncClient:
+    """
+    CrateDB HTTP client based on `httpx.AsyncClient`.
+
+    The constructor accepts the same connection options as the synchronous
+    `crate.client.connection.Connection` where they apply to HTTP transports.
+    """
+
+    SQL_PATH = "/_sql?types=true"
+    """CrateDB URI path for issuing SQL statements."""
+
+    retry_interval = 30
+    """Retry interval for failed servers in seconds."""
+
+    default_server = "http://127.0.0.1:4200"
+    """Default server to use if no servers are given on instantiation."""
+
+    def __init__(
+        self,
+        servers=None,
+        timeout=None,
+        verify_ssl_cert=True,
+        ca_cert=None,
+        error_trace=False,
+        cert_file=None,
+        key_file=None,
+        username=None,
+        password=None,
+        schema=None,
+        pool_size=None,
+        jwt_token=None,
+        compress: t.Union[int, bool] = 8192,
+        codec=None,
+        router=None,
+        limiter=None,
+        server_info_cache=None,
+        transport=None,
+    ):
+        import httpx
+
+        if not servers:
+            servers = [self.default_server]
+        elif isinstance(servers, str):
+            servers = servers.split()
+        self._servers: t.List[str] = [_server_url(server) for server in servers]
+        self._active_servers: t.List[str] = list(self._servers)
+        self._inactive_servers: t.Dict[str, float] = {}
+        self.router = router
+
+        if jwt_token is not None and username is not None:
+            raise ValueError("Either JWT tokens are accepted, or user credentials, but not both")
+
+        headers = {"Accept": "application/json", "Content-Type": "application/json"}
+        if jwt_token is not None:
+            headers["Authorization"] = "Bearer %s" % jwt_token
+        if schema is not None:
+            headers["Default-Schema"] = schema
+        auth = None
+        if username is not None:
+            auth = httpx.BasicAuth(username, password or "")
+
+        verify: t.Union[bool, str] = bool(verify_ssl_cert)
+        if verify_ssl_cert and ca_cert:
+            verify = ca_cert
+        cert = None
+        if cert_file:
+            cert = (cert_file, key_file) if key_file else cert_file
+
+        limits = httpx.Limits()
+        if pool_size is not None:
+            limits = httpx.Limits(max_connections=int(pool_size))
+
+        if isinstance(timeout, str):
+            timeout = float(timeout)
+
+        if not isinstance(compress, (bool, int)):
+            raise TypeError(f"compress must be bool or int, got {type(compress).__name__!r}")
+
+        self.username = username
+        self.password = password
+        self.schema = schema
+        self.compress = compress
+        self.codec = codec or get_codec()
+        self.limiter = limiter
+        self.server_info_cache = server_info_cache
+        self._refresh_tasks: t.Set[asyncio.Task] = set()
+        self._timeout: t.Optional[float] = None
+        # Tag of the statement currently running, sent along with it, see `driver.jobs`.
+        self.running_job: t.Optional[str] = None
+        # Point in time of the last response, see `CrateDialect.do_ping`.
+        self.last_used = 0.0
+        # Server receiving all requests while cursors are open, see `driver.cursor`.
+        self.pinned_server: t.Optional[str] = None
+        self._pins = 0
+        # HTTP client of a single connection, used while a server is pinned.
+        self._pinned_client: t.Optional["httpx.AsyncClient"] = None
+        self.path = self.SQL_PATH
+        if error_trace:
+            self.path += "&error_trace=true"
+        self._client_options = {
+            "auth": auth,
+            "headers": headers,
+            "verify": verify,
+            "cert": cert,
+            "timeout": timeout,
+            "transport": transport,
+        }
+        self._client = httpx.AsyncClient(limits=limits, **self._client_options)
+
+    @property
+    def active_servers(self) -> t.List[str]:
+        return list(self._active_servers)
+
+    async def close(self):
+        for task in self._refresh_tasks:
+            task.cancel()
+        await self._client.aclose()
+        if self._pinned_client is not None:
+            await self._pinned_client.aclose()
+
+    async def sql(self, stmt, parameters=None, bulk_parameters=None):
+        """
+        Execute SQL statement against the CrateDB server.
+        """
+        if stmt is None:
+            return None
+        if self.running_job is not None:
+            stmt = tag_statement(self.running_job, stmt)
+        data = self.codec.dumps(sql_payload(stmt, parameters, bulk_parameters))
+        logger.debug("Sending request to %s with payload: %s", self.path, data)
+        headers = {}
+        if self.compress is True or (
+            not isinstance(self.compress, bool) and len(data) >= self.compress
+        ):
+            data = gzip.compress(data, compresslevel=6)
+            headers["Content-Encoding"] = "gzip"
+        response = await self._request("POST", self.path, content=data, headers=headers)
+        _raise_for_status(
+            response.status_code,
+            response.reason_phrase,
+            response.headers.get("content-type", ""),
+            response.content,
+        )
+        if not response.content:
+            return {}
+        return self.codec.loads(response.content)
+
+    async def server_infos(self, server):
+        cache = self.server_info_cache
+        if cache is None:
+            return await self._fetch_server_infos(server)
+        entry = cache.get(server)
+        if entry is None:
+            info = await self._fetch_server_infos(server)
+            cache.put(server, info)
+            return info
+        info, expired = entry
+        if expired and cache.begin_refresh(server):
+            task = asyncio.get_running_loop().create_task(self._refresh_server_infos(server))
+            self._refresh_tasks.add(task)
+            task.add_done_callback(self._refresh_tasks.discard)
+        return info
+
+    async def _refresh_server_infos(self, server):
+        cache = self.server_info_cache
+        try:
+            cache.put(server, await self._fetch_server_infos(server))
+        except Exception:
+            logger.debug("Failed to refresh information of server %s", server, exc_info=True)
+        finally:
+            cache.end_refresh(server)
+
+    async def _fetch_server_infos(self, server):
+        response = await self._request("GET", "/", server=server)
+        _raise_for_status(
+            response.status_code,
+            response.reason_phrase,
+            response.headers.get("content-type", ""),
+            response.content,
+        )
+        content = orjson.loads(response.content)
+        node_name = content.get("name")
+        node_version = content.get("version", {}).get("number", "0.0.0")
+        return server, node_name, node_version
+
+    async def ping(self):
+        """
+        Check the cluster is reachable, using a lightweight request to the root endpoint.
+        """
+        response = await self._request("GET", "/")
+        _raise_for_status(
+            response.status_code,
+            response.reason_phrase,
+            response.headers.get("content-type", ""),
+            response.content,
+        )
+
+    async def lowest_server_version(self) -> Version:
+        lowest = None
+        connection_errors = []
+        for server in self.active_servers:
+            try:
+                _, _, version = await self.server_infos(server)
+                version = Version(version)
+            except exceptions.ConnectionError as ex:
+                connection_errors.append(ex)
+                continue
+            except ValueError:
+                continue
+            if not lowest or version < lowest:
+                lowest = version
+        if connection_errors and not lowest:
+            raise exceptions.ConnectionError("; ".join(str(e) for e in connection_errors))
+        return lowest or Version("0.0.0")
+
+    @contextlib.contextmanager
+    def statement_timeout(self, seconds: t.Optional[float]):
+        """
+        Bound the duration of requests issued within the context, in seconds.
+        """
+        previous, self._timeout = self._timeout, seconds
+        try:
+            yield
+        finally:
+            self._timeout = previous
+
+    async def _request(self, method, path, server=None, **kwargs):
+        """
+        Issue a request to the cluster, failing over to the next server on errors.
+
+        Within a `statement_timeout` context, a read timeout is not failed over,
+        so a statement which took too long is not started again on another node.
+        """
+        import httpx
+
+        timeout = self._timeout
+        deadline = None if timeout is None else time.monotonic() + timeout
+        client = self._client if self.pinned_server is None else self._get_pinned_client()
+        while True:
+            next_server = server or self._get_server()
+            started = time.monotonic()
+            if deadline is not None:
+                if deadline <= started:
+                    raise StatementTimeoutError(
+                        "Statement exceeded timeout of %s seconds" % timeout
+                    )
+                kwargs["timeout"] = deadline - started
+            if self.limiter is not None and not await self.limiter.acquire_async(
+                next_server, None if deadline is None else deadline - started
+            ):
+                raise StatementTimeoutError("Statement exceeded timeout of %s seconds" % timeout)
+            rejected = False
+            try:
+                response = await client.request(method, next_server + path, **kwargs)
+                rejected = is_rejection(response.status_code, response.content)
+            except httpx.TransportError as ex:
+                if deadline is not None and isinstance(
+                    ex, (httpx.ReadTimeout, httpx.WriteTimeout, httpx.PoolTimeout)
+                ):
+                    raise StatementTimeoutError(
+                        "Statement exceeded timeout of %s seconds" % timeout
+                    ) from ex
+                message = str(ex) or repr(ex)
+                if server:
+                    raise exceptions.ConnectionError(
+                        "Server not available, exception: %s" % message
+                    ) from ex
+                self._drop_server(next_server, message)
+                continue
+            finally:
+                if self.limiter is not None:
+                    self.limiter.release(next_server, rejected=rejected)
+            if not server and response.status_code in SRV_UNAVAILABLE_STATUSES:
+                self._drop_server(next_server, response.reason_phrase)
+                continue
+            self.last_used = time.monotonic()
+            if not server and self.router is not None:
+                self.router.record_success(next_server, self.last_used - started)
+            return response
+
+    def pin_server(self) -> str:
+        """
+        Send all requests to the same server, over the same HTTP connection,
+        until `unpin_server` is called.
+
+        CrateDB cursors belong to the session of the HTTP connection which
+        declared them, so requests are sent using an HTTP client limited to
+        a single connection meanwhile. Calls can be nested, for example by
+        multiple open cursors.
+        """
+        if self._pins == 0:
+            self.pinned_server = self._get_server()
+        self._pins += 1
+        return self.pinned_server
+
+    def unpin_server(self):
+        self._pins -= 1
+        if self._pins == 0:
+            self.pinned_server = None
+
+    def _get_pinned_client(self) -> "httpx.AsyncClient":
+        """
+        Create the HTTP client of a single connection on first use, and keep
+        it for subsequent cursors, because closing it needs to be awaited.
+        """
+        if self._pinned_client is None:
+            import httpx
+
+            self._pinned_client = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=1, max_keepalive_connections=1),
+                **self._client_options,
+            )
+        return self._pinned_client
+
+    def _get_server(self) -> str:
+        """
+        Select the next server in round-robin order, re-adding inactive
+        servers after `retry_interval` seconds.
+
+        When a `NodeRouter` is configured, the selection is delegated to it.
+        """
+        if self.pinned_server is not None:
+            return self.pinned_server
+        if self.router is not None:
+            return self.router.select(self._servers)
+        now = time.monotonic()
+        for server, dropped_at in list(self._inactive_servers.items()):
+            if dropped_at + self.retry_interval <= now:
+                del self._inactive_servers[server]
+                self._active_servers.append(server)
+                logger.warning("Restored server %s into active pool", server)
+        if not self._active_servers:
+            server = min(self._inactive_servers, key=self._inactive_servers.__getitem__)
+            del self._inactive_servers[server]
+            self._active_servers.append(server)
+            logger.info("Restored server %s into active pool", server)
+        server = self._active_servers.pop(0)
+        self._active_servers.append(server)
+        return server
+
+    def _drop_server(self, server, message):
+        if server == self.pinned_server:
+            raise exceptions.ConnectionError(
+                "Server %s of open cursor became unavailable: %s" % (server, message)
+            )
+        if self.router is not None:
+            self.router.record_failure(server)
+            if not self.router.available(self._servers):
+                raise exceptions.ConnectionError(
+                    "No more Servers available, exception from last server: %s" % message
+                )
+            return
+        try:
+            self._active_servers.remove(server)
+        except ValueError:
+            pass
+        else:
+            self._inactive_servers[server] = time.monotonic()
+            logger.warning("Removed server %s from active pool", server)
+        if not self._active_servers:
+            raise exceptions.ConnectionError(
+                "No more Servers available, exception from last server: %s" % message
+            )
+
+    def __repr__(self):
+        return "<AsyncClient {0}>".format(str(self._active_servers))
+
+
+class AsyncAdapt_crate_cursor:
+    """
+    DB-API cursor bridging synchronous calls into `AsyncClient` coroutines.
+
+    Results are buffered completely, like with the synchronous driver.
+    """
+
+    __slots__ = (
+        "_adapt_connection",
+        "_connection",
+        "_result",
+        "_rows",
+        "arraysize",
+        "await_",
+        "description",
+        "lastrowid",
+        "rowcount",
+    )
+
+    server_side = False
+
+    def __init__(self, adapt_connection):
+        self._adapt_connection = adapt_connection
+        self._connection = adapt_connection._connection
+        self.await_ = adapt_connection.await_
+        self.arraysize = 1
+        self.description = None
+        self.lastrowid = None
+        self.rowcount = -1
+        self._rows = collections.deque()
+        # Decoded response of the last statement, like `crate.client.cursor.Cursor._result`.
+        self._result: t.Dict[str, t.Any] = {}
+
+    @property
+    def connection(self):
+        return self._adapt_connection
+
+    def close(self):
+        self._rows.clear()
+
+    async def _async_soft_close(self):
+        # Results are buffered completely, there is no server-side state to release.
+        pass
+
+    def execute(self, operation, parameters=None):
+        if parameters is not None:
+            parameters = list(parameters)
+        result = self.await_(self._connection.sql(operation, parameters))
+        self._set_result(result)
+
+    def executemany(self, operation, seq_of_parameters):
+        bulk_parameters = [list(parameters) for parameters in seq_of_parameters]
+        result = self.await_(self._connection.sql(operation, bulk_parameters=bulk_parameters))
+        row_counts = [
+            res.get("rowcount") for res in result.get("results", []) if res.get("rowcount", -1) > -1
+        ]
+        self.description = None
+        self.rowcount = sum(row_counts) if row_counts else -1
+        self._rows = collections.deque()
+        return result.get("results")
+
+    def _set_result(self, result):
+        self._result = result
+        cols = result.get("cols")
+        if cols:
+            self.description = tuple((col, None, None, None, None, None, None) for col in cols)
+        else:
+            self.description = None
+        self.rowcount = result.get("rowcount", -1)
+        rows = result.get("rows", [])
+        converter = self._adapt_connection.converter
+        if converter is not None and rows and result.get("col_types"):
+            converters = [converter.get(type_) for type_ in result["col_types"]]
+            rows = [[convert(value) for convert, value in zip(converters, row)] for row in rows]
+        self._rows = collections.deque(rows)
+
+    def setinputsizes(self, *inputsizes):
+        pass
+
+    def setoutputsize(self, size, column=None):
+        pass
+
+    def __iter__(self):
+        while self._rows:
+            yield self._rows.popleft()
+
+    def fetchone(self):
+        if self._rows:
+            return self._rows.popleft()
+        return None
+
+    def fetchmany(self, size=None):
+        if size is None:
+            size = self.arraysize
+        rows = self._rows
+        return [rows.popleft() for _ in range(min(size, len(rows)))]
+
+    def fetchall(self):
+        rows = list(self._rows)
+        self._rows.clear()
+        return rows
+
+
+class AsyncAdapt_crate_connection(AdaptedConnection):
+    """
+    DB-API connection wrapping an `AsyncClient`.
+
+    CrateDB does not support transactions, so `commit` and `rollback` are no-ops.
+    """
+
+    __slots__ = ("converter", "dbapi", "lowest_server_version")
+
+    await_ = staticmethod(await_only)
+
+    def __init__(self, dbapi, connection, lowest_server_version, converter=None):
+        self.dbapi = dbapi
+        self._connection = connection
+        self.lowest_server_version = lowest_server_version
+        # Converts result values based on their column types, like `crate.client.cursor.Cursor`.
+        self.converter = converter
+
+    @property
+    def client(self):
+        return self._connection
+
+    def cursor(self, server_side=False):
+        return AsyncAdapt_crate_cursor(self)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        self.await_(self._connection.close())
+
+
+class AsyncAdapt_crate_dbapi:
+    """
+    Module-like DB-API object for the asynchronous CrateDB driver.
+
+    The adapter uses the `qmark` parameter style, which is natively
+    understood by CrateDB's HTTP interface.
+    """
+
+    apilevel = "2.0"
+    threadsafety = 1
+    paramstyle = "qmark"
+
+    Warning = exceptions.Warning
+    Error = exceptions.Error
+    InterfaceError = exceptions.InterfaceError
+    DatabaseError = exceptions.DatabaseError
+    InternalError = exceptions.InternalError
+    OperationalError = exceptions.OperationalError
+    ProgrammingError = exceptions.ProgrammingError
+    IntegrityError = exceptions.IntegrityError
+    DataError = exceptions.DataError
+    NotSupportedError = exceptions.NotSupportedError
+
+    def connect(self, *args, **kwargs):
+        creator_fn = kwargs.pop("async_creator_fn", AsyncClient)
+        converter = _result_converter(kwargs.pop("converter", None), kwargs.pop("time_zone", None))
+        client = creator_fn(*args, **kwargs)
+        try:
+            version = await_only(client.lowest_server_version())
+        except BaseException:
+            await_only(client.close())
+            raise
+        return AsyncAdapt_crate_connection(self, client, version, converter=converter)
+
+
+def _result_converter(converter: t.Optional[Converter], time_zone) -> t.Optional[Converter]:
+    """
+    Apply the `time_zone` connection argument to the `converter` connection argument.
+
+    Like with `crate.client.connection.Connection`, timestamps are returned as
+    timezone-aware `datetime` objects when a time zone is given, which can be
+    a `tzinfo` object, or a UTC offset like `+0530`.
+    """
+    if time_zone is None:
+        return converter
+    if converter is None:
+        converter = Converter()
+    if isinstance(time_zone, str):
+        time_zone = Cursor._timezone_from_utc_offset(time_zone)
+
+    def to_datetime(value: t.Optional[float]) -> t.Optional[dt.datetime]:
+        if value is None:
+            return None
+        return dt.datetime.fromtimestamp(value / 1e3, tz=time_zone)
+
+    converter.set(DataType.TIMESTAMP_WITH_TZ, to_datetime)
+    converter.set(DataType.TIMESTAMP_WITHOUT_TZ, to_datetime)
+    return converter
@@ -0,0 +1,86 @@
+# -*- coding: utf-8; -*-
+#
+# Licensed to CRATE Technology GmbH ("Crate") under one or more contributor
+# license agreements.  See the NOTICE file distributed with this work for
+# additional information regarding copyright ownership.  Crate licenses
+# this file to you under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.  You may
+# obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.  See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# However, if you have executed another commercial license agreement
+# with Crate these terms will supersede the license and you may use the
+# software solely pursuant to the terms of the relevant commercial agreement.
+"""
+## About
+Engine-wide cache of server information, like node names and versions.
+
+## Details
+Each new DB-API connection inquires the version of all cluster nodes,
+in order to determine the lowest one. When a pool creates many
+connections at once, for example after a deployment, this becomes a
+burst of requests. The cache shares the responses between all
+connections of an engine.
+
+Expired entries are served while they are refreshed in the background
+("stale-while-revalidate"), so only the first connection to a node
+waits for its response.
+"""
+
+import threading
+import time
+import typing as t
+
+ServerInfo = t.Tuple[str, str, str]
+
+
+class ServerInfoCache:
+    """
+    Cache `(server, node_name, node_version)` tuples per server, for `ttl` seconds.
+    """
+
+    def __init__(self, ttl: float = 60.0):
+        self.ttl = ttl
+        self._entries: t.Dict[str, t.Tuple[ServerInfo, float]] = {}
+        self._refreshing: t.Set[str] = set()
+        self._lock = threading.Lock()
+
+    def get(self, server: str) -> t.Optional[t.Tuple[ServerInfo, bool]]:
+        """
+        Return the cached information of a server, and whether it expired.
+        """
+        with self._lock:
+            entry = self._entries.get(server)
+        if entry is None:
+            return None
+        info, stored = entry
+        return info, time.monotonic() - stored >= self.ttl
+
+    def put(self, server: str, info: ServerInfo):
+        with self._lock:
+            self._entries[server] = (info, time.monotonic())
+
+    def begin_refresh(self, server: str) -> bool:
+        """
+        Claim the refresh of an entry, returning `False` when one is already running.
+        """
+        with self._lock:
+            if server in self._refreshing:
+                return False
+            self._refreshing.add(server)
+            return True
+
+    def end_refresh(self, server: str):
+        with self._lock:
+            self._refreshing.discard(server)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
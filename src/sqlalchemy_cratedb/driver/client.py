@@ -0,0 +1,302 @@
+# -*- coding: utf-8; -*-
+#
+# Licensed to CRATE Technology GmbH ("Crate") under one or more contributor
+# license agreements.  See the NOTICE file distributed with this work for
+# additional information regarding copyright ownership.  Crate licenses
+# this file to you under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.  You may
+# obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.  See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# However, if you have executed another commercial license agreement
+# with Crate these terms will supersede the license and you may use the
+# software solely pursuant to the terms of the relevant commercial agreement.
+"""
+## About
+Amended HTTP client of the synchronous `crate-python` driver.
+
+## Details
+The dialect hands an instance of this client to `crate.client.connect()`,
+in order to hook into the request cycle of the driver, to use a pluggable
+JSON codec for encoding requests and decoding responses, and to bound the
+duration of individual statements.
+"""
+
+import contextlib
+import gzip
+import logging
+import threading
+import time
+import typing as t
+
+import urllib3
+from crate.client import exceptions, http
+from urllib3.exceptions import MaxRetryError, ProtocolError, ReadTimeoutError
+
+from ..exceptions import StatementTimeoutError
+from .codec import sql_payload
+from .jobs import tag_statement
+from .limiter import is_rejection
+
+if t.TYPE_CHECKING:
+    from .cache import ServerInfoCache
+    from .codec import Codec
+    from .limiter import AdaptiveLimiter
+    from .routing import NodeRouter
+
+logger = logging.getLogger(__name__)
+
+
+def _preserve_server(cause: t.Optional[BaseException]) -> bool:
+    """
+    Whether a connection error is a hiccup which does not warrant dropping the server.
+    """
+    if not isinstance(cause, ProtocolError):
+        return False
+    return any(isinstance(arg, tuple(http.PRESERVE_ACTIVE_SERVER_EXCEPTIONS)) for arg in cause.args)
+
+
+class Client(http.Client):
+    """
+    HTTP client of `crate-python`, optionally selecting servers using a `NodeRouter`,
+    limiting concurrent requests per server using an `AdaptiveLimiter`, using
+    a custom JSON `Codec`, and sharing server information using a `ServerInfoCache`.
+    """
+
+    def __init__(
+        self,
+        servers=None,
+        router: t.Optional["NodeRouter"] = None,
+        limiter: t.Optional["AdaptiveLimiter"] = None,
+        codec: t.Optional["Codec"] = None,
+        server_info_cache: t.Optional["ServerInfoCache"] = None,
+        **kwargs,
+    ):
+        super().__init__(servers, **kwargs)
+        self.router = router
+        self.limiter = limiter
+        self.codec = codec
+        self.server_info_cache = server_info_cache
+        self._timeout: t.Optional[float] = None
+        # Tag of the statement currently running, sent along with it, see `driver.jobs`.
+        self.running_job: t.Optional[str] = None
+        # Point in time of the last response, see `CrateDialect.do_ping`.
+        self.last_used = 0.0
+        # Server receiving all requests while cursors are open, see `driver.cursor`.
+        self.pinned_server: t.Optional[str] = None
+        self._pins = 0
+        # Connection pool of the pinned server, replaced while it is pinned.
+        self._unpinned_pool: t.Optional[http.Server] = None
+
+    @contextlib.contextmanager
+    def statement_timeout(self, seconds: t.Optional[float]):
+        """
+        Bound the duration of requests issued within the context, in seconds.
+        """
+        previous, self._timeout = self._timeout, seconds
+        try:
+            yield
+        finally:
+            self._timeout = previous
+
+    def sql(self, stmt, parameters=None, bulk_parameters=None):
+        if stmt is not None and self.running_job is not None:
+            stmt = tag_statement(self.running_job, stmt)
+        if self.codec is None:
+            return super().sql(stmt, parameters, bulk_parameters)
+        if stmt is None:
+            return None
+        data = self.codec.dumps(sql_payload(stmt, parameters, bulk_parameters))
+        logger.debug("Sending request to %s with payload: %s", self.path, data)
+        return self._json_request("POST", self.path, data=data)
+
+    def _json_request(self, method, path, data):
+        if self.codec is None:
+            return super()._json_request(method, path, data)
+        headers = {"Accept-Encoding": "gzip, deflate"}
+        if self.compress is True or (
+            not isinstance(self.compress, bool) and len(data) >= self.compress
+        ):
+            data = gzip.compress(data, compresslevel=6)
+            headers["Content-Encoding"] = "gzip"
+        response = self._request(method, path, data=data, headers=headers)
+        http._raise_for_status(response)
+        if not response.data:
+            return response.data
+        try:
+            return self.codec.loads(response.data)
+        except ValueError as ex:
+            raise exceptions.ProgrammingError(
+                "Invalid server response of content-type '{}':\n{}".format(
+                    response.headers.get("content-type", "unknown"),
+                    response.data.decode("utf-8"),
+                )
+            ) from ex
+
+    def server_infos(self, server):
+        cache = self.server_info_cache
+        if cache is None:
+            return super().server_infos(server)
+        entry = cache.get(server)
+        if entry is None:
+            info = super().server_infos(server)
+            cache.put(server, info)
+            return info
+        info, expired = entry
+        if expired and cache.begin_refresh(server):
+            threading.Thread(
+                target=self._refresh_server_infos,
+                args=(server,),
+                name="crate-server-info",
+                daemon=True,
+            ).start()
+        return info
+
+    def _refresh_server_infos(self, server):
+        cache = self.server_info_cache
+        try:
+            cache.put(server, super().server_infos(server))
+        except Exception:
+            logger.debug("Failed to refresh information of server %s", server, exc_info=True)
+        finally:
+            cache.end_refresh(server)
+
+    def ping(self):
+        """
+        Check the cluster is reachable, using a lightweight request to the root endpoint.
+        """
+        http._raise_for_status(self._request("GET", "/"))
+
+    def _request(self, method, path, server=None, **kwargs):
+        if server is not None or (
+            self._timeout is None and self.router is None and self.limiter is None
+        ):
+            response = super()._request(method, path, server=server, **kwargs)
+        else:
+            response = self._request_managed(method, path, **kwargs)
+        self.last_used = time.monotonic()
+        return response
+
+    def _request_managed(self, method, path, **kwargs):
+        """
+        Issue a request to the cluster, failing over to the next server on errors,
+        while observing the statement timeout, the node router, and the limiter.
+
+        Read timeouts are not failed over: A statement which took too long on
+        one node should not be started again on another one.
+        """
+        timeout = self._timeout
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            remaining = None
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise StatementTimeoutError(
+                        "Statement exceeded timeout of %s seconds" % timeout
+                    )
+                kwargs["timeout"] = urllib3.Timeout(total=remaining)
+            next_server = self._get_server()
+            if self.limiter is not None and not self.limiter.acquire(next_server, remaining):
+                raise StatementTimeoutError("Statement exceeded timeout of %s seconds" % timeout)
+            started = time.monotonic()
+            rejected = False
+            try:
+                response = super()._request(method, path, server=next_server, **kwargs)
+                rejected = is_rejection(response.status, response.data)
+            except exceptions.ConnectionError as ex:
+                cause = ex.__cause__
+                if isinstance(cause, MaxRetryError):
+                    cause = cause.reason
+                if deadline is not None and isinstance(cause, ReadTimeoutError):
+                    raise StatementTimeoutError(
+                        "Statement exceeded timeout of %s seconds" % timeout
+                    ) from ex
+                if not _preserve_server(cause):
+                    with self._lock:
+                        self._drop_server(next_server, str(ex))
+                continue
+            finally:
+                if self.limiter is not None:
+                    self.limiter.release(next_server, rejected=rejected)
+            if response.status in http.SRV_UNAVAILABLE_STATUSES:
+                with self._lock:
+                    self._drop_server(next_server, response.reason)
+                continue
+            if self.router is not None:
+                self.router.record_success(next_server, time.monotonic() - started)
+            return response
+
+    def pin_server(self) -> str:
+        """
+        Send all requests to the same server, over the same HTTP connection,
+        until `unpin_server` is called.
+
+        CrateDB cursors belong to the session of the HTTP connection which
+        declared them. While pinned, the connection pool of the server is
+        replaced by a pool of a single connection, so requests can not be
+        sent over other sockets. Calls can be nested, for example by
+        multiple open cursors.
+        """
+        if self._pins == 0:
+            server = self._get_server()
+            with self._lock:
+                self._unpinned_pool = self.server_pool[server]
+                self.server_pool[server] = self._create_pinned_pool(server)
+            self.pinned_server = server
+        self._pins += 1
+        return self.pinned_server
+
+    def unpin_server(self):
+        self._pins -= 1
+        if self._pins == 0:
+            server, self.pinned_server = self.pinned_server, None
+            with self._lock:
+                pinned_pool = self.server_pool[server]
+                self.server_pool[server] = self._unpinned_pool
+                self._unpinned_pool = None
+            pinned_pool.close()
+
+    def _create_pinned_pool(self, server) -> http.Server:
+        """
+        Create a connection pool of a single connection, blocking concurrent requests.
+        """
+        kwargs = http._remove_certs_for_non_https(server, dict(self._pool_kw))
+        if self.ssl_relax_minimum_version:
+            http._update_pool_kwargs_for_ssl_minimum_version(server, kwargs)
+        kwargs.update(maxsize=1, block=True)
+        return http.Server(server, **kwargs)
+
+    def close(self):
+        super().close()
+        if self._unpinned_pool is not None:
+            self._unpinned_pool.close()
+
+    def _get_server(self):
+        if self.pinned_server is not None:
+            return self.pinned_server
+        if self.router is None:
+            return super()._get_server()
+        with self._lock:
+            return self.router.select(list(self.server_pool))
+
+    def _drop_server(self, server, message):
+        if server == self.pinned_server:
+            raise exceptions.ConnectionError(
+                "Server %s of open cursor became unavailable: %s" % (server, message)
+            )
+        if self.router is None:
+            return super()._drop_server(server, message)
+        self.router.record_failure(server)
+        if not self.router.available(self.server_pool):
+            raise exceptions.ConnectionError(
+                "No more Servers available, exception from last server: %s" % message
+            )
+        return None
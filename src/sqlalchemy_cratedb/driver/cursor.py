@@ -0,0 +1,210 @@
+# -*- coding: utf-8; -*-
+#
+# Licensed to CRATE Technology GmbH ("Crate") under one or more contributor
+# license agreements.  See the NOTICE file distributed with this work for
+# additional information regarding copyright ownership.  Crate licenses
+# this file to you under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.  You may
+# obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.  See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# However, if you have executed another commercial license agreement
+# with Crate these terms will supersede the license and you may use the
+# software solely pursuant to the terms of the relevant commercial agreement.
+"""
+## About
+Server-side cursors, streaming query results in pages of bounded size.
+
+## Details
+When SQLAlchemy executes a statement using the `stream_results` or
+`yield_per` execution options, the dialect wraps the DB-API cursor into a
+`ServerSideCursor`. It declares a CrateDB cursor for the query, and
+retrieves its rows page by page using `FETCH`, so the client only holds
+one page in memory at a time.
+
+CrateDB cursors live in the session of the HTTP connection which declared
+them. While a cursor is open, the HTTP client sends all requests to the
+same node, over a dedicated pool of a single HTTP connection.
+
+## References
+- https://cratedb.com/docs/crate/reference/en/latest/sql/statements/declare.html
+- https://cratedb.com/docs/crate/reference/en/latest/sql/statements/fetch.html
+- https://cratedb.com/docs/crate/reference/en/latest/sql/statements/close.html
+"""
+
+import collections
+import logging
+import re
+import typing as t
+import uuid
+
+logger = logging.getLogger(__name__)
+
+
+# Statements which can be declared as cursors, optionally preceded by comments.
+_QUERY = re.compile(r"^\s*(?:/\*.*?\*/\s*)*(SELECT|WITH|VALUES)\b", re.IGNORECASE | re.DOTALL)
+
+
+class ServerSideCursor:
+    """
+    DB-API cursor streaming the results of queries using a CrateDB cursor.
+
+    Statements which are not queries are passed to the wrapped cursor as they are.
+    """
+
+    def __init__(self, cursor, page_size: int = 1000):
+        """
+        :param cursor: DB-API cursor to issue `DECLARE`, `FETCH`, and `CLOSE` statements.
+        :param page_size: Minimum number of rows to retrieve per `FETCH` statement.
+        """
+        self._cursor = cursor
+        self.page_size = page_size
+        self.arraysize = page_size
+        self._name: t.Optional[str] = None
+        self._streaming = False
+        self._description = None
+        self._response: t.Dict[str, t.Any] = {}
+        self._rows: t.Deque = collections.deque()
+
+    @property
+    def connection(self):
+        return self._cursor.connection
+
+    @property
+    def description(self):
+        if self._streaming:
+            return self._description
+        return self._cursor.description
+
+    @property
+    def rowcount(self):
+        if self._streaming:
+            return -1
+        return self._cursor.rowcount
+
+    @property
+    def _result(self) -> t.Dict[str, t.Any]:
+        """
+        Decoded response of the first page, like `crate.client.cursor.Cursor._result`.
+        """
+        if self._streaming:
+            return self._response
+        return self._cursor._result
+
+    @property
+    def lastrowid(self):
+        return getattr(self._cursor, "lastrowid", None)
+
+    def execute(self, operation, parameters=None):
+        self._reset()
+        if not _QUERY.match(operation):
+            return self._cursor.execute(operation, parameters)
+        client = self.connection.client
+        client.pin_server()
+        name = "sa_cursor_" + uuid.uuid4().hex
+        self._streaming = True
+        try:
+            self._cursor.execute(
+                "DECLARE %s NO SCROLL CURSOR WITH HOLD FOR %s" % (name, operation), parameters
+            )
+        except BaseException:
+            self._streaming = False
+            client.unpin_server()
+            raise
+        self._name = name
+        try:
+            self._fetch_page(self.page_size)
+        except BaseException:
+            self._reset()
+            raise
+        return None
+
+    def executemany(self, operation, seq_of_parameters):
+        self._reset()
+        return self._cursor.executemany(operation, seq_of_parameters)
+
+    def setinputsizes(self, *inputsizes):
+        pass
+
+    def setoutputsize(self, size, column=None):
+        pass
+
+    def fetchone(self):
+        if not self._streaming:
+            return self._cursor.fetchone()
+        if not self._rows:
+            self._fetch_page(self.page_size)
+        return self._rows.popleft() if self._rows else None
+
+    def fetchmany(self, size=None):
+        if not self._streaming:
+            return self._cursor.fetchmany(size)
+        if size is None:
+            size = self.arraysize
+        if len(self._rows) < size:
+            self._fetch_page(max(size - len(self._rows), self.page_size))
+        rows = self._rows
+        return [rows.popleft() for _ in range(min(size, len(rows)))]
+
+    def fetchall(self):
+        if not self._streaming:
+            return self._cursor.fetchall()
+        while self._name is not None:
+            self._fetch_page(self.page_size)
+        rows = list(self._rows)
+        self._rows.clear()
+        return rows
+
+    def __iter__(self):
+        while True:
+            row = self.fetchone()
+            if row is None:
+                return
+            yield row
+
+    def close(self):
+        self._reset()
+        self._cursor.close()
+
+    def _fetch_page(self, count: int):
+        """
+        Retrieve up to `count` rows into the buffer, closing the cursor when exhausted.
+        """
+        if self._name is None:
+            return
+        self._cursor.execute("FETCH FORWARD %d FROM %s" % (count, self._name))
+        if self._description is None:
+            self._description = self._cursor.description
+            self._response = self._cursor._result
+        rows = self._cursor.fetchall()
+        self._rows.extend(rows)
+        if len(rows) < count:
+            self._close_cursor()
+
+    def _close_cursor(self):
+        """
+        Close the CrateDB cursor, and release the server of the HTTP client.
+        """
+        if self._name is None:
+            return
+        name, self._name = self._name, None
+        try:
+            self._cursor.execute("CLOSE %s" % name)
+        except Exception:
+            logger.warning("Failed to close cursor %s", name, exc_info=True)
+        finally:
+            self.connection.client.unpin_server()
+
+    def _reset(self):
+        self._close_cursor()
+        self._streaming = False
+        self._description = None
+        self._response = {}
+        self._rows.clear()
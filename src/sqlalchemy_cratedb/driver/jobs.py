@@ -0,0 +1,77 @@
+# -*- coding: utf-8; -*-
+#
+# Licensed to CRATE Technology GmbH ("Crate") under one or more contributor
+# license agreements.  See the NOTICE file distributed with this work for
+# additional information regarding copyright ownership.  Crate licenses
+# this file to you under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.  You may
+# obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.  See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# However, if you have executed another commercial license agreement
+# with Crate these terms will supersede the license and you may use the
+# software solely pursuant to the terms of the relevant commercial agreement.
+"""
+## About
+Identify and kill the server-side jobs of statements the client gave up on.
+
+## Details
+When a request times out, or is interrupted, CrateDB keeps executing the
+statement. In order to find the corresponding job, statements are tagged
+with a unique comment, which CrateDB retains in the `stmt` column of the
+`sys.jobs` table. The job can then be terminated using `KILL`.
+
+## References
+- https://cratedb.com/docs/crate/reference/en/latest/admin/system-information.html#jobs
+- https://cratedb.com/docs/crate/reference/en/latest/sql/statements/kill.html
+"""
+
+import logging
+import uuid
+
+logger = logging.getLogger(__name__)
+
+
+def new_tag() -> str:
+    """
+    Create a unique job tag.
+    """
+    return uuid.uuid4().hex
+
+
+def tag_statement(tag: str, statement: str) -> str:
+    """
+    Prefix a statement with a job tag.
+    """
+    return "/* job %s */ %s" % (tag, statement)
+
+
+def kill_job(dbapi_connection, tag: str, timeout: float = 5.0) -> int:
+    """
+    Kill all jobs of the statement tagged with `tag`, returning their count.
+
+    This is a best-effort operation: Errors are logged, but not raised, in
+    order to not mask the exception which caused the cancellation.
+    """
+    killed = 0
+    try:
+        with dbapi_connection.client.statement_timeout(timeout):
+            cursor = dbapi_connection.cursor()
+            # The tag is passed as a parameter, so this statement does not match itself.
+            cursor.execute("SELECT id FROM sys.jobs WHERE stmt LIKE ?", ["%" + tag + "%"])
+            for (job_id,) in cursor.fetchall():
+                cursor.execute("KILL ?", [job_id])
+                killed += 1
+    except Exception:
+        logger.warning("Failed to kill job of statement tagged %s", tag, exc_info=True)
+    else:
+        if killed:
+            logger.info("Killed %s job(s) of statement tagged %s", killed, tag)
+    return killed
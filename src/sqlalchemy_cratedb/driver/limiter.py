@@ -0,0 +1,146 @@
+# -*- coding: utf-8; -*-
+#
+# Licensed to CRATE Technology GmbH ("Crate") under one or more contributor
+# license agreements.  See the NOTICE file distributed with this work for
+# additional information regarding copyright ownership.  Crate licenses
+# this file to you under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.  You may
+# obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.  See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# However, if you have executed another commercial license agreement
+# with Crate these terms will supersede the license and you may use the
+# software solely pursuant to the terms of the relevant commercial agreement.
+"""
+## About
+Adaptive limit for the number of requests in flight per CrateDB node.
+
+## Details
+When a node is overloaded, its thread pools reject further work with
+`EsRejectedExecutionException` errors. The limiter caps the number of
+concurrent requests per node, and adjusts the cap using the "additive
+increase, multiplicative decrease" (AIMD) strategy known from TCP
+congestion control: Each successful request raises the cap by
+`1 / limit`, so it grows by about one per round of requests, while each
+rejected request cuts the cap by `decrease`.
+
+## References
+- https://en.wikipedia.org/wiki/Additive_increase/multiplicative_decrease
+- https://cratedb.com/docs/crate/reference/en/latest/config/node.html#thread-pools
+"""
+
+import asyncio
+import logging
+import threading
+import time
+import typing as t
+
+logger = logging.getLogger(__name__)
+
+
+REJECTION_MARKERS = (b"RejectedExecutionException", b"CircuitBreakingException")
+"""Fragments of error responses which indicate an overloaded node."""
+
+
+def is_rejection(status: int, data: t.Optional[bytes]) -> bool:
+    """
+    Whether an HTTP response indicates the node rejected the request because of overload.
+    """
+    if status == 429:
+        return True
+    if status < 400 or not data:
+        return False
+    return any(marker in data for marker in REJECTION_MARKERS)
+
+
+class AdaptiveLimiter:
+    """
+    Limit concurrent requests per node, adapting the limit to rejections.
+
+    One limiter instance is shared by all connections of an engine.
+    """
+
+    def __init__(
+        self,
+        initial: float = 8.0,
+        minimum: float = 1.0,
+        maximum: float = 256.0,
+        decrease: float = 0.5,
+    ):
+        """
+        :param initial: Initial limit of concurrent requests per node.
+        :param minimum: Lower bound of the limit.
+        :param maximum: Upper bound of the limit.
+        :param decrease: Factor applied to the limit when a request was rejected.
+        """
+        self.initial = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self.decrease = decrease
+        self._limits: t.Dict[str, float] = {}
+        self._in_flight: t.Dict[str, int] = {}
+        self._condition = threading.Condition()
+
+    def limit(self, server: str) -> float:
+        with self._condition:
+            return self._limits.get(server, self.initial)
+
+    def in_flight(self, server: str) -> int:
+        with self._condition:
+            return self._in_flight.get(server, 0)
+
+    def try_acquire(self, server: str) -> bool:
+        """
+        Acquire a slot for a request to the given server, without waiting.
+        """
+        with self._condition:
+            return self._try_acquire(server)
+
+    def _try_acquire(self, server: str) -> bool:
+        in_flight = self._in_flight.get(server, 0)
+        if in_flight >= max(int(self._limits.get(server, self.initial)), 1):
+            return False
+        self._in_flight[server] = in_flight + 1
+        return True
+
+    def acquire(self, server: str, timeout: t.Optional[float] = None) -> bool:
+        """
+        Acquire a slot for a request to the given server, waiting up to `timeout` seconds.
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: self._try_acquire(server), timeout)
+
+    async def acquire_async(self, server: str, timeout: t.Optional[float] = None) -> bool:
+        """
+        Acquire a slot without blocking the event loop, polling with increasing intervals.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        interval = 0.001
+        while not self.try_acquire(server):
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            await asyncio.sleep(interval)
+            interval = min(interval * 2, 0.05)
+        return True
+
+    def release(self, server: str, rejected: bool = False):
+        """
+        Release a slot, and adjust the limit of the server.
+        """
+        with self._condition:
+            self._in_flight[server] -= 1
+            limit = self._limits.get(server, self.initial)
+            if rejected:
+                limit = max(self.minimum, limit * self.decrease)
+                logger.warning("Server %s rejected request, limit is now %.1f", server, limit)
+            else:
+                limit = min(self.maximum, limit + 1.0 / limit)
+            self._limits[server] = limit
+            self._condition.notify_all()
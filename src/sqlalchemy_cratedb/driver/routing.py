@@ -0,0 +1,161 @@
+# -*- coding: utf-8; -*-
+#
+# Licensed to CRATE Technology GmbH ("Crate") under one or more contributor
+# license agreements.  See the NOTICE file distributed with this work for
+# additional information regarding copyright ownership.  Crate licenses
+# this file to you under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.  You may
+# obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.  See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# However, if you have executed another commercial license agreement
+# with Crate these terms will supersede the license and you may use the
+# software solely pursuant to the terms of the relevant commercial agreement.
+"""
+## About
+Health-aware, latency-weighted selection of CrateDB nodes.
+
+## Details
+The router keeps an exponentially weighted moving average (EWMA) of the
+response latency and error rate per node. Nodes are selected using the
+"power of two choices" strategy: two random healthy nodes are drawn, and
+the one with the better score wins. This prefers fast nodes, while still
+spreading the load across the cluster.
+
+Failing nodes are quarantined. The quarantine period doubles with each
+consecutive failure, up to `quarantine_max` seconds. When it expires, the
+node is eligible again, and the next request acts as a probe: success
+restores the node, another failure extends its quarantine.
+
+## References
+- https://www.eecs.harvard.edu/~michaelm/postscripts/mythesis.pdf
+"""
+
+import logging
+import random
+import threading
+import time
+import typing as t
+
+logger = logging.getLogger(__name__)
+
+
+class NodeStats:
+    """
+    Health and latency bookkeeping for a single node.
+    """
+
+    __slots__ = ("error_rate", "failures", "latency", "quarantined_until")
+
+    def __init__(self):
+        self.latency: t.Optional[float] = None
+        self.error_rate = 0.0
+        self.failures = 0
+        self.quarantined_until = 0.0
+
+    def score(self) -> float:
+        # Nodes without measurements yet are preferred, in order to probe them.
+        if self.latency is None:
+            return 0.0
+        return self.latency * (1.0 + 10.0 * self.error_rate)
+
+
+class NodeRouter:
+    """
+    Select CrateDB nodes based on their observed latency and health.
+
+    One router instance is shared by all connections of an engine, so
+    observations made on one connection benefit all others.
+    """
+
+    def __init__(
+        self,
+        decay: float = 0.3,
+        quarantine_base: float = 1.0,
+        quarantine_max: float = 60.0,
+        rng: t.Optional[random.Random] = None,
+    ):
+        """
+        :param decay: Weight of a new observation within the moving averages.
+        :param quarantine_base: Quarantine period after the first failure, in seconds.
+        :param quarantine_max: Upper bound for the quarantine period, in seconds.
+        :param rng: Random number generator, for testing purposes.
+        """
+        self.decay = decay
+        self.quarantine_base = quarantine_base
+        self.quarantine_max = quarantine_max
+        self._rng = rng or random.Random()  # noqa: S311
+        self._nodes: t.Dict[str, NodeStats] = {}
+        self._lock = threading.Lock()
+
+    def stats(self, server: str) -> NodeStats:
+        with self._lock:
+            return self._stats(server)
+
+    def _stats(self, server: str) -> NodeStats:
+        stats = self._nodes.get(server)
+        if stats is None:
+            stats = self._nodes[server] = NodeStats()
+        return stats
+
+    def available(self, servers: t.Iterable[str]) -> t.List[str]:
+        """
+        Return all servers which are currently not quarantined.
+        """
+        now = time.monotonic()
+        with self._lock:
+            return [server for server in servers if self._stats(server).quarantined_until <= now]
+
+    def select(self, servers: t.Sequence[str]) -> str:
+        """
+        Select the server to send the next request to.
+        """
+        if not servers:
+            raise ValueError("No servers to select from")
+        now = time.monotonic()
+        with self._lock:
+            healthy = [s for s in servers if self._stats(s).quarantined_until <= now]
+            if not healthy:
+                # All nodes are quarantined, probe the one to be released first.
+                return min(servers, key=lambda s: self._stats(s).quarantined_until)
+            if len(healthy) == 1:
+                return healthy[0]
+            first, second = self._rng.sample(healthy, 2)
+            if self._stats(second).score() < self._stats(first).score():
+                return second
+            return first
+
+    def record_success(self, server: str, elapsed: float):
+        """
+        Record a successful request and its latency, in seconds.
+        """
+        with self._lock:
+            stats = self._stats(server)
+            if stats.latency is None:
+                stats.latency = elapsed
+            else:
+                stats.latency += self.decay * (elapsed - stats.latency)
+            stats.error_rate -= self.decay * stats.error_rate
+            if stats.failures:
+                logger.info("Restored server %s after %s failures", server, stats.failures)
+            stats.failures = 0
+            stats.quarantined_until = 0.0
+
+    def record_failure(self, server: str):
+        """
+        Record a failed request, and quarantine the server.
+        """
+        with self._lock:
+            stats = self._stats(server)
+            stats.error_rate += self.decay * (1.0 - stats.error_rate)
+            stats.failures += 1
+            period = min(self.quarantine_base * 2 ** (stats.failures - 1), self.quarantine_max)
+            stats.quarantined_until = time.monotonic() + period
+        logger.warning("Quarantined server %s for %.1f seconds", server, period)
@@ -0,0 +1,109 @@
+# -*- coding: utf-8; -*-
+#
+# Licensed to CRATE Technology GmbH ("Crate") under one or more contributor
+# license agreements.  See the NOTICE file distributed with this work for
+# additional information regarding copyright ownership.  Crate licenses
+# this file to you under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.  You may
+# obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.  See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# However, if you have executed another commercial license agreement
+# with Crate these terms will supersede the license and you may use the
+# software solely pursuant to the terms of the relevant commercial agreement.
+"""
+## About
+Retry idempotent statements on transient cluster errors.
+
+## Details
+During rolling upgrades, node restarts, or shard relocations, CrateDB may
+respond with errors like `NodeDisconnectedException`, which succeed when
+the statement is issued again. The dialect retries statements failing this
+way, when they are idempotent: `SELECT` statements, and statements marked
+using the `idempotent=True` execution option.
+
+Retries are delayed using exponential backoff with "full jitter", so
+clients do not retry in lockstep.
+
+## References
+- https://aws.amazon.com/blogs/architecture/exponential-backoff-and-jitter/
+"""
+
+import random
+import re
+import typing as t
+
+TRANSIENT_ERRORS = (
+    "ConnectTransportException",
+    "EsRejectedExecutionException",
+    "NoShardAvailableActionException",
+    "NodeClosedException",
+    "NodeDisconnectedException",
+    "NodeNotConnectedException",
+    "Participating node",
+    "ShardNotFoundException",
+    "UnavailableShardsException",
+    "shard not available",
+)
+"""Fragments of error messages which indicate a transient cluster condition."""
+
+_READ_STATEMENT = re.compile(r"^\s*(SELECT|WITH|SHOW|EXPLAIN|VALUES)\b", re.IGNORECASE)
+
+
+class RetryPolicy:
+    """
+    Decide whether, and when, to retry a failed statement.
+
+    Pass an instance to `create_engine("crate://", retry_policy=...)`. Use
+    `RetryPolicy(max_retries=0)` in order to turn off retrying.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        backoff_base: float = 0.05,
+        backoff_max: float = 2.0,
+        transient_errors: t.Iterable[str] = TRANSIENT_ERRORS,
+        rng: t.Optional[random.Random] = None,
+    ):
+        """
+        :param max_retries: Maximum number of retries per statement.
+        :param backoff_base: Upper bound of the delay before the first retry, in seconds.
+        :param backoff_max: Upper bound of the delay before any retry, in seconds.
+        :param transient_errors: Error message fragments which qualify for a retry.
+        :param rng: Random number generator, for testing purposes.
+        """
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.transient_errors = tuple(transient_errors)
+        self._rng = rng or random.Random()  # noqa: S311
+
+    def is_idempotent(self, statement: str) -> bool:
+        """
+        Whether a statement only reads data, and can be issued again safely.
+        """
+        return _READ_STATEMENT.match(statement) is not None
+
+    def is_transient(self, error: BaseException) -> bool:
+        """
+        Whether an error indicates a transient cluster condition.
+        """
+        message = getattr(error, "message", None) or str(error)
+        return any(fragment in message for fragment in self.transient_errors)
+
+    def should_retry(self, error: BaseException, retries: int) -> bool:
+        return retries < self.max_retries and self.is_transient(error)
+
+    def delay(self, retries: int) -> float:
+        """
+        Delay before issuing retry number `retries + 1`, in seconds.
+        """
+        return self._rng.uniform(0, min(self.backoff_max, self.backoff_base * 2**retries))
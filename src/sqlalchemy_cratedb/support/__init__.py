@@ -1,18 +1,31 @@
-from sqlalchemy_cratedb.support.pandas import insert_bulk, table_kwargs
+from sqlalchemy_cratedb.support.arrow import to_arrow
+from sqlalchemy_cratedb.support.dask import read_dask
+from sqlalchemy_cratedb.support.numpy import fetch_columns
+from sqlalchemy_cratedb.support.pandas import insert_bulk, read_frame, table_kwargs
 from sqlalchemy_cratedb.support.polyfill import (
     check_uniqueness_factory,
     patch_autoincrement_timestamp,
     refresh_after_dml,
 )
-from sqlalchemy_cratedb.support.util import quote_relation_name, refresh_dirty, refresh_table
+from sqlalchemy_cratedb.support.util import (
+    iterate_keyset,
+    quote_relation_name,
+    refresh_dirty,
+    refresh_table,
+)
 
 __all__ = [
     check_uniqueness_factory,
+    fetch_columns,
     insert_bulk,
+    iterate_keyset,
     patch_autoincrement_timestamp,
     quote_relation_name,
+    read_dask,
+    read_frame,
     refresh_after_dml,
     refresh_dirty,
     refresh_table,
     table_kwargs,
+    to_arrow,
 ]
@@ -0,0 +1,185 @@
+# -*- coding: utf-8; -*-
+#
+# Licensed to CRATE Technology GmbH ("Crate") under one or more contributor
+# license agreements.  See the NOTICE file distributed with this work for
+# additional information regarding copyright ownership.  Crate licenses
+# this file to you under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.  You may
+# obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.  See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# However, if you have executed another commercial license agreement
+# with Crate these terms will supersede the license and you may use the
+# software solely pursuant to the terms of the relevant commercial agreement.
+"""
+## About
+Export query results as Apache Arrow tables, or streams of record batches.
+
+## Details
+`to_arrow` bypasses SQLAlchemy's `Row` objects and result processors, and
+builds Arrow arrays directly from the rows of the HTTP response, using the
+column types reported by CrateDB in its `col_types` field. Combined with
+server-side cursors, results can be consumed as a stream of record batches.
+
+## References
+- https://arrow.apache.org/docs/python/
+- https://cratedb.com/docs/crate/reference/en/latest/interfaces/http.html#column-types
+"""
+
+import typing as t
+
+import orjson
+from crate.client.converter import DataType
+
+from sqlalchemy_cratedb.support.numpy import decode_timestamps
+from sqlalchemy_cratedb.support.util import execute_raw, iterate_raw
+
+if t.TYPE_CHECKING:
+    import pyarrow as pa
+
+
+def to_arrow(
+    connection,
+    statement,
+    batch_size: t.Optional[int] = None,
+    objects: str = "struct",
+) -> t.Union["pa.Table", "pa.RecordBatchReader"]:
+    """
+    Execute a statement, and return its result as an Arrow table.
+
+    When `batch_size` is given, rows are retrieved using a server-side cursor,
+    and returned as a `pyarrow.RecordBatchReader`, yielding batches of up to
+    `batch_size` rows.
+
+    `OBJECT` columns become struct arrays, or JSON strings using `objects="json"`.
+    In streaming mode, the schema is derived from the column types reported by
+    CrateDB. Types which can not be derived from them, like struct types, are
+    inferred from the first rows containing values for the column, and object
+    keys not present in them are dropped from later batches, so objects with
+    varying keys should be exported as JSON.
+    """
+    import pyarrow as pa
+
+    if objects not in ("struct", "json"):
+        raise ValueError("`objects` parameter must be one of: struct, json")
+
+    if batch_size is None:
+        response = execute_raw(connection, statement)
+        batch = _record_batch(
+            response.get("cols", []), response.get("col_types"), response.get("rows", []), objects
+        )
+        return pa.Table.from_batches([batch])
+
+    pages = iterate_raw(connection, statement, batch_size)
+    names, types, rows = next(pages)
+    types = types or [None] * len(names)
+
+    # Read ahead until each column whose type needs to be inferred has values,
+    # so all-NULL leading pages do not turn it into a `null` column.
+    pending = [index for index, type_ in enumerate(types) if _is_inferred(type_, objects)]
+    while pending:
+        pending = [index for index in pending if all(row[index] is None for row in rows)]
+        page = next(pages, None) if pending else None
+        if page is None:
+            break
+        rows = rows + page[2]
+    head = _record_batch(names, types, rows, objects)
+
+    def batches():
+        for offset in range(0, head.num_rows, batch_size):
+            yield head.slice(offset, batch_size)
+        for _, _, rows in pages:
+            yield _record_batch(names, types, rows, objects, head.schema)
+
+    return pa.RecordBatchReader.from_batches(head.schema, batches())
+
+
+def _record_batch(names, types, rows, objects: str, schema=None) -> "pa.RecordBatch":
+    import pyarrow as pa
+
+    types = types or [None] * len(names)
+    columns = list(zip(*rows)) if rows else [()] * len(names)
+    arrays = []
+    for index, (type_, values) in enumerate(zip(types, columns)):
+        if schema is not None:
+            arrow_type = schema.field(index).type
+        else:
+            arrow_type = _arrow_type(type_, values, objects)
+        if _is_json(type_, objects):
+            values = [None if value is None else orjson.dumps(value).decode() for value in values]
+        elif type_ in _TIMESTAMP_TYPES:
+            values = decode_timestamps(values, type_)
+        arrays.append(pa.array(values, type=arrow_type))
+    return pa.RecordBatch.from_arrays(arrays, names=names)
+
+
+def _is_inferred(type_, objects: str) -> bool:
+    """
+    Whether the Arrow type of a column depends on its values.
+    """
+    return type_ == DataType.FLOAT_VECTOR.value or _arrow_type(type_, (), objects) is None
+
+
+def _is_json(type_, objects: str) -> bool:
+    if type_ == DataType.GEOSHAPE.value:
+        return True
+    return objects == "json" and type_ in _OBJECT_TYPES
+
+
+_TIMESTAMP_TYPES = (
+    DataType.TIMESTAMP_WITH_TZ.value,
+    DataType.TIMESTAMP_WITHOUT_TZ.value,
+    DataType.DATE.value,
+)
+
+_OBJECT_TYPES = (DataType.OBJECT.value, DataType.UNCHECKED_OBJECT.value, DataType.JSON.value)
+
+
+def _arrow_type(type_, values: t.Sequence = (), objects: str = "struct") -> "pa.DataType":
+    """
+    Map a CrateDB column type, as reported in `col_types`, to an Arrow type.
+
+    Returns `None` for types which need to be inferred from the values.
+    """
+    import pyarrow as pa
+
+    if isinstance(type_, list):
+        inner = _arrow_type(type_[1], (), objects)
+        return None if inner is None else pa.list_(inner)
+    if type_ == DataType.FLOAT_VECTOR.value:
+        dimensions = next((len(value) for value in values if value is not None), None)
+        if dimensions is None:
+            return pa.list_(pa.float32())
+        return pa.list_(pa.float32(), dimensions)
+    if _is_json(type_, objects):
+        return pa.string()
+    simple = {
+        DataType.BOOLEAN.value: pa.bool_,
+        DataType.CHAR.value: pa.int8,
+        DataType.SMALLINT.value: pa.int16,
+        DataType.INTEGER.value: pa.int32,
+        DataType.BIGINT.value: pa.int64,
+        DataType.REAL.value: pa.float32,
+        DataType.DOUBLE.value: pa.float64,
+        DataType.TEXT.value: pa.string,
+        DataType.CHARACTER.value: pa.string,
+        DataType.IP.value: pa.string,
+        DataType.UUID.value: pa.string,
+        DataType.DATE.value: pa.date64,
+    }
+    if type_ in simple:
+        return simple[type_]()
+    if type_ == DataType.TIMESTAMP_WITH_TZ.value:
+        return pa.timestamp("ms", tz="UTC")
+    if type_ == DataType.TIMESTAMP_WITHOUT_TZ.value:
+        return pa.timestamp("ms")
+    if type_ == DataType.GEOPOINT.value:
+        return pa.list_(pa.float64(), 2)
+    return None
@@ -0,0 +1,172 @@
+# -*- coding: utf-8; -*-
+#
+# Licensed to CRATE Technology GmbH ("Crate") under one or more contributor
+# license agreements.  See the NOTICE file distributed with this work for
+# additional information regarding copyright ownership.  Crate licenses
+# this file to you under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.  You may
+# obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.  See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# However, if you have executed another commercial license agreement
+# with Crate these terms will supersede the license and you may use the
+# software solely pursuant to the terms of the relevant commercial agreement.
+"""
+## About
+Read CrateDB tables into Dask DataFrames, with one task per partition or shard.
+
+## Details
+Dask's `read_sql_table` splits tables by ranges of a numeric index column,
+which does not match how CrateDB distributes data, and makes each task scan
+all shards. `read_dask` aligns tasks with the layout of the table instead:
+
+- Partitioned tables are split by partition, discovered from
+  `information_schema.table_partitions`. Each task selects the rows of one
+  partition, using the values of its partition columns, which CrateDB uses
+  to skip all other partitions.
+- Other tables are split by shard, using the `_shard_id` system column.
+
+Each task reads its rows using `read_frame`, with one engine per worker process.
+
+## References
+- https://cratedb.com/docs/crate/reference/en/latest/general/ddl/partitioned-tables.html
+- https://cratedb.com/docs/crate/reference/en/latest/general/ddl/system-columns.html
+"""
+
+import threading
+import typing as t
+
+import sqlalchemy as sa
+
+from sqlalchemy_cratedb.support.pandas import read_frame
+from sqlalchemy_cratedb.support.util import identifier_preparer
+
+if t.TYPE_CHECKING:
+    import dask.dataframe as dd
+
+
+def read_dask(
+    table_name: str,
+    con: str,
+    columns: t.Optional[t.Sequence[str]] = None,
+    schema: t.Optional[str] = None,
+    split: str = "auto",
+    engine_kwargs: t.Optional[t.Dict[str, t.Any]] = None,
+    meta=None,
+) -> "dd.DataFrame":
+    """
+    Read a table into a Dask DataFrame, with one task per partition or shard.
+
+    :param table_name: Name of the table.
+    :param con: SQLAlchemy connection URL, like `crate://localhost:4200`.
+    :param columns: Names of the columns to read. Defaults to all columns.
+    :param schema: Schema of the table. Defaults to the schema of the connection.
+    :param split: One of `partitions`, `shards`, or `auto`, which splits
+                  partitioned tables by partition, and other tables by shard.
+    :param engine_kwargs: Keyword arguments for `sa.create_engine`.
+    :param meta: Empty DataFrame describing the result. Inferred from the column types by default.
+    """
+    import dask
+    import dask.dataframe as dd
+
+    if split not in ("auto", "partitions", "shards"):
+        raise ValueError("`split` parameter must be one of: auto, partitions, shards")
+    engine_kwargs = engine_kwargs or {}
+
+    engine = _get_engine(con, engine_kwargs)
+    with engine.connect() as conn:
+        schema = schema or engine.dialect._get_effective_schema_name(conn) or "doc"
+        predicates = _predicates(conn, table_name, schema, split)
+
+        table = sa.table(table_name, schema=schema)
+        if columns:
+            selectable = [sa.column(name) for name in columns]
+        else:
+            selectable = [sa.literal_column("*")]
+        query = sa.select(*selectable).select_from(table)
+
+        # Dtypes are derived from column types, so a query without rows describes the result.
+        if meta is None:
+            meta = read_frame(conn, query.where(sa.false()), category_ratio=None)
+
+    statements = [query.where(predicate) for predicate in predicates]
+    parts = [dask.delayed(_read_part)(con, engine_kwargs, statement) for statement in statements]
+    if not parts:
+        return dd.from_pandas(meta, npartitions=1)
+    return dd.from_delayed(parts, meta=meta)
+
+
+def _predicates(conn, table_name: str, schema: str, split: str) -> t.List["sa.ColumnElement"]:
+    """
+    Build one predicate per partition or shard of the table.
+    """
+    if split in ("auto", "partitions"):
+        partitions = conn.execute(
+            sa.text(
+                "SELECT values FROM information_schema.table_partitions "
+                "WHERE table_schema = :schema AND table_name = :name"
+            ),
+            {"schema": schema, "name": table_name},
+        ).fetchall()
+        if partitions or split == "partitions":
+            return [_partition_predicate(values) for (values,) in partitions]
+    shards = conn.execute(
+        sa.text(
+            "SELECT number_of_shards FROM information_schema.tables "
+            "WHERE table_schema = :schema AND table_name = :name"
+        ),
+        {"schema": schema, "name": table_name},
+    ).scalar()
+    return [sa.column("_shard_id") == shard for shard in range(shards)]
+
+
+def _partition_predicate(values: t.Dict[str, t.Any]) -> "sa.ColumnElement":
+    clauses = []
+    for name, value in values.items():
+        column = _partition_column(name)
+        clauses.append(column.is_(None) if value is None else column == value)
+    return sa.and_(*clauses)
+
+
+def _partition_column(name: str) -> "sa.ColumnElement":
+    """
+    Resolve the name of a partition column, like `day` or `obj['ts']`.
+
+    Names of object sub-columns are reported using subscript notation, so
+    only their top-level column name is quoted.
+    """
+    base, bracket, path = name.partition("[")
+    return sa.literal_column(identifier_preparer.quote(base) + bracket + path)
+
+
+# Engines per connection URL and options, see `_get_engine`.
+_engines: t.Dict[t.Tuple[str, str], "sa.engine.Engine"] = {}
+_engines_lock = threading.Lock()
+
+
+def _get_engine(con: str, engine_kwargs: t.Dict[str, t.Any]) -> "sa.engine.Engine":
+    """
+    Share one engine per connection URL and options within each worker process.
+
+    Options are keyed by their representation, because values like
+    `connect_args` dictionaries are not hashable.
+    """
+    key = (con, repr(sorted(engine_kwargs.items())))
+    with _engines_lock:
+        engine = _engines.get(key)
+        if engine is None:
+            engine = _engines[key] = sa.create_engine(con, **engine_kwargs)
+    return engine
+
+
+def _read_part(con: str, engine_kwargs: t.Dict[str, t.Any], statement):
+    with _get_engine(con, engine_kwargs).connect() as conn:
+        # Categories would differ between tasks, so do not use categorical dtypes.
+        return read_frame(conn, statement, category_ratio=None)
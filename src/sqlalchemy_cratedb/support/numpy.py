@@ -0,0 +1,146 @@
+# -*- coding: utf-8; -*-
+#
+# Licensed to CRATE Technology GmbH ("Crate") under one or more contributor
+# license agreements.  See the NOTICE file distributed with this work for
+# additional information regarding copyright ownership.  Crate licenses
+# this file to you under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.  You may
+# obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.  See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# However, if you have executed another commercial license agreement
+# with Crate these terms will supersede the license and you may use the
+# software solely pursuant to the terms of the relevant commercial agreement.
+"""
+## About
+Fetch query results as NumPy arrays, one per column.
+
+## Details
+`fetch_columns` bypasses SQLAlchemy's `Row` objects and result processors,
+and builds typed arrays directly from the rows of the HTTP response, using
+the column types reported by CrateDB in its `col_types` field.
+
+## References
+- https://cratedb.com/docs/crate/reference/en/latest/interfaces/http.html#column-types
+"""
+
+import typing as t
+
+from crate.client.converter import DataType
+
+from sqlalchemy_cratedb.support.util import execute_raw
+from sqlalchemy_cratedb.type.timestamp import DateDecoder, TimestampDecoder
+
+if t.TYPE_CHECKING:
+    import numpy.typing as npt
+
+
+# Types which map to NumPy dtypes, when they do not contain `NULL` values.
+_INTEGER_DTYPES = {
+    DataType.BOOLEAN.value: "bool",
+    DataType.CHAR.value: "int8",
+    DataType.SMALLINT.value: "int16",
+    DataType.INTEGER.value: "int32",
+    DataType.BIGINT.value: "int64",
+}
+
+# Types which map to NumPy dtypes, representing `NULL` values as `NaN` or `NaT`.
+_NULLABLE_DTYPES = {
+    DataType.DOUBLE.value: "float64",
+    DataType.REAL.value: "float32",
+    DataType.TIMESTAMP_WITH_TZ.value: "datetime64[ms]",
+    DataType.TIMESTAMP_WITHOUT_TZ.value: "datetime64[ms]",
+    DataType.DATE.value: "datetime64[ms]",
+}
+
+_TIMESTAMP_TYPES = (
+    DataType.TIMESTAMP_WITH_TZ.value,
+    DataType.TIMESTAMP_WITHOUT_TZ.value,
+    DataType.DATE.value,
+)
+
+_NULL_POINT = (float("nan"), float("nan"))
+
+
+def fetch_columns(connection, statement) -> t.Dict[str, "npt.NDArray"]:
+    """
+    Execute a statement, and return its result as a dictionary of NumPy arrays per column.
+
+    - `BOOLEAN` and integer columns become arrays of the corresponding dtype,
+      or of `object` dtype when they contain `NULL` values.
+    - `DOUBLE` and `REAL` columns become `float64` and `float32` arrays,
+      with `NULL` values as `NaN`.
+    - `TIMESTAMP` and `DATE` columns become `datetime64[ms]` arrays, with
+      `NULL` values as `NaT`. Timestamp strings, like values of dynamically
+      mapped columns, are parsed using `TimestampDecoder`.
+    - `FLOAT_VECTOR` columns become 2-D `float32` arrays, with one row per
+      vector, or 1-D arrays of `object` dtype when they contain `NULL` values.
+    - `GEO_POINT` columns become `float64` arrays of shape `(N, 2)`, with
+      one `(lon, lat)` row per point, and `NULL` values as `NaN` rows.
+    - All other columns become arrays of `object` dtype.
+    """
+    response = execute_raw(connection, statement)
+    names = response.get("cols", [])
+    types = response.get("col_types") or [None] * len(names)
+    rows = response.get("rows", [])
+    columns = list(zip(*rows)) if rows else [()] * len(names)
+    return {name: to_array(values, type_) for name, type_, values in zip(names, types, columns)}
+
+
+def to_array(values: t.Sequence, type_: t.Union[int, t.List, None]) -> "npt.NDArray":
+    """
+    Convert values of a CrateDB column type, as reported in `col_types`, into a NumPy array.
+    """
+    import numpy as np
+
+    if isinstance(type_, list):
+        return _object_array(values)
+    if type_ in _TIMESTAMP_TYPES:
+        values = decode_timestamps(values, type_)
+    if type_ in _NULLABLE_DTYPES:
+        return np.array(values, dtype=_NULLABLE_DTYPES[type_])
+    if type_ in _INTEGER_DTYPES:
+        if None in values:
+            return _object_array(values)
+        return np.array(values, dtype=_INTEGER_DTYPES[type_])
+    if type_ == DataType.FLOAT_VECTOR.value and None not in values:
+        array = np.array(values, dtype=np.float32)
+        if array.ndim == 1:
+            array = array.reshape(0, 0)
+        return array
+    if type_ == DataType.GEOPOINT.value:
+        if None in values:
+            values = [_NULL_POINT if value is None else value for value in values]
+        return np.array(values, dtype=np.float64).reshape(-1, 2)
+    return _object_array(values)
+
+
+def decode_timestamps(values: t.Sequence, type_: int) -> t.Sequence:
+    """
+    Convert values of a timestamp column, which are not exclusively milliseconds
+    since the epoch, into `datetime` or `date` objects, decoding the column at once.
+
+    Milliseconds since the epoch are returned as they are.
+    """
+    if all(type(value) is int or value is None for value in values):
+        return values
+    decoder = DateDecoder() if type_ == DataType.DATE.value else TimestampDecoder()
+    return decoder.decode_many(values)
+
+
+def _object_array(values: t.Sequence) -> "npt.NDArray":
+    """
+    Build a 1-D array of `object` dtype, without NumPy descending into nested sequences.
+    """
+    import numpy as np
+
+    array = np.empty(len(values), dtype=object)
+    array[:] = values
+    return array
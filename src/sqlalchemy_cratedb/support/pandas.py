@@ -20,12 +20,20 @@
 # software solely pursuant to the terms of the relevant commercial agreement.
 import logging
 from contextlib import contextmanager
-from typing import Any
+from typing import TYPE_CHECKING, Any, Iterator, Optional, Sequence, Union
 from unittest.mock import patch
 
 import sqlalchemy as sa
+from crate.client.converter import DataType
+from crate.client.exceptions import ProgrammingError
 
 from sqlalchemy_cratedb.sa_version import SA_2_0, SA_VERSION
+from sqlalchemy_cratedb.support.numpy import to_array
+from sqlalchemy_cratedb.support.util import execute_raw, iterate_raw
+from sqlalchemy_cratedb.type.timestamp import to_epoch_ms_many
+
+if TYPE_CHECKING:
+    import pandas as pd
 
 logger = logging.getLogger(__name__)
 
@@ -45,16 +53,23 @@ def insert_bulk(pd_table, conn, keys, data_iter):
         conn.execute(pd_table.table.insert(), data)
 
     Batch chunking will happen outside of this function, for example [3] demonstrates
-    the relevant code in `pandas.io.sql`.
+    the relevant code in `pandas.io.sql`. Batches exceeding the server's
+    `http.max_content_length` [4] are split into multiple requests.
+
+    When the engine uses `bind_timestamps="epoch"`, timestamp columns are
+    converted into epoch milliseconds per column, using `to_epoch_ms_many`.
 
     [1] https://pandas.pydata.org/docs/reference/api/pandas.DataFrame.to_sql.html
     [2] https://cratedb.com/docs/crate/reference/en/latest/interfaces/http.html#bulk-operations
     [3] https://github.com/pandas-dev/pandas/blob/v2.0.1/pandas/io/sql.py#L1011-L1027
+    [4] https://cratedb.com/docs/crate/reference/en/latest/config/node.html#http-max-content-length
     """  # noqa: E501
 
     # Compile SQL statement and materialize batch.
     sql = str(pd_table.table.insert().compile(bind=conn))
     data = list(data_iter)
+    if getattr(conn.dialect, "bind_timestamps", None) == "epoch":
+        data = _timestamps_to_epoch(pd_table.table, keys, data)
 
     # For debugging and tracing the batches running through this method.
     if logger.level == logging.DEBUG:
@@ -62,12 +77,65 @@ def insert_bulk(pd_table, conn, keys, data_iter):
         logger.debug(f"Bulk records: {len(data)}")
         # logger.debug(f"Bulk data:    {data}")  # noqa: ERA001
 
-    # Invoke bulk insert operation.
+    # Invoke bulk insert operation, using batches which fit into a single request.
+    max_content_length = getattr(conn.dialect, "max_content_length", None)
     cursor = conn._dbapi_connection.cursor()
-    cursor.execute(sql=sql, bulk_parameters=data)
+    for batch in _split_batch(data, max_content_length):
+        _insert_batch(cursor, sql, batch)
     cursor.close()
 
 
+def _timestamps_to_epoch(table, keys, data):
+    """
+    Convert the values of `Date` and `DateTime` columns into epoch milliseconds.
+    """
+    indexes = [
+        index
+        for index, key in enumerate(keys)
+        if isinstance(table.columns[key].type, (sa.Date, sa.DateTime))
+    ]
+    if not indexes or not data:
+        return data
+    columns = list(zip(*data))
+    for index in indexes:
+        columns[index] = to_epoch_ms_many(columns[index])
+    return list(zip(*columns))
+
+
+def _split_batch(data, max_content_length, sample_size=100):
+    """
+    Split records into batches whose payload stays below the server's
+    `http.max_content_length`, estimating the size per record from a sample.
+    """
+    if not max_content_length or len(data) <= 1:
+        return [data]
+    from sqlalchemy_cratedb.driver.codec import get_codec
+
+    sample = data[:sample_size]
+    try:
+        record_size = len(get_codec().dumps(sample)) / len(sample)
+    except TypeError:
+        return [data]
+    # Leave headroom for the statement, and for records larger than the sample.
+    size = max(1, int(max_content_length * 0.8 / record_size))
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+def _insert_batch(cursor, sql, batch):
+    """
+    Submit a batch, splitting it in halves when the server rejects it as too large.
+    """
+    try:
+        cursor.execute(sql=sql, bulk_parameters=batch)
+    except ProgrammingError as ex:
+        if not str(ex).startswith("413 ") or len(batch) <= 1:
+            raise
+        logger.warning(f"Bulk request of {len(batch)} records too large, splitting it")
+        middle = len(batch) // 2
+        _insert_batch(cursor, sql, batch[:middle])
+        _insert_batch(cursor, sql, batch[middle:])
+
+
 @contextmanager
 def table_kwargs(**kwargs):
     """
@@ -108,3 +176,84 @@ def table_kwargs(**kwargs):
 
         with patch("sqlalchemy.sql.schema.Table._new", _new):
             yield
+
+
+# pandas' nullable extension dtypes for integer and boolean types.
+_NULLABLE_DTYPES = {
+    DataType.BOOLEAN.value: "boolean",
+    DataType.CHAR.value: "Int8",
+    DataType.SMALLINT.value: "Int16",
+    DataType.INTEGER.value: "Int32",
+    DataType.BIGINT.value: "Int64",
+}
+
+_STRING_TYPES = (DataType.TEXT.value, DataType.CHARACTER.value)
+
+
+def read_frame(
+    conn,
+    statement,
+    chunksize: Optional[int] = None,
+    category_ratio: Optional[float] = 0.5,
+) -> Union["pd.DataFrame", Iterator["pd.DataFrame"]]:
+    """
+    Fast path for reading query results into pandas DataFrames, complementing `insert_bulk`.
+
+    In contrast to `pd.read_sql()`, which goes through SQLAlchemy's `Row` objects and
+    result processors, the DataFrame is built from the columns of the HTTP response,
+    using the column types reported by CrateDB:
+
+    - `TIMESTAMP WITH TIME ZONE` columns become `datetime64[ms, UTC]`, and
+      `TIMESTAMP WITHOUT TIME ZONE` columns `datetime64[ms]`.
+    - Integer and `BOOLEAN` columns use pandas' nullable dtypes, like `Int64`.
+    - `TEXT` columns become categorical, when the ratio of distinct values to
+      rows does not exceed `category_ratio`. Use `None` to turn this off.
+
+    With `chunksize`, rows are retrieved using a server-side cursor, and an
+    iterator of DataFrames of up to `chunksize` rows is returned.
+    """
+    if chunksize is None:
+        response = execute_raw(conn, statement)
+        return _frame(
+            response.get("cols", []),
+            response.get("col_types"),
+            response.get("rows", []),
+            category_ratio,
+        )
+    return (
+        _frame(names, types, rows, category_ratio)
+        for names, types, rows in iterate_raw(conn, statement, chunksize)
+    )
+
+
+def _frame(names, types, rows, category_ratio) -> "pd.DataFrame":
+    import pandas as pd
+
+    types = types or [None] * len(names)
+    columns = list(zip(*rows)) if rows else [()] * len(names)
+    return pd.DataFrame(
+        {
+            name: _series(values, type_, category_ratio)
+            for name, type_, values in zip(names, types, columns)
+        },
+        columns=names,
+    )
+
+
+def _series(values: Sequence, type_, category_ratio) -> "pd.Series":
+    import pandas as pd
+
+    if type_ in _NULLABLE_DTYPES:
+        return pd.Series(pd.array(values, dtype=_NULLABLE_DTYPES[type_]))
+    if type_ in _STRING_TYPES and category_ratio is not None:
+        series = pd.Series(values, dtype=object)
+        if len(series) and series.nunique() <= category_ratio * len(series):
+            return series.astype("category")
+        return series
+    array = to_array(values, type_)
+    if type_ == DataType.TIMESTAMP_WITH_TZ.value:
+        return pd.Series(array).dt.tz_localize("UTC")
+    if array.ndim > 1:
+        # One `float32` array per `FLOAT_VECTOR` value.
+        return pd.Series(list(array), dtype=object)
+    return pd.Series(array)
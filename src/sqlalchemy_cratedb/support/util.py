@@ -4,6 +4,7 @@ import typing as t
 import sqlalchemy as sa
 
 from sqlalchemy_cratedb.dialect import CrateDialect
+from sqlalchemy_cratedb.sa_version import SA_1_4, SA_VERSION
 
 if t.TYPE_CHECKING:
     try:
@@ -80,3 +81,145 @@ def quote_relation_name(ident: str) -> str:
     if len(parts) > 3:
         raise ValueError(f"Invalid relation name, too many parts: {ident}")
     return ".".join(map(identifier_preparer.quote, parts))
+
+
+def execute_raw(connection, statement) -> t.Dict[str, t.Any]:
+    """
+    Execute a statement, and return the decoded HTTP response of CrateDB.
+
+    The response is taken from the DB-API cursor, before SQLAlchemy builds
+    rows and applies result processors, so utilities converting results into
+    columnar formats do not pay for them.
+    """
+    result = connection.execution_options(stream_results=False).execute(statement)
+    try:
+        return result.context.cursor._result
+    finally:
+        result.close()
+
+
+def iterate_raw(
+    connection, statement, page_size: int
+) -> t.Iterator[t.Tuple[t.List[str], t.List, t.List]]:
+    """
+    Execute a query using a server-side cursor, and yield its raw rows in pages.
+
+    Each page is yielded as a tuple of column names, CrateDB column types as
+    reported in `col_types`, and rows. The first page is yielded even when
+    it is empty, so consumers can derive a schema from it.
+    """
+    # Execute through SQLAlchemy, so bind parameters are rendered and processed,
+    # and the dialect applies timeouts and retries. The dialect streams the
+    # result using a `ServerSideCursor`, see `CrateExecutionContext`.
+    result = connection.execution_options(stream_results=True, yield_per=page_size).execute(
+        statement
+    )
+    try:
+        cursor = result.context.cursor
+        names = [column[0] for column in cursor.description or ()]
+        types = cursor._result.get("col_types")
+        yield names, types, _fetch_raw(result, page_size)
+        while True:
+            rows = _fetch_raw(result, page_size)
+            if not rows:
+                return
+            yield names, types, rows
+    finally:
+        result.close()
+
+
+def _fetch_raw(result, size: int) -> t.List:
+    """
+    Fetch rows from the fetch strategy of a result, including the row it
+    buffered already, before SQLAlchemy applies result processors.
+
+    The strategy is replaced when the result is exhausted, so look it up per call.
+    """
+    if SA_VERSION < SA_1_4:
+        # SQLAlchemy 1.3 has no fetch strategies, and does not buffer streamed rows.
+        return result.cursor.fetchmany(size)
+    return result.cursor_strategy.fetchmany(result, result.cursor, size)
+
+
+def iterate_keyset(
+    connection,
+    statement: "sa.sql.Select",
+    key: t.Union["sa.ColumnElement", t.Sequence["sa.ColumnElement"]],
+    page_size: int = 10_000,
+) -> t.Iterator["sa.Row"]:
+    """
+    Iterate over the rows of a `SELECT` statement in pages, using keyset pagination.
+
+    Instead of `LIMIT/OFFSET`, which gets slower with growing offsets, each page
+    is selected using `WHERE key > :last ORDER BY key LIMIT :page_size`, where
+    `:last` is the key of the last row of the previous page.
+
+    The key must be unique and not `NULL`, for example the primary key. Pass a
+    sequence of columns for composite keys. The statement must not have its own
+    `ORDER BY` or `LIMIT` clauses. Key columns not selected by the statement are
+    selected additionally, and removed from the rows again.
+
+    The statement can be executed using a `Connection`, or an ORM `Session`,
+    where selected entities are returned as ORM objects.
+
+        for row in iterate_keyset(session, sa.select(Item), key=Item.id, page_size=10_000):
+            ...
+    """
+    if page_size < 1:
+        raise ValueError("Page size must be a positive number")
+    keys = list(key) if isinstance(key, (list, tuple)) else [key]
+    keys = [k.__clause_element__() if hasattr(k, "__clause_element__") else k for k in keys]
+
+    # Locate the key columns within the rows. Rows of an ORM session hold one
+    # element per selected entity or column, as listed by `column_descriptions`.
+    if isinstance(connection, (sa.orm.Session, sa.orm.scoping.scoped_session)):
+        columns = [description["expr"] for description in statement.column_descriptions]
+    else:
+        columns = list(statement.selected_columns)
+    width = len(columns)
+    indexes = [_column_index(columns, k) for k in keys]
+    added = [k for k, index in zip(keys, indexes) if index is None]
+    statement = statement.add_columns(*added)
+    positions = iter(range(width, width + len(added)))
+    indexes = [next(positions) if index is None else index for index in indexes]
+
+    statement = statement.order_by(*keys).limit(page_size)
+    last: t.Optional[t.Tuple] = None
+    while True:
+        page = statement
+        if last is not None:
+            page = statement.where(_keyset_after(keys, last))
+        result = connection.execute(page)
+        if added:
+            frozen = result.freeze()
+            rows = frozen().all()
+            yield from frozen().columns(*range(width))
+        else:
+            rows = result.all()
+            yield from rows
+        if len(rows) < page_size:
+            return
+        last = tuple(rows[-1][index] for index in indexes)
+
+
+def _column_index(columns, column) -> t.Optional[int]:
+    for index, candidate in enumerate(columns):
+        if hasattr(candidate, "__clause_element__"):
+            candidate = candidate.__clause_element__()
+        if isinstance(candidate, sa.sql.elements.Label):
+            candidate = candidate.element
+        # Selected ORM entities are not columns.
+        if isinstance(candidate, sa.sql.ColumnElement) and candidate.compare(column):
+            return index
+    return None
+
+
+def _keyset_after(keys, values):
+    """
+    Render `(k1, k2, ...) > (v1, v2, ...)`, without relying on row value comparisons.
+    """
+    clauses = []
+    for position, (k, value) in enumerate(zip(keys, values)):
+        equal = [keys[i] == values[i] for i in range(position)]
+        clauses.append(sa.and_(*equal, k > value))
+    return sa.or_(*clauses)
@@ -1,13 +1,17 @@
-from .array import ObjectArray
-from .geo import Geopoint, Geoshape
-from .object import ObjectType
+from .array import LazyObjectArray, ObjectArray, ReadOnlyObjectArray
+from .geo import Geopoint, Geoshape, LazyGeoShape
+from .object import ObjectType, ReadOnlyObjectType
 from .vector import FloatVector, knn_match
 
 __all__ = [
     Geopoint,
     Geoshape,
+    LazyGeoShape,
+    LazyObjectArray,
     ObjectArray,
     ObjectType,
+    ReadOnlyObjectArray,
+    ReadOnlyObjectType,
     FloatVector,
     knn_match,
 ]
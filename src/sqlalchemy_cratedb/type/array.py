@@ -21,6 +21,8 @@
 
 # ruff: noqa: A005  # Module `array` shadows a Python standard-library module
 
+from collections.abc import MutableSequence
+
 import sqlalchemy.types as sqltypes
 from sqlalchemy.ext.mutable import Mutable
 from sqlalchemy.sql import default_comparator, expression, operators
@@ -71,6 +73,96 @@ class MutableList(Mutable, list):
         self.changed()
 
 
+class LazyMutableList(Mutable, MutableSequence):
+    """
+    Change-tracking view on a loaded list, without copying it.
+
+    `MutableList` copies each list when loading it. This view wraps the
+    list as it has been decoded from the response, and reports changes
+    when it is modified in place. Unlike `MutableList`, it is not a
+    subclass of `list`.
+    """
+
+    @classmethod
+    def coerce(cls, key, value):
+        """Wrap plain list into LazyMutableList"""
+        if isinstance(value, LazyMutableList) or value is None:
+            return value
+        if isinstance(value, list):
+            return cls(value)
+        return cls([value])
+
+    def __init__(self, initval=None):
+        self._data = [] if initval is None else initval
+
+    def tolist(self):
+        """Return the wrapped list."""
+        return self._data
+
+    def __getitem__(self, index):
+        return self._data[index]
+
+    def __len__(self):
+        return len(self._data)
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __contains__(self, item):
+        return item in self._data
+
+    def __eq__(self, other):
+        if isinstance(other, LazyMutableList):
+            other = other._data
+        return self._data == other
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self):
+        return repr(self._data)
+
+    def __setitem__(self, index, value):
+        self._data[index] = value
+        self.changed()
+
+    def __delitem__(self, index):
+        del self._data[index]
+        self.changed()
+
+    def insert(self, index, item):
+        self._data.insert(index, item)
+        self.changed()
+
+    def append(self, item):
+        self._data.append(item)
+        self.changed()
+
+    def extend(self, iterable):
+        self._data.extend(iterable)
+        self.changed()
+
+    def pop(self, index=-1):
+        item = self._data.pop(index)
+        self.changed()
+        return item
+
+    def remove(self, item):
+        self._data.remove(item)
+        self.changed()
+
+    def clear(self):
+        self._data.clear()
+        self.changed()
+
+    def sort(self, *args, **kwargs):
+        self._data.sort(*args, **kwargs)
+        self.changed()
+
+    def reverse(self):
+        self._data.reverse()
+        self.changed()
+
+
 class Any(expression.ColumnElement):
     """Represent the clause ``left operator ANY (right)``.  ``right`` must be
     an array expression.
@@ -142,8 +234,18 @@ class _ObjectArray(sqltypes.UserDefinedType):
     def get_col_spec(self, **kws):
         return "ARRAY(OBJECT)"
 
+    def bind_processor(self, dialect):
+        def process(value):
+            if isinstance(value, LazyMutableList):
+                return value._data
+            return value
+
+        return process
+
     def as_generic(self, **kwargs):
         return sqltypes.ARRAY
 
 
 ObjectArray = MutableList.as_mutable(_ObjectArray)
+LazyObjectArray = LazyMutableList.as_mutable(_ObjectArray)
+ReadOnlyObjectArray = _ObjectArray()
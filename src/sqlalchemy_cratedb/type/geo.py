@@ -1,11 +1,117 @@
+import struct
+import typing as t
+from collections.abc import Mapping
+
 import geojson
 from sqlalchemy import types as sqltypes
 from sqlalchemy.sql import default_comparator, operators
 
+Bounds = t.Tuple[float, float, float, float]
+
+
+class LazyGeoShape(Mapping):
+    """
+    Read-only view on a decoded GeoJSON mapping of a `GEO_SHAPE` value.
+
+    Mapping access, `__geo_interface__`, and `bounds` use the decoded
+    mapping as it is. The `geojson` object is only built when accessing
+    other attributes, like `coordinates` or `is_valid`, or using `to_geojson`.
+    """
+
+    __slots__ = ("_data", "_geojson")
+
+    def __init__(self, data: t.Mapping[str, t.Any]):
+        self._data = data
+        self._geojson: t.Optional[geojson.GeoJSON] = None
+
+    @property
+    def __geo_interface__(self) -> t.Mapping[str, t.Any]:
+        return self._data
+
+    @property
+    def type(self) -> t.Optional[str]:
+        return self._data.get("type")
+
+    @property
+    def bounds(self) -> t.Optional[Bounds]:
+        """
+        Bounding box of the shape as `(min_x, min_y, max_x, max_y)`, or `None` when empty.
+        """
+        return _bounds(self._data)
+
+    def to_geojson(self) -> geojson.GeoJSON:
+        if self._geojson is None:
+            self._geojson = geojson.GeoJSON.to_instance(self._data)
+        return self._geojson
+
+    def to_shapely(self):
+        return _shapely().geometry.shape(self._data)
+
+    def __getattr__(self, name: str) -> t.Any:
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return getattr(self.to_geojson(), name)
+
+    def __getitem__(self, key: str) -> t.Any:
+        return self._data[key]
+
+    def __iter__(self) -> t.Iterator[str]:
+        return iter(self._data)
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __repr__(self) -> str:
+        return repr(self.to_geojson())
+
+
+def _bounds(data: t.Mapping[str, t.Any]) -> t.Optional[Bounds]:
+    """
+    Compute the bounding box of a GeoJSON geometry, without materializing it.
+    """
+    xs: t.List[float] = []
+    ys: t.List[float] = []
+    pending = [data]
+    while pending:
+        item = pending.pop()
+        if isinstance(item, Mapping):
+            if "geometries" in item:
+                pending.extend(item["geometries"])
+            elif "coordinates" in item:
+                pending.append(item["coordinates"])
+        elif item and isinstance(item[0], (int, float)):
+            xs.append(item[0])
+            ys.append(item[1])
+        else:
+            pending.extend(item)
+    if not xs:
+        return None
+    return min(xs), min(ys), max(xs), max(ys)
+
 
 class Geopoint(sqltypes.UserDefinedType):
+    """
+    CrateDB's `GEO_POINT` type.
+
+    Parameters can be `(lon, lat)` sequences, including rows of NumPy
+    arrays of shape `(N, 2)`, WKT strings like `POINT (9.74 47.41)`, or
+    objects implementing `__geo_interface__`, like `geojson.Point`.
+
+    Values are returned as `(lon, lat)` tuples by default. Use
+    `result_type="raw"` in order to receive the decoded lists as they are.
+    """
+
     cache_ok = True
 
+    result_types = ("tuple", "raw")
+
+    def __init__(self, result_type: str = "tuple"):
+        if result_type not in self.result_types:
+            raise ValueError(
+                "`result_type` parameter must be one of: {}".format(", ".join(self.result_types))
+            )
+        self.result_type = result_type
+
     class Comparator(sqltypes.TypeEngine.Comparator):
         def __getitem__(self, key):
             return default_comparator._binary_operate(self.expr, operators.getitem, key)
@@ -15,21 +121,63 @@ class Geopoint(sqltypes.UserDefinedType):
 
     def bind_processor(self, dialect):
         def process(value):
-            if isinstance(value, geojson.Point):
-                return value.coordinates
+            # Sequences, NumPy arrays, and WKT strings are sent as they are.
+            interface = getattr(value, "__geo_interface__", None)
+            if interface is not None:
+                return interface["coordinates"]
             return value
 
         return process
 
     def result_processor(self, dialect, coltype):
-        return tuple
+        if self.result_type == "raw":
+            return None
+
+        def process(value):
+            if value is None:
+                return None
+            return tuple(value)
+
+        return process
 
     comparator_factory = Comparator
 
 
 class Geoshape(sqltypes.UserDefinedType):
+    """
+    CrateDB's `GEO_SHAPE` type.
+
+    Parameters can be GeoJSON mappings, WKT strings, WKB bytes, or objects
+    implementing `__geo_interface__`, like `geojson` objects or `shapely`
+    geometries. In order to shrink requests, use `precision` to round
+    coordinates to the given number of decimal places, dropping points
+    which become duplicates, and `simplify` to simplify shapes with the
+    given tolerance, using `shapely`.
+
+    Values are returned as `LazyGeoShape` objects by default. Use
+    `result_type="geojson"` in order to receive `geojson` objects, or
+    `result_type="raw"` in order to receive the decoded mappings as
+    they are, without any processing per row.
+    """
+
     cache_ok = True
 
+    result_types = ("lazy", "geojson", "raw")
+
+    def __init__(
+        self,
+        result_type: str = "lazy",
+        precision: t.Optional[int] = None,
+        simplify: t.Optional[float] = None,
+    ):
+        if result_type not in self.result_types:
+            raise ValueError(
+                "`result_type` parameter must be one of: {}".format(", ".join(self.result_types))
+            )
+        self.result_type = result_type
+        self.precision = precision
+        self.simplify = simplify
+
     class Comparator(sqltypes.TypeEngine.Comparator):
         def __getitem__(self, key):
             return default_comparator._binary_operate(self.expr, operators.getitem, key)
@@ -37,7 +185,153 @@ class Geoshape(sqltypes.UserDefinedType):
     def get_col_spec(self):
         return "GEO_SHAPE"
 
+    def bind_processor(self, dialect):
+        precision = self.precision
+        tolerance = self.simplify
+        reshape = precision is not None or bool(tolerance)
+
+        def process(value):
+            if value is None:
+                return None
+            if isinstance(value, str):
+                # CrateDB parses WKT strings by itself.
+                if not reshape:
+                    return value
+                value = _shapely().wkt.loads(value)
+            elif isinstance(value, (bytes, bytearray, memoryview)):
+                value = wkb_to_geojson(value)
+            value = getattr(value, "__geo_interface__", value)
+            if tolerance:
+                value = _shapely().geometry.shape(value).simplify(tolerance).__geo_interface__
+            if precision is not None:
+                value = _round_geometry(value, precision)
+            return value
+
+        return process
+
     def result_processor(self, dialect, coltype):
-        return geojson.GeoJSON.to_instance
+        if self.result_type == "raw":
+            return None
+        factory = geojson.GeoJSON.to_instance if self.result_type == "geojson" else LazyGeoShape
+
+        def process(value):
+            if value is None:
+                return None
+            return factory(value)
+
+        return process
 
     comparator_factory = Comparator
+
+
+def _shapely():
+    try:
+        import shapely.geometry
+        import shapely.wkt
+    except ImportError as ex:
+        raise ImportError(
+            "Converting shapes needs the `shapely` package. Install it using `pip install shapely`."
+        ) from ex
+    return shapely
+
+
+def _round_geometry(data: t.Mapping[str, t.Any], ndigits: int) -> t.Dict[str, t.Any]:
+    """
+    Round the coordinates of a GeoJSON geometry to `ndigits` decimal places.
+    """
+    rounded = dict(data)
+    if "geometries" in data:
+        rounded["geometries"] = [_round_geometry(item, ndigits) for item in data["geometries"]]
+    elif "coordinates" in data:
+        rounded["coordinates"] = _round_coordinates(data["coordinates"], ndigits)
+    return rounded
+
+
+def _round_coordinates(coordinates: t.Sequence, ndigits: int) -> t.List:
+    if not coordinates:
+        return list(coordinates)
+    if isinstance(coordinates[0], (int, float)):
+        return [round(number, ndigits) for number in coordinates]
+    if coordinates[0] and isinstance(coordinates[0][0], (int, float)):
+        positions = [[round(number, ndigits) for number in position] for position in coordinates]
+        return _drop_duplicates(positions)
+    return [_round_coordinates(item, ndigits) for item in coordinates]
+
+
+def _drop_duplicates(positions: t.List[t.List[float]]) -> t.List[t.List[float]]:
+    """
+    Drop consecutive duplicate positions, unless rings or lines would degenerate.
+    """
+    unique = [positions[0]]
+    for position in positions[1:]:
+        if position != unique[-1]:
+            unique.append(position)
+    closed = len(positions) >= 4 and positions[0] == positions[-1]
+    return unique if len(unique) >= (4 if closed else 2) else positions
+
+
+# Geometry types of WKB, by their numeric codes.
+_WKB_TYPES = {
+    1: "Point",
+    2: "LineString",
+    3: "Polygon",
+    4: "MultiPoint",
+    5: "MultiLineString",
+    6: "MultiPolygon",
+    7: "GeometryCollection",
+}
+
+
+def wkb_to_geojson(data: t.Union[bytes, bytearray, memoryview]) -> t.Dict[str, t.Any]:
+    """
+    Decode a geometry in Well-Known Binary (WKB) format into a GeoJSON mapping.
+
+    Supports 2D and 3D geometries in ISO WKB and PostGIS EWKB flavours.
+    """
+    geometry, _ = _read_wkb(memoryview(data).cast("B"), 0)
+    return geometry
+
+
+def _read_wkb(data: memoryview, offset: int) -> t.Tuple[t.Dict[str, t.Any], int]:
+    order = "<" if data[offset] == 1 else ">"
+    (code,) = struct.unpack_from(order + "I", data, offset + 1)
+    offset += 5
+    flags, base = code & 0xF0000000, code & 0x0FFFFFFF
+    if flags & 0x40000000 or 2000 <= base < 4000:
+        raise ValueError("WKB geometries with M coordinates are not supported")
+    dimensions = 3 if flags & 0x80000000 or 1000 <= base < 2000 else 2
+    if flags & 0x20000000:
+        # Skip the SRID of EWKB.
+        offset += 4
+    name = _WKB_TYPES.get(base % 1000)
+    if name is None:
+        raise ValueError("Unsupported WKB geometry type: %d" % code)
+
+    def position():
+        nonlocal offset
+        values = struct.unpack_from(order + "d" * dimensions, data, offset)
+        offset += 8 * dimensions
+        return list(values)
+
+    def count():
+        nonlocal offset
+        (value,) = struct.unpack_from(order + "I", data, offset)
+        offset += 4
+        return value
+
+    def positions():
+        return [position() for _ in range(count())]
+
+    if name == "Point":
+        return {"type": name, "coordinates": position()}, offset
+    if name == "LineString":
+        return {"type": name, "coordinates": positions()}, offset
+    if name == "Polygon":
+        return {"type": name, "coordinates": [positions() for _ in range(count())]}, offset
+    members = []
+    for _ in range(count()):
+        member, offset = _read_wkb(data, offset)
+        members.append(member)
+    if name == "GeometryCollection":
+        return {"type": name, "geometries": members}, offset
+    return {"type": name, "coordinates": [member["coordinates"] for member in members]}, offset
@@ -5,6 +5,14 @@ from sqlalchemy.ext.mutable import Mutable
 
 
 class MutableDict(Mutable, dict):
+    """
+    Dictionary tracking changes of its keys, in order to update them individually.
+
+    Nested dictionaries are wrapped into `MutableDict` objects reporting to the
+    root object, when they are accessed first, instead of when loading a value.
+    Only the root object holds the sets of changed and deleted keys.
+    """
+
     @classmethod
     def coerce(cls, key, value):
         "Convert plain dictionaries to MutableDict."
@@ -19,23 +27,26 @@ class MutableDict(Mutable, dict):
             return value
 
     def __init__(self, initval=None, to_update=None, root_change_key=None):
-        initval = initval or {}
-        self._changed_keys = set()
-        self._deleted_keys = set()
+        dict.__init__(self, initval or {})
         self._overwrite_key = root_change_key
         self.to_update = self if to_update is None else to_update
-        for k in initval:
-            initval[k] = self._convert_dict(
-                initval[k], overwrite_key=k if self._overwrite_key is None else self._overwrite_key
-            )
-        dict.__init__(self, initval)
+        if root_change_key is None:
+            self._changed_keys = set()
+            self._deleted_keys = set()
+        # Whether values may contain nested dictionaries not wrapped yet.
+        self._unwrapped = True
+
+    def __getitem__(self, key):
+        value = dict.__getitem__(self, key)
+        if isinstance(value, dict) and not isinstance(value, MutableDict):
+            value = self._convert_dict(value, self._change_key(key))
+            dict.__setitem__(self, key, value)
+        return value
 
     def __setitem__(self, key, value):
-        value = self._convert_dict(
-            value, key if self._overwrite_key is None else self._overwrite_key
-        )
+        value = self._convert_dict(value, self._change_key(key))
         dict.__setitem__(self, key, value)
-        self.to_update.on_key_changed(key if self._overwrite_key is None else self._overwrite_key)
+        self.to_update.on_key_changed(self._change_key(key))
 
     def __delitem__(self, key):
         dict.__delitem__(self, key)
@@ -47,11 +58,46 @@ class MutableDict(Mutable, dict):
         else:
             self.to_update.on_key_changed(self._overwrite_key)
 
+    def get(self, key, default=None):
+        if key in self:
+            return self[key]
+        return default
+
+    def setdefault(self, key, default=None):
+        if key not in self:
+            self[key] = default
+        return self[key]
+
+    def values(self):
+        self._wrap_values()
+        return dict.values(self)
+
+    def items(self):
+        self._wrap_values()
+        return dict.items(self)
+
     def on_key_changed(self, key):
         self._deleted_keys.discard(key)
         self._changed_keys.add(key)
         self.changed()
 
+    def _change_key(self, key):
+        """
+        Key of the root object to mark as changed, when the value at `key` changes.
+        """
+        return key if self._overwrite_key is None else self._overwrite_key
+
+    def _wrap_values(self):
+        """
+        Wrap all nested dictionaries, before handing out values in bulk.
+        """
+        if not self._unwrapped:
+            return
+        for key, value in dict.items(self):
+            if isinstance(value, dict) and not isinstance(value, MutableDict):
+                dict.__setitem__(self, key, self._convert_dict(value, self._change_key(key)))
+        self._unwrapped = False
+
     def _convert_dict(self, value, overwrite_key):
         if isinstance(value, dict) and not isinstance(value, MutableDict):
             return MutableDict(value, self.to_update, overwrite_key)
@@ -71,6 +117,10 @@ class ObjectTypeImpl(sqltypes.UserDefinedType, sqltypes.JSON):
 # Designated name to refer to. `Object` is too ambiguous.
 ObjectType = MutableDict.as_mutable(ObjectTypeImpl)
 
+# The same type, loading plain dictionaries without tracking changes.
+# In-place modifications are not persisted, only assigning new values is.
+ReadOnlyObjectType = ObjectTypeImpl()
+
 # Backward-compatibility aliases.
 _deprecated_Craty = ObjectType
 _deprecated_Object = ObjectType
@@ -91,4 +141,4 @@ def __getattr__(name):
     raise AttributeError(f"module {__name__} has no attribute {name}")
 
 
-__all__ = deprecated_names + ["ObjectType"]
+__all__ = deprecated_names + ["ObjectType", "ReadOnlyObjectType"]
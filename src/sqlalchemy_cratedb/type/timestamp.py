@@ -0,0 +1,286 @@
+# -*- coding: utf-8; -*-
+#
+# Licensed to CRATE Technology GmbH ("Crate") under one or more contributor
+# license agreements.  See the NOTICE file distributed with this work for
+# additional information regarding copyright ownership.  Crate licenses
+# this file to you under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.  You may
+# obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+# WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.  See the
+# License for the specific language governing permissions and limitations
+# under the License.
+#
+# However, if you have executed another commercial license agreement
+# with Crate these terms will supersede the license and you may use the
+# software solely pursuant to the terms of the relevant commercial agreement.
+"""
+## About
+Convert between CrateDB timestamps and `datetime` and `date` objects.
+
+## Details
+CrateDB returns values of `TIMESTAMP` columns as milliseconds since the
+Unix epoch. Values of dynamically mapped columns, or of documents indexed
+using other means than SQL, are returned in the format they have been
+inserted, usually as ISO 8601 strings.
+
+The decoders are result processors of the `Date` and `DateTime` types,
+which SQLAlchemy creates once per result column of a compiled statement.
+Integers are converted using plain arithmetic. The format of strings is
+detected once, and remembered by the decoder, so subsequent rows of the
+same column are parsed using a single attempt, and without logging.
+
+`decode_many` converts whole columns of result buffers at once, using
+NumPy when it is installed.
+
+When the engine uses the `result_timezone` parameter, values of
+`DateTime(timezone=True)` columns are returned as aware `datetime` objects
+in the given zone. For zones with a fixed UTC offset, the epoch is
+converted into the zone once per column, so values are converted using
+the same arithmetic as naive ones. Other zones convert using the
+transition tables of `zoneinfo`.
+
+When binding parameters using `bind_timestamps="epoch"`, values are sent
+as milliseconds since the epoch as well, instead of strings which CrateDB
+would need to parse again. Naive values are interpreted as UTC, like
+CrateDB does. NumPy `datetime64` values and pandas `Timestamp` objects are
+converted using NumPy, and `to_epoch_ms_many` converts whole arrays or
+series at once.
+"""
+
+import logging
+import typing as t
+import zoneinfo
+from datetime import date, datetime, timedelta, timezone, tzinfo
+
+logger = logging.getLogger(__name__)
+
+__all__ = [
+    "EPOCH",
+    "AwareTimestampDecoder",
+    "DateDecoder",
+    "TimestampDecoder",
+    "get_timezone",
+    "to_epoch_ms",
+    "to_epoch_ms_many",
+]
+
+EPOCH = datetime(1970, 1, 1)
+"""Origin of CrateDB timestamps, as naive `datetime` in UTC."""
+
+_EPOCH_UTC = EPOCH.replace(tzinfo=timezone.utc)
+_EPOCH_DATE = EPOCH.date()
+_MILLISECOND = timedelta(milliseconds=1)
+_MS_PER_DAY = 86_400_000
+
+# Range of milliseconds since the epoch which `datetime` can represent.
+_MIN_MS = (datetime.min - EPOCH) // _MILLISECOND
+_MAX_MS = (datetime.max - EPOCH) // _MILLISECOND
+
+
+class TimestampDecoder:
+    """
+    Convert values of a timestamp column into naive `datetime` objects in UTC.
+    """
+
+    formats: t.Tuple[str, ...] = ("%Y-%m-%dT%H:%M:%S.%fZ", "%Y-%m-%d")
+    """Formats of timestamp strings, in order of detection."""
+
+    __slots__ = ("_format",)
+
+    def __init__(self):
+        self._format: t.Optional[str] = None
+
+    def __call__(self, value: t.Any) -> t.Optional[datetime]:
+        if type(value) is int:
+            return EPOCH + timedelta(milliseconds=value)
+        if value is None or value == "":
+            return None
+        return self._decode(value)
+
+    def decode_many(self, values: t.Sequence[t.Any]) -> t.List[t.Optional[datetime]]:
+        """
+        Convert a sequence of values, for example a column of a result buffer.
+        """
+        converted = _from_epoch_many(values, "ms")
+        if converted is not None:
+            return converted
+        return [self(value) for value in values]
+
+    def _decode(self, value: t.Any) -> datetime:
+        if isinstance(value, str):
+            return self._parse(value)
+        if isinstance(value, datetime):
+            return value
+        if isinstance(value, (int, float)):
+            return EPOCH + timedelta(milliseconds=value)
+        raise TypeError("Unable to decode timestamp of type %s" % type(value).__name__)
+
+    def _parse(self, value: str) -> datetime:
+        """
+        Parse a timestamp string, using the format detected by a previous row first.
+        """
+        if self._format is not None:
+            try:
+                return datetime.strptime(value, self._format)
+            except ValueError:
+                pass
+        for format_ in self.formats:
+            try:
+                parsed = datetime.strptime(value, format_)
+            except ValueError:
+                continue
+            if self._format is None:
+                # Crate doesn't really have datetime or date types but a
+                # timestamp type. The conversion to long is only applied if
+                # the schema definition for the column exists and if the sql
+                # insert statement was used. In case of dynamic mapping or
+                # using the rest indexing endpoint, the timestamp will be
+                # returned in the format it was inserted.
+                logger.warning(
+                    "Received timestamp isn't a long value, parsing column using format %s",
+                    format_,
+                )
+            self._format = format_
+            return parsed
+        raise ValueError(
+            "Timestamp %r does not match any of the formats %s" % (value, self.formats)
+        )
+
+
+class AwareTimestampDecoder(TimestampDecoder):
+    """
+    Convert values of a timestamp column into aware `datetime` objects in the given zone.
+    """
+
+    __slots__ = ("zone", "_epoch")
+
+    def __init__(self, zone: tzinfo = timezone.utc):
+        super().__init__()
+        self.zone = zone
+        self._epoch: t.Optional[datetime] = None
+        if isinstance(zone, timezone):
+            self._epoch = _EPOCH_UTC.astimezone(zone)
+
+    def __call__(self, value: t.Any) -> t.Optional[datetime]:
+        if type(value) is int:
+            if self._epoch is not None:
+                return self._epoch + timedelta(milliseconds=value)
+            return (_EPOCH_UTC + timedelta(milliseconds=value)).astimezone(self.zone)
+        if value is None or value == "":
+            return None
+        value = self._decode(value)
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return value.astimezone(self.zone)
+
+    def decode_many(self, values: t.Sequence[t.Any]) -> t.List[t.Optional[datetime]]:
+        return [self(value) for value in values]
+
+
+class DateDecoder(TimestampDecoder):
+    """
+    Convert values of a timestamp column into `date` objects.
+    """
+
+    formats = ("%Y-%m-%d", "%Y-%m-%dT%H:%M:%S.%fZ")
+
+    __slots__ = ()
+
+    def __call__(self, value: t.Any) -> t.Optional[date]:  # type: ignore[override]
+        if type(value) is int:
+            return (EPOCH + timedelta(milliseconds=value)).date()
+        if value is None or value == "":
+            return None
+        return self._decode(value).date()
+
+    def decode_many(self, values: t.Sequence[t.Any]) -> t.List[t.Optional[date]]:  # type: ignore[override]
+        converted = _from_epoch_many(values, "D")
+        if converted is not None:
+            return converted
+        return [self(value) for value in values]
+
+
+def _from_epoch_many(values: t.Sequence[t.Any], unit: str) -> t.Optional[t.List[t.Any]]:
+    """
+    Convert milliseconds since the epoch using NumPy, truncated to `unit`.
+
+    Returns `None` when NumPy is not installed, or when values are not
+    exclusively integers within the range of `datetime`.
+    """
+    try:
+        import numpy as np
+    except ImportError:
+        return None
+    if not all(type(value) is int or value is None for value in values):
+        return None
+    try:
+        array = np.array(values, dtype="datetime64[ms]")
+    except OverflowError:
+        return None
+    valid = array[~np.isnat(array)]
+    if valid.size and (
+        valid.min().astype(np.int64) < _MIN_MS or valid.max().astype(np.int64) > _MAX_MS
+    ):
+        return None
+    if unit != "ms":
+        array = array.astype("datetime64[%s]" % unit)
+    return array.astype(object).tolist()
+
+
+def get_timezone(zone: t.Union[str, tzinfo]) -> tzinfo:
+    """
+    Resolve a time zone by its IANA name, returning `datetime.timezone.utc` for UTC.
+    """
+    if isinstance(zone, tzinfo):
+        return zone
+    if zone.upper() == "UTC":
+        return timezone.utc
+    return zoneinfo.ZoneInfo(zone)
+
+
+def to_epoch_ms(value: t.Any) -> t.Any:
+    """
+    Convert a `datetime`, `date`, NumPy `datetime64`, or pandas `Timestamp`
+    into milliseconds since the epoch, truncating sub-millisecond fractions.
+
+    Other values, like integers or strings, are returned unmodified.
+    """
+    # pandas `Timestamp` and `NaT` provide their value as `datetime64` in UTC.
+    value = getattr(value, "asm8", value)
+    if isinstance(value, datetime):
+        if value.utcoffset() is None:
+            return (value.replace(tzinfo=None) - EPOCH) // _MILLISECOND
+        return (value - _EPOCH_UTC) // _MILLISECOND
+    if isinstance(value, date):
+        return (value - _EPOCH_DATE).days * _MS_PER_DAY
+    if getattr(getattr(value, "dtype", None), "kind", None) == "M":
+        ms = value.astype("datetime64[ms]")
+        # Only `NaT` does not equal itself.
+        if ms != ms:
+            return None
+        return int(ms.astype("int64"))
+    return value
+
+
+def to_epoch_ms_many(values: t.Any) -> t.List[t.Any]:
+    """
+    Convert a sequence of values into milliseconds since the epoch.
+
+    NumPy arrays of `datetime64` values, and pandas series or indexes of
+    timestamps, including timezone-aware ones, are converted at once.
+    """
+    dtype = getattr(values, "dtype", None)
+    if getattr(dtype, "kind", None) == "M":
+        import numpy as np
+
+        array = np.asarray(values, dtype="datetime64[ms]")
+        nat = np.isnat(array)
+        converted = array.astype("int64").astype(object)
+        converted[nat] = None
+        return converted.tolist()
+    return [to_epoch_ms(value) for value in values]
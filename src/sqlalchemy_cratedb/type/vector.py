@@ -62,7 +62,9 @@ def from_db(value: t.Iterable) -> t.Optional["npt.ArrayLike"]:
     return np.array(value, dtype=np.float32)
 
 
-def to_db(value: t.Any, dim: t.Optional[int] = None) -> t.Optional[t.List]:
+def to_db(
+    value: t.Any, dim: t.Optional[int] = None
+) -> t.Optional[t.Union[t.List, "npt.ArrayLike"]]:
     import numpy as np
 
     # from `pgvector.utils`
@@ -78,7 +80,8 @@ def to_db(value: t.Any, dim: t.Optional[int] = None) -> t.Optional[t.List]:
         ):
             raise ValueError("dtype must be numeric")
 
-        value = value.tolist()
+        # Hand over arrays as they are, the JSON codec serializes them natively.
+        value = np.ascontiguousarray(value)
 
     if dim is not None and len(value) != dim:
         raise ValueError("expected %d dimensions, not %d" % (dim, len(value)))
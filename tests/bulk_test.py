@@ -127,7 +127,7 @@ class SqlAlchemyBulkTest(TestCase):
         ]
 
         with patch(
-            "crate.client.http.Client.sql",
+            "sqlalchemy_cratedb.driver.client.Client.sql",
             autospec=True,
             return_value={
                 "cols": [],
@@ -1,8 +1,13 @@
 # Copyright (c) 2021-2023, Crate.io Inc.
 # Distributed under the terms of the AGPLv3 license, see LICENSE.
+from unittest.mock import patch
+
 import pytest
+import sqlalchemy as sa
 from cratedb_toolkit.testing.testcontainers.cratedb import CrateDBTestAdapter
 
+from sqlalchemy_cratedb.driver.client import Client
+
 # Use different schemas for storing the subsystem database tables, and the
 # test/example data, so that they do not accidentally touch the default `doc`
 # schema.
@@ -19,3 +24,38 @@ def cratedb_service():
     db.start()
     yield db
     db.stop()
+
+
+@pytest.fixture
+def server_infos():
+    """
+    Answer the server information requests of new connections, without a CrateDB server.
+    """
+    info = ("http://127.0.0.1:4200", "node-a", "5.8.0")
+    with patch.object(Client, "server_infos", return_value=info) as mock:
+        yield mock
+
+
+@pytest.fixture
+def engine_factory(server_infos):
+    """
+    Create engines using `sa.create_engine`, which do not connect to a CrateDB server.
+    """
+    engines = []
+
+    def factory(url="crate://", **kwargs):
+        engine = sa.create_engine(url, **kwargs)
+        engines.append(engine)
+        return engine
+
+    yield factory
+    for engine in engines:
+        engine.dispose()
+
+
+@pytest.fixture
+def engine(engine_factory):
+    """
+    Provide an engine using the default settings, which does not connect to a CrateDB server.
+    """
+    return engine_factory()
@@ -0,0 +1,344 @@
+import asyncio
+import datetime as dt
+import gzip
+import json
+from unittest.mock import patch
+
+import httpx
+import pytest
+import sqlalchemy as sa
+from crate.client.converter import Converter, DataType
+
+# The asynchronous dialect requires SQLAlchemy 1.4 or higher.
+pytest.importorskip("sqlalchemy.ext.asyncio")
+
+from sqlalchemy.ext.asyncio import create_async_engine  # noqa: E402
+
+from sqlalchemy_cratedb import StatementTimeout  # noqa: E402
+from sqlalchemy_cratedb.dialect_async import CrateDialectAsync  # noqa: E402
+from tests.util import untag  # noqa: E402
+
+
+class FakeCrateDB:
+    """
+    Emulate CrateDB's HTTP interface, recording all SQL requests.
+    """
+
+    def __init__(self):
+        self.requests = []
+        self.headers = []
+        self.pings = 0
+        self.cursors = {}
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        if request.method == "GET" and request.url.path == "/":
+            self.pings += 1
+            return httpx.Response(200, json={"name": "node-1", "version": {"number": "5.8.0"}})
+        content = request.content
+        if request.headers.get("content-encoding") == "gzip":
+            content = gzip.decompress(content)
+        payload = json.loads(content)
+        self.requests.append((str(request.url), payload))
+        self.headers.append(request.headers)
+        stmt = untag(payload["stmt"])
+        if stmt.startswith("SELECT id FROM sys.jobs"):
+            return httpx.Response(
+                200,
+                json={"cols": ["id"], "col_types": [4], "rows": [["job-1"]], "rowcount": 1},
+            )
+        if stmt.startswith("DECLARE "):
+            self.cursors[stmt.split()[1]] = 0
+            return httpx.Response(200, json={"cols": [], "rowcount": 1, "duration": 1})
+        if stmt.startswith("FETCH "):
+            _, _, count, _, name = stmt.split()
+            offset = self.cursors[name]
+            rows = [["Arthur", 42 + i] for i in range(offset, min(offset + int(count), 5))]
+            self.cursors[name] = offset + len(rows)
+            return httpx.Response(
+                200,
+                json={"cols": ["name", "age"], "col_types": [4, 9], "rows": rows, "rowcount": 1},
+            )
+        if stmt.startswith("CLOSE "):
+            del self.cursors[stmt.split()[1]]
+            return httpx.Response(200, json={"cols": [], "rowcount": 1, "duration": 1})
+        if stmt.startswith("KILL"):
+            return httpx.Response(200, json={"cols": [], "rowcount": 1, "duration": 1})
+        if stmt.startswith("SELECT ts"):
+            return httpx.Response(
+                200,
+                json={"cols": ["ts", "id"], "col_types": [11, 9], "rows": [[0, 1]], "rowcount": 1},
+            )
+        if stmt.startswith("SELECT sleep"):
+            raise httpx.ReadTimeout("Read timed out", request=request)
+        if stmt.startswith("SELECT broken"):
+            return httpx.Response(
+                400,
+                json={"error": {"message": "SQLParseException[broken]", "code": 4000}},
+            )
+        if "bulk_args" in payload:
+            return httpx.Response(
+                200,
+                json={
+                    "cols": [],
+                    "duration": 1,
+                    "results": [{"rowcount": 1} for _ in payload["bulk_args"]],
+                },
+            )
+        return httpx.Response(
+            200,
+            json={
+                "cols": ["name", "age"],
+                "col_types": [4, 9],
+                "rows": [["Arthur", 42], ["Trillian", 39]],
+                "rowcount": 2,
+                "duration": 1,
+            },
+        )
+
+
+@pytest.fixture
+def fake_cratedb():
+    return FakeCrateDB()
+
+
+@pytest.fixture
+def async_engine_factory(fake_cratedb):
+    def factory(url="crate+async://", engine_args=None, **connect_args):
+        connect_args["transport"] = httpx.MockTransport(fake_cratedb)
+        return create_async_engine(url, connect_args=connect_args, **(engine_args or {}))
+
+    return factory
+
+
+def test_async_dialect_loaded(async_engine_factory):
+    engine = async_engine_factory()
+    assert isinstance(engine.dialect, CrateDialectAsync)
+    assert engine.dialect.is_async is True
+    assert engine.dialect.paramstyle == "qmark"
+
+
+def test_async_select(fake_cratedb, async_engine_factory):
+    async def main():
+        engine = async_engine_factory()
+        async with engine.connect() as conn:
+            result = await conn.execute(
+                sa.text("SELECT name, age FROM characters WHERE age > :age"), {"age": 30}
+            )
+            rows = result.fetchall()
+        await engine.dispose()
+        return engine, rows
+
+    engine, rows = asyncio.run(main())
+    assert engine.dialect.server_version_info == (5, 8, 0)
+    assert [tuple(row) for row in rows] == [("Arthur", 42), ("Trillian", 39)]
+    url, payload = fake_cratedb.requests[-1]
+    assert url == "http://127.0.0.1:4200/_sql?types=true"
+    assert untag(payload["stmt"]) == "SELECT name, age FROM characters WHERE age > ?"
+    assert payload["args"] == [30]
+
+
+@pytest.mark.parametrize(
+    "connect_args,expected",
+    [
+        ({}, (0, 1)),
+        (
+            {"time_zone": "+0100"},
+            (dt.datetime(1970, 1, 1, 1, tzinfo=dt.timezone(dt.timedelta(hours=1))), 1),
+        ),
+        ({"converter": Converter({DataType.INTEGER: str})}, (0, "1")),
+    ],
+)
+def test_async_converter(fake_cratedb, async_engine_factory, connect_args, expected):
+    async def main():
+        engine = async_engine_factory(**connect_args)
+        async with engine.connect() as conn:
+            result = await conn.exec_driver_sql("SELECT ts, id FROM t")
+            row = result.one()
+        await engine.dispose()
+        return row
+
+    assert tuple(asyncio.run(main())) == expected
+
+
+def test_async_executemany(fake_cratedb, async_engine_factory):
+    async def main():
+        engine = async_engine_factory("crate+async://otherhost:4201")
+        async with engine.connect() as conn:
+            result = await conn.execute(
+                sa.text("UPDATE characters SET age = :age WHERE name = :name"),
+                [{"name": "Arthur", "age": 42}, {"name": "Ford", "age": 43}],
+            )
+        await engine.dispose()
+        return result
+
+    result = asyncio.run(main())
+    assert result.rowcount == 2
+    url, payload = fake_cratedb.requests[-1]
+    assert url == "http://otherhost:4201/_sql?types=true"
+    assert untag(payload["stmt"]) == "UPDATE characters SET age = ? WHERE name = ?"
+    assert payload["bulk_args"] == [[42, "Arthur"], [43, "Ford"]]
+
+
+def test_async_concurrent_queries(fake_cratedb, async_engine_factory):
+    async def query(engine):
+        async with engine.connect() as conn:
+            result = await conn.execute(sa.text("SELECT name, age FROM characters"))
+            return len(result.fetchall())
+
+    async def main():
+        engine = async_engine_factory()
+        counts = await asyncio.gather(*[query(engine) for _ in range(10)])
+        await engine.dispose()
+        return counts
+
+    assert asyncio.run(main()) == [2] * 10
+
+
+def test_async_error_translated(async_engine_factory):
+    async def main():
+        engine = async_engine_factory()
+        try:
+            async with engine.connect() as conn:
+                await conn.execute(sa.text("SELECT broken"))
+        finally:
+            await engine.dispose()
+
+    with pytest.raises(sa.exc.ProgrammingError) as ex:
+        asyncio.run(main())
+    ex.match(r"SQLParseException\[broken\]")
+
+
+def test_async_compression(fake_cratedb, async_engine_factory):
+    async def main():
+        engine = async_engine_factory("crate+async://?compression=gzip&compression_threshold=0")
+        async with engine.connect() as conn:
+            await conn.execute(sa.text("SELECT name, age FROM characters"))
+        await engine.dispose()
+
+    asyncio.run(main())
+    assert fake_cratedb.headers[0]["content-encoding"] == "gzip"
+    assert "gzip" in fake_cratedb.headers[0]["accept-encoding"]
+    assert untag(fake_cratedb.requests[0][1]["stmt"]) == "SELECT name, age FROM characters"
+
+
+def test_async_compression_disabled(fake_cratedb, async_engine_factory):
+    async def main():
+        engine = async_engine_factory("crate+async://?compression=none")
+        async with engine.connect() as conn:
+            await conn.execute(sa.text("SELECT name, age FROM characters"))
+        await engine.dispose()
+
+    asyncio.run(main())
+    assert "content-encoding" not in fake_cratedb.headers[0]
+
+
+def test_async_statement_timeout(async_engine_factory):
+    async def main():
+        engine = async_engine_factory()
+        async with engine.connect() as conn:
+            with pytest.raises(StatementTimeout) as ex:
+                await conn.execute(
+                    sa.text("SELECT sleep(5000)"), execution_options={"timeout": 0.5}
+                )
+        await engine.dispose()
+        return ex
+
+    ex = asyncio.run(main())
+    ex.match("Statement exceeded timeout of 0.5 seconds")
+    assert ex.value.statement == "SELECT sleep(5000)"
+
+
+def test_async_kill_on_cancel(fake_cratedb, async_engine_factory):
+    async def main():
+        engine = async_engine_factory()
+        async with engine.connect() as conn:
+            with pytest.raises(StatementTimeout):
+                await conn.execute(
+                    sa.text("SELECT sleep(5000)"), execution_options={"timeout": 0.5}
+                )
+        await engine.dispose()
+
+    asyncio.run(main())
+    statements = [payload["stmt"] for _, payload in fake_cratedb.requests]
+    assert statements[0].startswith("/* job ")
+    assert statements[0].endswith("*/ SELECT sleep(5000)")
+    tag = statements[0].split()[2]
+    assert fake_cratedb.requests[1][1] == {
+        "stmt": "SELECT id FROM sys.jobs WHERE stmt LIKE ?",
+        "args": ["%" + tag + "%"],
+    }
+    assert fake_cratedb.requests[2][1] == {"stmt": "KILL ?", "args": ["job-1"]}
+
+
+def test_async_pre_ping(fake_cratedb, async_engine_factory):
+    async def main():
+        engine = async_engine_factory(engine_args={"pool_pre_ping": True})
+        for _ in range(2):
+            async with engine.connect() as conn:
+                await conn.execute(sa.text("SELECT name, age FROM characters"))
+        await engine.dispose()
+
+    asyncio.run(main())
+    # One request for the server version when connecting, and one ping on the second checkout.
+    assert fake_cratedb.pings == 2
+    assert len(fake_cratedb.requests) == 2
+
+
+def test_async_server_infos_shared_between_connections(fake_cratedb, async_engine_factory):
+    async def main():
+        engine = async_engine_factory(engine_args={"poolclass": sa.pool.NullPool})
+        for _ in range(3):
+            async with engine.connect() as conn:
+                await conn.execute(sa.text("SELECT name, age FROM characters"))
+        await engine.dispose()
+
+    asyncio.run(main())
+    assert fake_cratedb.pings == 1
+    assert len(fake_cratedb.requests) == 3
+
+
+def test_async_stream_results(fake_cratedb, async_engine_factory):
+    async def main():
+        engine = async_engine_factory()
+        async with engine.connect() as conn:
+            result = await conn.stream(
+                sa.text("SELECT name, age FROM characters"), execution_options={"yield_per": 2}
+            )
+            ages = [row.age async for row in result]
+        await engine.dispose()
+        return ages
+
+    assert asyncio.run(main()) == [42, 43, 44, 45, 46]
+    statements = [untag(payload["stmt"]) for _, payload in fake_cratedb.requests]
+    assert statements[0].startswith("DECLARE sa_cursor_")
+    assert statements[1:4] == ["FETCH FORWARD 2 FROM " + statements[0].split()[1]] * 3
+    assert statements[4].startswith("CLOSE ")
+    assert fake_cratedb.cursors == {}
+
+
+def test_async_stream_results_single_connection(fake_cratedb, async_engine_factory):
+    clients = []
+    request = httpx.AsyncClient.request
+
+    async def record_request(self, method, url, **kwargs):
+        clients.append(self)
+        return await request(self, method, url, **kwargs)
+
+    async def main():
+        engine = async_engine_factory()
+        async with engine.connect() as conn:
+            client = (await conn.get_raw_connection()).driver_connection
+            await conn.execute(sa.text("SELECT name, age FROM characters"))
+            result = await conn.stream(
+                sa.text("SELECT name, age FROM characters"), execution_options={"yield_per": 2}
+            )
+            ages = [row.age async for row in result]
+        await engine.dispose()
+        return client, ages
+
+    with patch.object(httpx.AsyncClient, "request", record_request):
+        client, ages = asyncio.run(main())
+    assert ages == [42, 43, 44, 45, 46]
+    # DECLARE, FETCH, and CLOSE use the client limited to a single connection.
+    assert clients[-5:] == [client._pinned_client] * 5
+    assert clients[-6] is client._client
@@ -0,0 +1,78 @@
+import datetime as dt
+import json
+from decimal import Decimal
+from unittest.mock import MagicMock
+
+import pytest
+import sqlalchemy as sa
+
+from sqlalchemy_cratedb.driver.client import Client
+from sqlalchemy_cratedb.driver.codec import CODECS, get_codec
+
+SERVER = "http://localhost:4200"
+
+
+@pytest.fixture(params=sorted(CODECS))
+def codec(request):
+    if request.param == "msgspec":
+        pytest.importorskip("msgspec")
+    return get_codec(request.param)
+
+
+def test_codec_roundtrip(codec):
+    payload = {"stmt": "SELECT ?", "args": [Decimal("42.42"), "foo", None, [1, 2]]}
+    assert json.loads(codec.dumps(payload)) == {
+        "stmt": "SELECT ?",
+        "args": ["42.42", "foo", None, [1, 2]],
+    }
+    assert codec.loads(b'{"rows": [[1, "foo"]]}') == {"rows": [[1, "foo"]]}
+
+
+def test_codec_numpy(codec):
+    np = pytest.importorskip("numpy")
+    matrix = np.arange(6, dtype=np.float32).reshape(2, 3)
+    payload = {"vector": matrix[0], "column": matrix[:, 1], "scalar": np.int64(42)}
+    assert json.loads(codec.dumps(payload)) == {
+        "vector": [0.0, 1.0, 2.0],
+        "column": [1.0, 4.0],
+        "scalar": 42,
+    }
+
+
+@pytest.mark.parametrize("name", ["json", "orjson"])
+def test_codec_datetime_epoch(name):
+    codec = get_codec(name)
+    assert codec.dumps(dt.datetime(2020, 1, 1, 0, 0, 1)) == b"1577836801000"
+
+
+def test_codec_unknown():
+    with pytest.raises(ValueError) as ex:
+        get_codec("foo")
+    ex.match("Unknown JSON codec: foo, expected one of: json, msgspec, orjson")
+
+
+def test_client_uses_codec():
+    codec = MagicMock(wraps=get_codec("json"))
+    client = Client([SERVER], codec=codec)
+    response = MagicMock(status=200, data=b'{"cols": [], "rowcount": 1}')
+    response.get_redirect_location.return_value = False
+    client.server_pool[SERVER].request = MagicMock(return_value=response)
+
+    assert client.sql("SELECT ?", [42]) == {"cols": [], "rowcount": 1}
+    codec.dumps.assert_called_once_with({"stmt": "SELECT ?", "args": [42]})
+    codec.loads.assert_called_once_with(b'{"cols": [], "rowcount": 1}')
+
+
+def test_dialect_json_codec_option(server_infos):
+    engine = sa.create_engine("crate://otherhost:19201/?json_codec=json")
+    conn = engine.raw_connection()
+    assert conn.driver_connection.client.codec is get_codec("json")
+    conn.close()
+    engine.dispose()
+
+
+def test_dialect_json_codec_invalid():
+    engine = sa.create_engine("crate://otherhost:19201/?json_codec=foo")
+    with pytest.raises(sa.exc.SQLAlchemyError) as ex:
+        engine.raw_connection()
+    ex.match("`json_codec` parameter must be one of: orjson, msgspec, json")
@@ -0,0 +1,103 @@
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+import sqlalchemy as sa
+from crate.client.exceptions import ProgrammingError
+
+from sqlalchemy_cratedb.driver.client import Client
+from sqlalchemy_cratedb.driver.limiter import AdaptiveLimiter, is_rejection
+from sqlalchemy_cratedb.support.pandas import _insert_batch, _split_batch
+
+SERVER = "http://127.0.0.1:4200"
+
+
+def test_limiter_aimd():
+    limiter = AdaptiveLimiter(initial=4, minimum=1, maximum=5, decrease=0.5)
+    assert limiter.try_acquire(SERVER)
+    limiter.release(SERVER)
+    assert limiter.limit(SERVER) == 4.25
+    assert limiter.try_acquire(SERVER)
+    limiter.release(SERVER, rejected=True)
+    assert limiter.limit(SERVER) == 2.125
+    for _ in range(3):
+        assert limiter.try_acquire(SERVER)
+        limiter.release(SERVER, rejected=True)
+    assert limiter.limit(SERVER) == 1
+    for _ in range(100):
+        assert limiter.try_acquire(SERVER)
+        limiter.release(SERVER)
+    assert limiter.limit(SERVER) == 5
+    assert limiter.in_flight(SERVER) == 0
+
+
+def test_limiter_caps_in_flight():
+    limiter = AdaptiveLimiter(initial=2)
+    assert limiter.acquire(SERVER)
+    assert limiter.acquire(SERVER)
+    assert not limiter.try_acquire(SERVER)
+    assert not limiter.acquire(SERVER, timeout=0.01)
+    assert not asyncio.run(limiter.acquire_async(SERVER, timeout=0.01))
+    limiter.release(SERVER)
+    assert limiter.acquire(SERVER, timeout=0.01)
+    assert limiter.in_flight(SERVER) == 2
+
+
+def test_is_rejection():
+    assert is_rejection(429, b"")
+    assert is_rejection(500, b'{"error": {"message": "EsRejectedExecutionException[...]"}}')
+    assert not is_rejection(400, b'{"error": {"message": "SQLParseException[...]"}}')
+    assert not is_rejection(200, b"RejectedExecutionException")
+
+
+def test_client_limiter_shrinks_on_rejection():
+    limiter = AdaptiveLimiter(initial=8)
+    client = Client([SERVER], limiter=limiter)
+    response = MagicMock(
+        status=500,
+        reason="Internal Server Error",
+        data=b'{"error": {"message": "EsRejectedExecutionException[rejected]", "code": 5000}}',
+    )
+    response.headers = {"content-type": "application/json"}
+    response.get_redirect_location.return_value = False
+    client.server_pool[SERVER].request = MagicMock(return_value=response)
+    with pytest.raises(ProgrammingError):
+        client.sql("INSERT INTO foo (x) VALUES (?)", [1])
+    assert limiter.limit(SERVER) == 4
+    assert limiter.in_flight(SERVER) == 0
+
+
+def test_dialect_concurrency_option(server_infos):
+    engine = sa.create_engine("crate://otherhost:19201/?concurrency=adaptive")
+    conn = engine.raw_connection()
+    assert conn.driver_connection.client.limiter is engine.dialect._limiter
+    conn.close()
+    engine.dispose()
+
+
+def test_dialect_concurrency_invalid():
+    engine = sa.create_engine("crate://otherhost:19201/?concurrency=foo")
+    with pytest.raises(sa.exc.SQLAlchemyError) as ex:
+        engine.raw_connection()
+    ex.match("`concurrency` parameter must be one of: unlimited, adaptive")
+
+
+def test_split_batch_by_content_length():
+    data = [[i, "x" * 90] for i in range(1000)]
+    batches = _split_batch(data, max_content_length=10_000)
+    assert len(batches) > 1
+    assert sum(len(batch) for batch in batches) == 1000
+    assert all(len(str(batch)) < 10_000 for batch in batches)
+    assert _split_batch(data, max_content_length=None) == [data]
+
+
+def test_insert_batch_splits_on_413():
+    def execute(sql, bulk_parameters):
+        if len(bulk_parameters) > 2:
+            raise ProgrammingError("413 Client Error: Request Entity Too Large")
+
+    cursor = MagicMock()
+    cursor.execute.side_effect = execute
+    _insert_batch(cursor, "INSERT", list(range(8)))
+    sent = [call.kwargs["bulk_parameters"] for call in cursor.execute.call_args_list]
+    assert [batch for batch in sent if len(batch) <= 2] == [[0, 1], [2, 3], [4, 5], [6, 7]]
@@ -0,0 +1,129 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+import sqlalchemy as sa
+from crate.client import exceptions
+from urllib3.exceptions import MaxRetryError
+
+from sqlalchemy_cratedb.driver.client import Client
+from sqlalchemy_cratedb.driver.routing import NodeRouter
+
+SERVER_A = "http://node-a:4200"
+SERVER_B = "http://node-b:4200"
+
+
+def test_router_prefers_fast_node():
+    router = NodeRouter()
+    router.record_success(SERVER_A, 0.500)
+    router.record_success(SERVER_B, 0.010)
+    assert router.select([SERVER_A, SERVER_B]) == SERVER_B
+
+
+def test_router_probes_unmeasured_node():
+    router = NodeRouter()
+    router.record_success(SERVER_A, 0.010)
+    assert router.select([SERVER_A, SERVER_B]) == SERVER_B
+
+
+def test_router_quarantine_exponential():
+    router = NodeRouter(quarantine_base=1.0, quarantine_max=3.0)
+    with patch("time.monotonic", return_value=100.0):
+        router.record_failure(SERVER_A)
+        assert router.stats(SERVER_A).quarantined_until == 101.0
+        router.record_failure(SERVER_A)
+        assert router.stats(SERVER_A).quarantined_until == 102.0
+        router.record_failure(SERVER_A)
+        assert router.stats(SERVER_A).quarantined_until == 103.0
+        assert router.available([SERVER_A, SERVER_B]) == [SERVER_B]
+        assert router.select([SERVER_A, SERVER_B]) == SERVER_B
+
+    # After the quarantine expired, the node is eligible for a probe again.
+    with patch("time.monotonic", return_value=104.0):
+        assert router.available([SERVER_A, SERVER_B]) == [SERVER_A, SERVER_B]
+
+    router.record_success(SERVER_A, 0.010)
+    assert router.stats(SERVER_A).failures == 0
+    assert router.stats(SERVER_A).quarantined_until == 0.0
+
+
+def test_router_all_quarantined_probes_earliest():
+    router = NodeRouter()
+    router.record_failure(SERVER_A)
+    router.record_failure(SERVER_B)
+    router.record_failure(SERVER_B)
+    assert router.select([SERVER_A, SERVER_B]) == SERVER_A
+
+
+def test_client_fails_over_and_records_health():
+    router = NodeRouter()
+    client = Client([SERVER_A, SERVER_B], router=router)
+
+    response = MagicMock(status=200)
+    response.get_redirect_location.return_value = False
+    client.server_pool[SERVER_A].request = MagicMock(side_effect=MaxRetryError(None, "/"))
+    client.server_pool[SERVER_B].request = MagicMock(return_value=response)
+
+    for _ in range(3):
+        assert client._request("GET", "/") is response
+
+    assert router.stats(SERVER_A).failures == 1
+    assert router.stats(SERVER_B).latency is not None
+    assert client.server_pool[SERVER_A].request.call_count <= 1
+
+
+def test_client_all_servers_failing():
+    client = Client([SERVER_A, SERVER_B], router=NodeRouter())
+    for server in (SERVER_A, SERVER_B):
+        client.server_pool[server].request = MagicMock(side_effect=MaxRetryError(None, "/"))
+    with pytest.raises(exceptions.ConnectionError) as ex:
+        client._request("GET", "/")
+    ex.match("No more Servers available")
+
+
+def test_dialect_routing_option(server_infos):
+    engine = sa.create_engine("crate://", connect_args={"routing": "latency"})
+    first = engine.raw_connection()
+    second = engine.raw_connection()
+    assert first.driver_connection.client.router is engine.dialect._router
+    assert second.driver_connection.client.router is engine.dialect._router
+    first.close()
+    second.close()
+    engine.dispose()
+
+
+def test_dialect_routing_default(server_infos):
+    engine = sa.create_engine("crate://otherhost:4201/?routing=roundrobin")
+    conn = engine.raw_connection()
+    assert conn.driver_connection.client.router is None
+    conn.close()
+    engine.dispose()
+
+
+def test_dialect_routing_invalid():
+    engine = sa.create_engine("crate://otherhost:4201/?routing=foo")
+    with pytest.raises(sa.exc.SQLAlchemyError) as ex:
+        engine.raw_connection()
+    ex.match("`routing` parameter must be one of: roundrobin, latency")
+
+
+@pytest.mark.parametrize(
+    "query, expected",
+    [
+        ("?compression=none", False),
+        ("?compression=gzip&compression_threshold=1024", 1024),
+        ("?compression_threshold=0", 0),
+    ],
+)
+def test_dialect_compression_option(server_infos, query, expected):
+    engine = sa.create_engine(f"crate://otherhost:19201/{query}")
+    conn = engine.raw_connection()
+    assert conn.driver_connection.client.compress == expected
+    conn.close()
+    engine.dispose()
+
+
+def test_dialect_compression_invalid():
+    engine = sa.create_engine("crate://otherhost:19201/?compression=brotli")
+    with pytest.raises(sa.exc.SQLAlchemyError) as ex:
+        engine.raw_connection()
+    ex.match("`compression` parameter must be one of: gzip, none")
@@ -0,0 +1,52 @@
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+import sqlalchemy as sa
+
+from sqlalchemy_cratedb.dialect import TYPES_MAP
+from sqlalchemy_cratedb.driver.client import Client
+
+RESPONSE = {
+    "cols": ["numeric", "decimal", "explicit", "numeric_float", "float", "float_decimal"],
+    "col_types": [6, 6, 6, 6, 6, 6],
+    "rows": [[42.42] * 6, [None] * 6],
+    "rowcount": 2,
+}
+
+STATEMENT = sa.select(
+    sa.column("numeric", sa.Numeric),
+    sa.column("decimal", sa.DECIMAL),
+    sa.column("explicit", sa.Numeric(asdecimal=True)),
+    sa.column("numeric_float", sa.Numeric(asdecimal=False)),
+    sa.column("float", sa.Float),
+    sa.column("float_decimal", sa.Float(asdecimal=True)),
+).select_from(sa.table("testdrive"))
+
+
+def fetch(engine_factory, **kwargs):
+    engine = engine_factory("crate://", **kwargs)
+    with patch.object(Client, "sql", return_value=RESPONSE), engine.connect() as conn:
+        rows = conn.execute(STATEMENT).fetchall()
+    return [tuple(row) for row in rows]
+
+
+def test_numeric_results(engine_factory):
+    rows = fetch(engine_factory)
+    decimal = Decimal("42.42")
+    assert rows == [(decimal, decimal, decimal, 42.42, 42.42, decimal), (None,) * 6]
+    assert [type(value) for value in rows[0]] == [Decimal, Decimal, Decimal, float, float, Decimal]
+
+
+def test_numeric_asdecimal_disabled(engine_factory):
+    rows = fetch(engine_factory, numeric_asdecimal=False)
+    assert rows[0] == (42.42, 42.42, 42.42, 42.42, 42.42, Decimal("42.42"))
+    assert [type(value) for value in rows[0][:5]] == [float] * 5
+
+
+@pytest.mark.parametrize("name", ["double", "double precision"])
+def test_reflect_double_as_float(name):
+    type_ = sa.types.to_instance(TYPES_MAP[name])
+    assert isinstance(type_, sa.Float)
+    assert type_.asdecimal is False
+    assert sa.create_engine("crate://").dialect.type_compiler.process(type_).startswith("DOUBLE")
@@ -0,0 +1,59 @@
+from unittest.mock import MagicMock, patch
+
+import pytest
+import sqlalchemy as sa
+from crate.client.http import Server
+from urllib3.exceptions import MaxRetryError
+
+SERVER = "http://127.0.0.1:4200"
+
+
+def ok_response():
+    response = MagicMock(status=200, data=b'{"name": "node-a"}')
+    response.get_redirect_location.return_value = False
+    return response
+
+
+@pytest.fixture(autouse=True)
+def server_request():
+    """
+    Answer the pings of new connections, which SQLAlchemy 1.3 also pings on checkout.
+    """
+    with patch.object(Server, "request", return_value=ok_response()):
+        yield
+
+
+def checkout(engine):
+    conn = engine.raw_connection()
+    client = conn.driver_connection.client
+    conn.close()
+    return client
+
+
+def test_pre_ping_uses_root_endpoint(server_infos):
+    engine = sa.create_engine("crate://", pool_pre_ping=True)
+    client = checkout(engine)
+    request = client.server_pool[SERVER].request = MagicMock(return_value=ok_response())
+    assert checkout(engine) is client
+    request.assert_called_once()
+    assert request.call_args.args == ("GET", "/")
+    engine.dispose()
+
+
+def test_pre_ping_skipped_within_window(server_infos):
+    engine = sa.create_engine("crate://", pool_pre_ping=True, pre_ping_window=60)
+    client = checkout(engine)
+    request = client.server_pool[SERVER].request = MagicMock(return_value=ok_response())
+    client.ping()
+    assert checkout(engine) is client
+    assert request.call_count == 1
+    engine.dispose()
+
+
+def test_pre_ping_failure_reconnects(server_infos):
+    engine = sa.create_engine("crate://", pool_pre_ping=True)
+    client = checkout(engine)
+    client.server_pool[SERVER].request = MagicMock(side_effect=MaxRetryError(None, "/"))
+    assert engine.dialect.do_ping(MagicMock(client=client)) is False
+    assert checkout(engine) is not client
+    engine.dispose()
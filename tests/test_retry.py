@@ -0,0 +1,103 @@
+import json
+from unittest.mock import MagicMock
+
+import pytest
+import sqlalchemy as sa
+
+from sqlalchemy_cratedb import RetryPolicy
+
+SERVER = "http://127.0.0.1:4200"
+
+
+def response(status, payload):
+    response = MagicMock(status=status, reason="Error", data=json.dumps(payload).encode())
+    response.headers = {"content-type": "application/json"}
+    response.get_redirect_location.return_value = False
+    return response
+
+
+def transient_error():
+    return response(
+        500, {"error": {"message": "NodeDisconnectedException[node-b disconnected]", "code": 5000}}
+    )
+
+
+def success():
+    return response(200, {"cols": ["x"], "rows": [[1]], "rowcount": 1})
+
+
+def test_policy_idempotent():
+    policy = RetryPolicy()
+    assert policy.is_idempotent("SELECT 1")
+    assert policy.is_idempotent("  with t AS (SELECT 1) SELECT * FROM t")
+    assert policy.is_idempotent("SHOW CREATE TABLE foo")
+    assert not policy.is_idempotent("INSERT INTO foo VALUES (1)")
+    assert not policy.is_idempotent("SELECTED")
+
+
+def test_policy_transient():
+    policy = RetryPolicy(max_retries=2)
+    error = Exception("NoShardAvailableActionException[no shard available for [get]]")
+    assert policy.should_retry(error, 0)
+    assert policy.should_retry(error, 1)
+    assert not policy.should_retry(error, 2)
+    assert not policy.should_retry(Exception("SQLParseException[line 1:1]"), 0)
+
+
+def test_policy_delay_bounded():
+    policy = RetryPolicy(backoff_base=0.1, backoff_max=0.3)
+    for retries in range(10):
+        assert 0 <= policy.delay(retries) <= min(0.3, 0.1 * 2**retries)
+
+
+@pytest.fixture
+def engine(engine_factory):
+    engine = engine_factory("crate://", retry_policy=RetryPolicy(max_retries=2))
+    engine.dialect._sleep = MagicMock()
+    return engine
+
+
+def connect(engine, *responses):
+    conn = engine.connect()
+    request = MagicMock(side_effect=list(responses))
+    conn.connection.driver_connection.client.server_pool[SERVER].request = request
+    return conn, request
+
+
+def test_dialect_retries_select(engine):
+    retry_counts = []
+    sa.event.listen(
+        engine,
+        "after_cursor_execute",
+        lambda *args: retry_counts.append(args[4].retry_count),
+    )
+    conn, request = connect(engine, transient_error(), transient_error(), success())
+    assert conn.execute(sa.text("SELECT x FROM foo")).scalar() == 1
+    assert request.call_count == 3
+    assert retry_counts == [2]
+    assert engine.dialect._sleep.call_count == 2
+    conn.close()
+
+
+def test_dialect_retries_exhausted(engine):
+    conn, request = connect(engine, *[transient_error() for _ in range(3)])
+    with pytest.raises(sa.exc.ProgrammingError) as ex:
+        conn.execute(sa.text("SELECT x FROM foo"))
+    ex.match("NodeDisconnectedException")
+    assert request.call_count == 3
+    conn.close()
+
+
+def test_dialect_no_retry_for_writes(engine):
+    conn, request = connect(engine, transient_error(), success())
+    with pytest.raises(sa.exc.ProgrammingError):
+        conn.execute(sa.text("INSERT INTO foo (x) VALUES (1)"))
+    assert request.call_count == 1
+    conn.close()
+
+
+def test_dialect_retry_idempotent_option(engine):
+    conn, request = connect(engine, transient_error(), success())
+    conn.execution_options(idempotent=True).execute(sa.text("REFRESH TABLE foo"))
+    assert request.call_count == 2
+    conn.close()
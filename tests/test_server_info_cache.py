@@ -0,0 +1,77 @@
+import time
+from unittest.mock import MagicMock, patch
+
+import sqlalchemy as sa
+from crate.client import http
+
+from sqlalchemy_cratedb.driver.cache import ServerInfoCache
+from sqlalchemy_cratedb.driver.client import Client
+
+SERVER = "http://127.0.0.1:4200"
+
+
+def open_connections(engine, count):
+    connections = [engine.raw_connection() for _ in range(count)]
+    for connection in connections:
+        connection.close()
+
+
+@patch.object(http.Client, "server_infos", return_value=(SERVER, "node-a", "5.8.0"))
+def test_server_infos_shared_between_connections(server_infos):
+    engine = sa.create_engine("crate://", poolclass=sa.pool.NullPool)
+    open_connections(engine, 5)
+    server_infos.assert_called_once_with(SERVER)
+    assert engine.dialect.server_version_info == (5, 8, 0)
+    engine.dispose()
+
+
+@patch.object(http.Client, "server_infos", return_value=(SERVER, "node-a", "5.8.0"))
+def test_server_infos_cache_disabled(server_infos):
+    engine = sa.create_engine("crate://", poolclass=sa.pool.NullPool, server_info_ttl=0)
+    open_connections(engine, 3)
+    assert server_infos.call_count == 3
+    engine.dispose()
+
+
+def test_server_infos_refreshed_in_background():
+    cache = ServerInfoCache(ttl=60)
+    cache.put(SERVER, (SERVER, "node-a", "5.7.0"))
+    client = Client([SERVER], server_info_cache=cache)
+    with patch.object(http.Client, "server_infos", return_value=(SERVER, "node-a", "5.8.0")):
+        assert client.server_infos(SERVER) == (SERVER, "node-a", "5.7.0")
+        cache.ttl = 0
+        # Expired entries are served while they are refreshed.
+        assert client.server_infos(SERVER) == (SERVER, "node-a", "5.7.0")
+        deadline = time.monotonic() + 5
+        while cache.get(SERVER)[0][2] != "5.8.0" and time.monotonic() < deadline:
+            time.sleep(0.01)
+    assert cache.get(SERVER)[0] == (SERVER, "node-a", "5.8.0")
+    assert cache.begin_refresh(SERVER) is True
+
+
+def test_server_infos_refresh_failure_keeps_entry():
+    cache = ServerInfoCache(ttl=0)
+    cache.put(SERVER, (SERVER, "node-a", "5.7.0"))
+    client = Client([SERVER], server_info_cache=cache)
+    with patch.object(http.Client, "server_infos", side_effect=http.ConnectionError("down")):
+        cache.begin_refresh(SERVER)
+        client._refresh_server_infos(SERVER)
+    assert cache.get(SERVER)[0] == (SERVER, "node-a", "5.7.0")
+    assert cache.begin_refresh(SERVER) is True
+
+
+def test_refresh_claimed_once():
+    cache = ServerInfoCache()
+    assert cache.begin_refresh(SERVER) is True
+    assert cache.begin_refresh(SERVER) is False
+    cache.end_refresh(SERVER)
+    assert cache.begin_refresh(SERVER) is True
+
+
+def test_effective_schema_name_parsed_once():
+    dialect = sa.create_engine("crate://").dialect
+    connection = MagicMock()
+    connection.engine.url.query.get.return_value = "testdrive"
+    assert dialect._get_effective_schema_name(connection) == "testdrive"
+    assert dialect._get_effective_schema_name(connection) == "testdrive"
+    connection.engine.url.query.get.assert_called_once_with("schema")
@@ -0,0 +1,189 @@
+import json
+import queue
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+import sqlalchemy as sa
+import urllib3
+from crate.client import exceptions
+from crate.client.connection import Connection
+
+from sqlalchemy_cratedb.driver.client import Client
+from sqlalchemy_cratedb.driver.cursor import ServerSideCursor
+from sqlalchemy_cratedb.sa_version import SA_1_4, SA_VERSION
+
+SERVER_A = "http://127.0.0.1:4200"
+SERVER_B = "http://127.0.0.2:4200"
+
+DECLARE = re.compile(r"DECLARE (\w+) NO SCROLL CURSOR WITH HOLD FOR (.*)", re.DOTALL)
+FETCH = re.compile(r"FETCH FORWARD (\d+) FROM (\w+)")
+
+
+class FakeCursors:
+    """
+    Emulate CrateDB cursors over a table of `size` rows, on the level of `Client.sql`.
+    """
+
+    def __init__(self, size):
+        self.rows = [[i] for i in range(size)]
+        self.cursors = {}
+        self.statements = []
+        self.fetched = []
+
+    def __call__(self, stmt, parameters=None, bulk_parameters=None):
+        self.statements.append(stmt)
+        match = DECLARE.match(stmt)
+        if match:
+            self.cursors[match.group(1)] = 0
+            return {"cols": [], "rows": [], "rowcount": 1}
+        match = FETCH.match(stmt)
+        if match:
+            count, name = int(match.group(1)), match.group(2)
+            offset = self.cursors[name]
+            rows = self.rows[offset : offset + count]
+            self.cursors[name] = offset + len(rows)
+            self.fetched.append(len(rows))
+            return {"cols": ["id"], "rows": rows, "rowcount": len(rows)}
+        if stmt.startswith("CLOSE "):
+            del self.cursors[stmt.split()[1]]
+            return {"cols": [], "rows": [], "rowcount": 1}
+        return {"cols": ["id"], "rows": self.rows, "rowcount": len(self.rows)}
+
+
+@pytest.mark.skipif(SA_VERSION < SA_1_4, reason="The `yield_per` option needs SQLAlchemy 1.4")
+def test_stream_results_in_pages(engine):
+    fake = FakeCursors(2500)
+    with patch.object(Client, "sql", side_effect=fake), engine.connect() as conn:
+        result = conn.execution_options(yield_per=1000).execute(sa.text("SELECT id FROM t"))
+        assert list(result.keys()) == ["id"]
+        ids = [row.id for row in result]
+    assert ids == list(range(2500))
+    assert fake.fetched == [1000, 1000, 500]
+    assert fake.statements[0].startswith("DECLARE sa_cursor_")
+    assert fake.statements[-1].startswith("CLOSE sa_cursor_")
+    assert fake.cursors == {}
+
+
+def test_stream_results_closed_early(engine):
+    fake = FakeCursors(2500)
+    with patch.object(Client, "sql", side_effect=fake), engine.connect() as conn:
+        result = conn.execution_options(stream_results=True, max_row_buffer=100).execute(
+            sa.text("SELECT id FROM t")
+        )
+        assert result.fetchone().id == 0
+        client = conn.connection.driver_connection.client
+        assert client.pinned_server == SERVER_A
+        result.close()
+        assert client.pinned_server is None
+    assert fake.fetched == [100]
+    assert fake.cursors == {}
+
+
+def test_stream_results_without_query(engine):
+    fake = FakeCursors(3)
+    with patch.object(Client, "sql", side_effect=fake), engine.connect() as conn:
+        conn.execution_options(stream_results=True).execute(sa.text("REFRESH TABLE t"))
+    assert fake.statements == ["REFRESH TABLE t"]
+
+
+def test_default_results_buffered(engine):
+    fake = FakeCursors(3)
+    with patch.object(Client, "sql", side_effect=fake), engine.connect() as conn:
+        assert len(conn.execute(sa.text("SELECT id FROM t")).fetchall()) == 3
+    assert fake.statements == ["SELECT id FROM t"]
+
+
+def test_cursor_fetchall_and_comments():
+    fake = FakeCursors(25)
+    client = Client([SERVER_A])
+    with patch.object(Client, "sql", side_effect=fake):
+        with patch.object(Connection, "_lowest_server_version", return_value=None):
+            cursor = ServerSideCursor(Connection(client=client).cursor(), page_size=10)
+        cursor.execute("/* job abc */ SELECT id FROM t")
+        assert cursor.description[0][0] == "id"
+        assert cursor.rowcount == -1
+        assert cursor.fetchmany(3) == [[0], [1], [2]]
+        assert len(cursor.fetchall()) == 22
+        assert cursor.fetchone() is None
+        cursor.close()
+    assert fake.fetched == [10, 10, 5]
+    assert fake.cursors == {}
+
+
+def test_pin_server():
+    client = Client([SERVER_A, SERVER_B])
+    server = client.pin_server()
+    assert client.pin_server() == server
+    assert {client._get_server() for _ in range(4)} == {server}
+    client.unpin_server()
+    assert client.pinned_server == server
+    client.unpin_server()
+    assert client.pinned_server is None
+    assert {client._get_server() for _ in range(4)} == {SERVER_A, SERVER_B}
+
+
+def test_pinned_server_dropped():
+    client = Client([SERVER_A, SERVER_B])
+    server = client.pin_server()
+    with pytest.raises(exceptions.ConnectionError, match="open cursor became unavailable"):
+        client._drop_server(server, "connection refused")
+
+
+class FakeCrateHandler(BaseHTTPRequestHandler):
+    """
+    Answer SQL requests using `FakeCursors`, recording the client port of each request.
+    """
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.requests.append((payload["stmt"], self.client_address[1]))
+        body = json.dumps(self.server.fake(payload["stmt"])).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # noqa: A002
+        pass
+
+
+@pytest.fixture
+def http_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeCrateHandler)
+    server.fake = FakeCursors(25)
+    server.requests = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_cursor_keeps_http_connection(http_server):
+    # Hand out pooled connections in turns, instead of reusing the last one.
+    with patch.object(urllib3.connectionpool.HTTPConnectionPool, "QueueCls", queue.Queue):
+        client = Client(["http://127.0.0.1:%d" % http_server.server_port], pool_size=2)
+        with patch.object(Connection, "_lowest_server_version", return_value=None):
+            connection = Connection(client=client)
+        cursor = connection.cursor()
+        for _ in range(3):
+            cursor.execute("SELECT id FROM t")
+        cursor = ServerSideCursor(connection.cursor(), page_size=10)
+        cursor.execute("SELECT id FROM t")
+        assert len(cursor.fetchall()) == 25
+        cursor.close()
+        connection.close()
+    ports = [port for _, port in http_server.requests]
+    # Two sockets are used in turns, while the cursor keeps using one of them.
+    assert len(set(ports[:3])) == 2
+    statements = [stmt for stmt, _ in http_server.requests[3:]]
+    assert statements[0].startswith("DECLARE ")
+    assert statements[-1].startswith("CLOSE ")
+    assert len(set(ports[3:])) == 1
+    assert http_server.fake.cursors == {}
@@ -0,0 +1,132 @@
+import json
+import re
+from unittest.mock import MagicMock
+
+import pytest
+import sqlalchemy as sa
+import urllib3
+from urllib3.exceptions import MaxRetryError, ReadTimeoutError
+
+from sqlalchemy_cratedb import StatementTimeout
+from sqlalchemy_cratedb.driver.client import Client
+from sqlalchemy_cratedb.exceptions import StatementTimeoutError
+
+SERVER_A = "http://node-a:4200"
+SERVER_B = "http://node-b:4200"
+
+
+def ok_response(data=b'{"cols": [], "rowcount": 1}'):
+    response = MagicMock(status=200, data=data)
+    response.get_redirect_location.return_value = False
+    return response
+
+
+def test_client_timeout_passed_to_request():
+    client = Client([SERVER_A])
+    client.server_pool[SERVER_A].request = MagicMock(return_value=ok_response())
+    with client.statement_timeout(5):
+        client._request("POST", "/_sql")
+    timeout = client.server_pool[SERVER_A].request.call_args.kwargs["timeout"]
+    assert isinstance(timeout, urllib3.Timeout)
+    assert 0 < timeout.total <= 5
+    assert client._timeout is None
+
+
+def test_client_timeout_not_failed_over():
+    client = Client([SERVER_A, SERVER_B])
+    for server in (SERVER_A, SERVER_B):
+        client.server_pool[server].request = MagicMock(
+            side_effect=ReadTimeoutError(None, "/_sql", "Read timed out.")
+        )
+    with pytest.raises(StatementTimeoutError) as ex:
+        with client.statement_timeout(0.5):
+            client._request("POST", "/_sql")
+    ex.match("Statement exceeded timeout of 0.5 seconds")
+    calls = sum(client.server_pool[s].request.call_count for s in (SERVER_A, SERVER_B))
+    assert calls == 1
+
+
+def test_client_timeout_fails_over_on_connection_error():
+    client = Client([SERVER_A, SERVER_B])
+    client.server_pool[SERVER_A].request = MagicMock(side_effect=MaxRetryError(None, "/"))
+    client.server_pool[SERVER_B].request = MagicMock(return_value=ok_response())
+    with client.statement_timeout(5):
+        for _ in range(2):
+            assert client._request("POST", "/_sql").status == 200
+    assert client.server_pool[SERVER_B].request.call_count == 2
+
+
+def test_dialect_timeout_execution_option(server_infos):
+    engine = sa.create_engine(f"crate://{SERVER_A.replace('http://', '')}")
+    with engine.connect() as conn:
+        client = conn.connection.driver_connection.client
+        client.server_pool[SERVER_A].request = MagicMock(
+            side_effect=ReadTimeoutError(None, "/_sql", "Read timed out.")
+        )
+        with pytest.raises(StatementTimeout) as ex:
+            conn.execution_options(timeout=0.5).execute(sa.text("SELECT sleep(5000)"))
+    assert isinstance(ex.value, sa.exc.OperationalError)
+    assert isinstance(ex.value.orig, StatementTimeoutError)
+    assert ex.value.statement == "SELECT sleep(5000)"
+    engine.dispose()
+
+
+def test_dialect_without_timeout(server_infos):
+    engine = sa.create_engine(f"crate://{SERVER_A.replace('http://', '')}")
+    with engine.connect() as conn:
+        client = conn.connection.driver_connection.client
+        client.server_pool[SERVER_A].request = MagicMock(return_value=ok_response())
+        conn.execute(sa.text("SELECT 1"))
+        kwargs = client.server_pool[SERVER_A].request.call_args.kwargs
+        assert "timeout" not in kwargs
+        assert re.match(r"/\* job [0-9a-f]{32} \*/ SELECT 1$", json.loads(kwargs["data"])["stmt"])
+        assert client.running_job is None
+    engine.dispose()
+
+
+def jobs_response():
+    return ok_response(b'{"cols": ["id"], "rows": [["job-1"]], "rowcount": 1}')
+
+
+def sent_statements(request):
+    return [json.loads(call.kwargs["data"])["stmt"] for call in request.call_args_list]
+
+
+def test_dialect_kill_on_interrupt(server_infos):
+    engine = sa.create_engine(f"crate://{SERVER_A.replace('http://', '')}")
+    conn = engine.connect()
+    request = conn.connection.driver_connection.client.server_pool[SERVER_A].request = MagicMock(
+        side_effect=[KeyboardInterrupt(), jobs_response(), ok_response()]
+    )
+    with pytest.raises(KeyboardInterrupt):
+        conn.execution_options(kill_on_cancel=True).execute(sa.text("SELECT sleep(5000)"))
+    statements = sent_statements(request)
+    assert statements[0].startswith("/* job ")
+    assert statements[1:] == ["SELECT id FROM sys.jobs WHERE stmt LIKE ?", "KILL ?"]
+    assert json.loads(request.call_args.kwargs["data"])["args"] == ["job-1"]
+    engine.dispose()
+
+
+def test_dialect_interrupt_without_kill_on_cancel(server_infos):
+    engine = sa.create_engine(f"crate://{SERVER_A.replace('http://', '')}")
+    conn = engine.connect()
+    request = conn.connection.driver_connection.client.server_pool[SERVER_A].request = MagicMock(
+        side_effect=[KeyboardInterrupt()]
+    )
+    with pytest.raises(KeyboardInterrupt):
+        conn.execution_options(kill_on_cancel=False).execute(sa.text("SELECT sleep(5000)"))
+    assert sent_statements(request) == ["SELECT sleep(5000)"]
+    engine.dispose()
+
+
+def test_dialect_kill_on_terminate(server_infos):
+    engine = sa.create_engine(f"crate://{SERVER_A.replace('http://', '')}")
+    dbapi_connection = engine.raw_connection().driver_connection
+    client = dbapi_connection.client
+    request = client.server_pool[SERVER_A].request = MagicMock(
+        side_effect=[jobs_response(), ok_response()]
+    )
+    client.running_job = "abc"
+    engine.dialect.do_terminate(dbapi_connection)
+    assert sent_statements(request) == ["SELECT id FROM sys.jobs WHERE stmt LIKE ?", "KILL ?"]
+    assert client.running_job is None
@@ -0,0 +1,146 @@
+import datetime as dt
+import re
+from unittest.mock import patch
+
+import pytest
+import sqlalchemy as sa
+
+from sqlalchemy_cratedb.driver.client import Client
+from sqlalchemy_cratedb.support import to_arrow
+
+pa = pytest.importorskip("pyarrow")
+
+RESPONSE = {
+    "cols": ["id", "score", "ts", "name", "embedding", "tags", "attrs", "location", "day"],
+    "col_types": [10, 6, 11, 4, 28, [100, 4], 12, 13, 24],
+    "rows": [
+        [1, 0.5, 1700000000000, "foo", [1.0, 2.0], ["a"], {"x": 1}, [9.74, 47.4], 1699920000000],
+        [2, None, None, None, [3.0, 4.0], None, None, None, None],
+    ],
+    "rowcount": 2,
+}
+
+
+def test_to_arrow_table(engine):
+    with patch.object(Client, "sql", return_value=RESPONSE), engine.connect() as conn:
+        table = to_arrow(conn, sa.text("SELECT * FROM testdrive"))
+    assert table.num_rows == 2
+    assert table.schema.names == RESPONSE["cols"]
+    assert table.schema.field("id").type == pa.int64()
+    assert table.schema.field("score").type == pa.float64()
+    assert table.schema.field("ts").type == pa.timestamp("ms", tz="UTC")
+    assert table.schema.field("name").type == pa.string()
+    assert table.schema.field("embedding").type == pa.list_(pa.float32(), 2)
+    assert table.schema.field("tags").type == pa.list_(pa.string())
+    assert table.schema.field("attrs").type == pa.struct([("x", pa.int64())])
+    assert table.schema.field("location").type == pa.list_(pa.float64(), 2)
+    assert table.schema.field("day").type == pa.date64()
+    assert table.column("id").to_pylist() == [1, 2]
+    assert table.column("attrs").to_pylist() == [{"x": 1}, None]
+
+
+def test_to_arrow_objects_as_json(engine):
+    with patch.object(Client, "sql", return_value=RESPONSE), engine.connect() as conn:
+        table = to_arrow(conn, sa.text("SELECT * FROM testdrive"), objects="json")
+    assert table.schema.field("attrs").type == pa.string()
+    assert table.column("attrs").to_pylist() == ['{"x":1}', None]
+
+
+def test_to_arrow_invalid_objects(engine):
+    with pytest.raises(ValueError, match="`objects` parameter must be one of: struct, json"):
+        to_arrow(None, sa.text("SELECT 1"), objects="dict")
+
+
+def test_to_arrow_batches(engine):
+    statements = []
+    table = [[i, "item-%d" % i] for i in range(25)]
+
+    def sql(stmt, parameters=None, bulk_parameters=None):
+        statements.append(stmt)
+        match = re.match(r"FETCH FORWARD (\d+) FROM", stmt)
+        if match:
+            count = int(match.group(1))
+            offset = sum(1 for s in statements if s.startswith("FETCH")) - 1
+            rows = table[offset * count : (offset + 1) * count]
+            return {"cols": ["id", "name"], "col_types": [9, 4], "rows": rows, "rowcount": 1}
+        return {"cols": [], "rows": [], "rowcount": 1}
+
+    with patch.object(Client, "sql", side_effect=sql), engine.connect() as conn:
+        reader = to_arrow(conn, sa.text("SELECT id, name FROM testdrive"), batch_size=10)
+        assert reader.schema == pa.schema([("id", pa.int32()), ("name", pa.string())])
+        batches = list(reader)
+    assert [batch.num_rows for batch in batches] == [10, 10, 5]
+    assert pa.Table.from_batches(batches).column("id").to_pylist() == list(range(25))
+    assert statements[0].startswith("DECLARE ")
+    assert statements[-1].startswith("CLOSE ")
+
+
+def test_to_arrow_batches_parameters(engine):
+    calls = []
+
+    def sql(stmt, parameters=None, bulk_parameters=None):
+        calls.append((stmt, parameters))
+        return {"cols": ["id"], "col_types": [9], "rows": [], "rowcount": 0}
+
+    table = sa.table("testdrive", sa.column("id"))
+    statement = sa.select(table.c.id).where(table.c.id > 5)
+    with patch.object(Client, "sql", side_effect=sql), engine.connect() as conn:
+        reader = to_arrow(conn, statement, batch_size=10)
+        assert reader.read_all().num_rows == 0
+    assert calls[0][0].endswith(
+        "FOR SELECT testdrive.id \nFROM testdrive \nWHERE testdrive.id > $1"
+    )
+    assert calls[0][1] == [5]
+
+
+def test_to_arrow_batches_null_leading_rows(engine):
+    pages = [
+        [[1, None, None, None], [2, None, None, None]],
+        [[3, {"x": 1}, [1.0, 2.0], None], [4, None, None, "foo"]],
+        [[5, {"x": 2}, None, None]],
+    ]
+    fetches = []
+
+    def sql(stmt, parameters=None, bulk_parameters=None):
+        if stmt.startswith("FETCH"):
+            fetches.append(stmt)
+            rows = pages[len(fetches) - 1] if len(fetches) <= len(pages) else []
+            return {
+                "cols": ["id", "attrs", "embedding", "name"],
+                "col_types": [10, 12, 28, 4],
+                "rows": rows,
+                "rowcount": len(rows),
+            }
+        return {"cols": [], "rows": [], "rowcount": 1}
+
+    with patch.object(Client, "sql", side_effect=sql), engine.connect() as conn:
+        reader = to_arrow(conn, sa.text("SELECT * FROM testdrive"), batch_size=2)
+        assert reader.schema == pa.schema(
+            [
+                ("id", pa.int64()),
+                ("attrs", pa.struct([("x", pa.int64())])),
+                ("embedding", pa.list_(pa.float32(), 2)),
+                ("name", pa.string()),
+            ]
+        )
+        batches = list(reader)
+    assert [batch.num_rows for batch in batches] == [2, 2, 1]
+    table = pa.Table.from_batches(batches)
+    assert table.column("attrs").to_pylist() == [None, None, {"x": 1}, None, {"x": 2}]
+    assert table.column("name").to_pylist() == [None, None, None, "foo", None]
+
+
+def test_to_arrow_timestamp_strings(engine):
+    response = {
+        "cols": ["ts", "day"],
+        "col_types": [11, 24],
+        "rows": [["2013-07-16T00:00:00.000Z", "2013-07-16"], [1700000000000, None]],
+        "rowcount": 2,
+    }
+    with patch.object(Client, "sql", return_value=response), engine.connect() as conn:
+        table = to_arrow(conn, sa.text("SELECT * FROM testdrive"))
+    assert table.column("ts").to_pylist() == [
+        dt.datetime(2013, 7, 16, tzinfo=dt.timezone.utc),
+        dt.datetime(2023, 11, 14, 22, 13, 20, tzinfo=dt.timezone.utc),
+    ]
+    assert table.column("day").to_pylist() == [dt.date(2013, 7, 16), None]
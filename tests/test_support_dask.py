@@ -0,0 +1,99 @@
+from unittest.mock import patch
+
+import pytest
+
+from sqlalchemy_cratedb.driver.client import Client
+from sqlalchemy_cratedb.support import read_dask
+
+dask = pytest.importorskip("dask")
+
+
+class FakeTables:
+    """
+    Emulate discovery queries and reads of partitions or shards, on the level of `Client.sql`.
+    """
+
+    def __init__(self, partitions=(), shards=2):
+        self.partitions = list(partitions)
+        self.shards = shards
+        self.statements = []
+
+    def __call__(self, stmt, parameters=None, bulk_parameters=None):
+        self.statements.append((stmt, parameters))
+        if "information_schema.table_partitions" in stmt:
+            assert parameters == ["doc", "metrics"]
+            rows = [[values] for values in self.partitions]
+            return {"cols": ["values"], "col_types": [12], "rows": rows, "rowcount": len(rows)}
+        if "information_schema.tables" in stmt:
+            return {"cols": ["number_of_shards"], "col_types": [9], "rows": [[self.shards]]}
+        if "WHERE false" in stmt:
+            return {"cols": ["part", "value"], "col_types": [10, 6], "rows": [], "rowcount": 0}
+        value = parameters[0]
+        return {
+            "cols": ["part", "value"],
+            "col_types": [10, 6],
+            "rows": [[value, 1.5], [value, 2.5]],
+            "rowcount": 2,
+        }
+
+
+pytestmark = pytest.mark.usefixtures("server_infos")
+
+
+def test_read_dask_partitions():
+    fake = FakeTables(partitions=[{"day": 1}, {"day": 2}, {"day": 3}])
+    with patch.object(Client, "sql", side_effect=fake):
+        ddf = read_dask("metrics", "crate://", columns=["part", "value"])
+        assert ddf.npartitions == 3
+        frame = ddf.compute(scheduler="sync")
+    assert sorted(frame["part"].tolist()) == [1, 1, 2, 2, 3, 3]
+    reads = [(stmt, params) for stmt, params in fake.statements if "WHERE day" in stmt]
+    assert len(reads) == 3
+    assert {params[0] for _, params in reads} == {1, 2, 3}
+    assert str(ddf.dtypes["part"]) == "Int64"
+    assert reads[0][0] == "SELECT part, value \nFROM doc.metrics \nWHERE day = $1"
+
+
+def test_read_dask_partition_column_names():
+    fake = FakeTables(partitions=[{"obj['ts']": 1, "Day": 2}, {"obj['ts']": None, "Day": 3}])
+    with patch.object(Client, "sql", side_effect=fake):
+        ddf = read_dask("metrics", "crate://", columns=["part", "value"])
+        ddf.compute(scheduler="sync")
+    reads = sorted(stmt for stmt, _ in fake.statements if "WHERE obj" in stmt)
+    assert reads == [
+        "SELECT part, value \nFROM doc.metrics \nWHERE obj['ts'] = $1 AND \"Day\" = $2",
+        "SELECT part, value \nFROM doc.metrics \nWHERE obj['ts'] IS NULL AND \"Day\" = $1",
+    ]
+
+
+def test_read_dask_shards():
+    fake = FakeTables(shards=4)
+    with patch.object(Client, "sql", side_effect=fake):
+        ddf = read_dask("metrics", "crate://", split="auto")
+        assert ddf.npartitions == 4
+        frame = ddf.compute(scheduler="sync")
+    assert len(frame) == 8
+    reads = [(stmt, params) for stmt, params in fake.statements if "_shard_id" in stmt]
+    assert {params[0] for _, params in reads} == {0, 1, 2, 3}
+    assert reads[0][0] == 'SELECT * \nFROM doc.metrics \nWHERE "_shard_id" = $1'
+
+
+def test_read_dask_invalid_split():
+    with pytest.raises(ValueError, match="`split` parameter must be one of"):
+        read_dask("metrics", "crate://", split="ranges")
+
+
+def test_read_dask_without_partitions():
+    fake = FakeTables(partitions=[])
+    with patch.object(Client, "sql", side_effect=fake):
+        ddf = read_dask("metrics", "crate://", split="partitions")
+        assert len(ddf.compute(scheduler="sync")) == 0
+    assert list(ddf.columns) == ["part", "value"]
+
+
+def test_read_dask_connect_args():
+    fake = FakeTables(shards=2)
+    engine_kwargs = {"connect_args": {"username": "crate", "verify_ssl_cert": False}}
+    with patch.object(Client, "sql", side_effect=fake):
+        ddf = read_dask("metrics", "crate://", engine_kwargs=engine_kwargs)
+        assert len(ddf.compute(scheduler="sync")) == 4
@@ -0,0 +1,97 @@
+import datetime as dt
+from unittest.mock import patch
+
+import numpy as np
+import sqlalchemy as sa
+
+from sqlalchemy_cratedb.driver.client import Client
+from sqlalchemy_cratedb.support import fetch_columns
+from sqlalchemy_cratedb.support.numpy import to_array
+
+RESPONSE = {
+    "cols": ["id", "score", "ratio", "ts", "flag", "name", "embedding", "tags", "day"],
+    "col_types": [10, 6, 7, 11, 3, 4, 28, [100, 4], 24],
+    "rows": [
+        [1, 0.5, 1.5, 1700000000000, True, "foo", [1.0, 2.0], ["a"], 1699920000000],
+        [2, None, 2.5, None, False, None, [3.0, 4.0], None, None],
+    ],
+    "rowcount": 2,
+}
+
+
+def test_fetch_columns(engine):
+    with patch.object(Client, "sql", return_value=RESPONSE), engine.connect() as conn:
+        columns = fetch_columns(conn, sa.text("SELECT * FROM testdrive"))
+    assert list(columns) == RESPONSE["cols"]
+    assert columns["id"].dtype == np.int64
+    assert columns["id"].tolist() == [1, 2]
+    assert columns["score"].dtype == np.float64
+    assert np.isnan(columns["score"][1])
+    assert columns["ratio"].dtype == np.float32
+    assert columns["ts"].dtype == np.dtype("datetime64[ms]")
+    assert columns["ts"][0] == np.datetime64("2023-11-14T22:13:20.000")
+    assert np.isnat(columns["ts"][1])
+    assert columns["flag"].dtype == np.bool_
+    assert columns["name"].dtype == object
+    assert columns["name"].tolist() == ["foo", None]
+    assert columns["embedding"].dtype == np.float32
+    assert columns["embedding"].shape == (2, 2)
+    assert columns["tags"].dtype == object
+    assert columns["tags"].tolist() == [["a"], None]
+    assert columns["day"].dtype == np.dtype("datetime64[ms]")
+
+
+def test_fetch_columns_nulls_and_empty(engine):
+    response = {"cols": ["id", "embedding"], "col_types": [9, 28], "rows": [[None, None]]}
+    with patch.object(Client, "sql", return_value=response), engine.connect() as conn:
+        columns = fetch_columns(conn, sa.text("SELECT id, embedding FROM testdrive"))
+    assert columns["id"].dtype == object
+    assert columns["embedding"].dtype == object
+
+    response = {"cols": ["id", "embedding"], "col_types": [9, 28], "rows": []}
+    with patch.object(Client, "sql", return_value=response), engine.connect() as conn:
+        columns = fetch_columns(conn, sa.text("SELECT id, embedding FROM testdrive"))
+    assert columns["id"].dtype == np.int32
+    assert columns["id"].shape == (0,)
+    assert columns["embedding"].shape == (0, 0)
+
+
+def test_fetch_columns_skips_result_processors(engine):
+    with patch.object(Client, "sql", return_value=RESPONSE), engine.connect() as conn:
+        statement = sa.select(sa.column("ts", sa.DateTime)).select_from(sa.table("testdrive"))
+        with patch.object(sa.DateTime, "result_processor") as result_processor:
+            columns = fetch_columns(conn, statement)
+    result_processor.assert_not_called()
+    assert columns["ts"].dtype == np.dtype("datetime64[ms]")
+
+
+def test_fetch_columns_geopoint(engine):
+    response = {
+        "cols": ["position"],
+        "col_types": [13],
+        "rows": [[[9.74, 47.41]], [None], [[-122.42, 37.77]]],
+    }
+    with patch.object(Client, "sql", return_value=response), engine.connect() as conn:
+        columns = fetch_columns(conn, sa.text("SELECT position FROM devices"))
+    position = columns["position"]
+    assert position.dtype == np.float64
+    assert position.shape == (3, 2)
+    assert position[0].tolist() == [9.74, 47.41]
+    assert np.isnan(position[1]).all()
+
+    response = {"cols": ["position"], "col_types": [13], "rows": []}
+    with patch.object(Client, "sql", return_value=response), engine.connect() as conn:
+        columns = fetch_columns(conn, sa.text("SELECT position FROM devices"))
+    assert columns["position"].shape == (0, 2)
+
+
+def test_to_array_timestamp_strings():
+    values = [1700000000000, "2013-07-16T00:00:00.000Z", None]
+    array = to_array(values, 11)
+    assert array.dtype == np.dtype("datetime64[ms]")
+    assert array.tolist()[:2] == [
+        dt.datetime(2023, 11, 14, 22, 13, 20),
+        dt.datetime(2013, 7, 16),
+    ]
+    assert np.isnat(array[2])
+    assert to_array(["2013-07-16", None], 24).tolist()[0] == dt.datetime(2013, 7, 16)
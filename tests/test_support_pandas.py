@@ -1,14 +1,19 @@
+import datetime as dt
 import re
 import sys
+from unittest.mock import patch
 
+import numpy as np
 import pandas as pd
 import pytest
+import sqlalchemy as sa
 from pandas._testing import assert_equal
 from pueblo.testing.pandas import makeTimeDataFrame
 from sqlalchemy.exc import ProgrammingError
 
-from sqlalchemy_cratedb.sa_version import SA_2_0, SA_VERSION
-from sqlalchemy_cratedb.support.pandas import table_kwargs
+from sqlalchemy_cratedb.driver.client import Client
+from sqlalchemy_cratedb.sa_version import SA_1_4, SA_2_0, SA_VERSION
+from sqlalchemy_cratedb.support.pandas import insert_bulk, read_frame, table_kwargs
 
 TABLE_NAME = "foobar"
 INSERT_RECORDS = 42
@@ -188,3 +193,107 @@ def test_float_double(cratedb_service):
 
     pd.options.display.float_format = "{:.12f}".format
     assert_equal(before, after, check_exact=True)
+
+
+READ_RESPONSE = {
+    "cols": ["id", "ts", "local", "kind", "name", "score", "flag", "embedding"],
+    "col_types": [10, 11, 15, 4, 4, 6, 3, 28],
+    "rows": [
+        [1, 1700000000000, 1700000000000, "a", "foo", 0.5, True, [1.0, 2.0]],
+        [2, None, None, "a", "bar", None, None, [3.0, 4.0]],
+        [None, 1700000001000, None, "a", "baz", 1.5, False, [5.0, 6.0]],
+    ],
+    "rowcount": 3,
+}
+
+
+def test_read_frame_dtypes(engine):
+    """
+    Validate `read_frame` builds the DataFrame with dtypes derived from the response.
+    """
+    with patch.object(Client, "sql", return_value=READ_RESPONSE), engine.connect() as conn:
+        frame = read_frame(conn, sa.text("SELECT * FROM testdrive"))
+    assert list(frame.columns) == READ_RESPONSE["cols"]
+    assert frame["id"].dtype == "Int64"
+    assert frame["id"].isna().tolist() == [False, False, True]
+    assert frame["ts"].dtype == "datetime64[ms, UTC]"
+    assert frame["ts"][0] == pd.Timestamp("2023-11-14 22:13:20", tz="UTC")
+    assert frame["local"].dtype == "datetime64[ms]"
+    assert frame["kind"].dtype == "category"
+    assert frame["name"].dtype == object
+    assert frame["score"].dtype == np.float64
+    assert frame["flag"].dtype == "boolean"
+    assert frame["embedding"][1].dtype == np.float32
+    assert frame["embedding"][1].tolist() == [3.0, 4.0]
+
+
+def test_read_frame_chunks(engine):
+    """
+    Validate `read_frame` streams DataFrames through cursor pages, when using `chunksize`.
+    """
+    statements = []
+    rows = [[i, "kind-%d" % (i % 2)] for i in range(5)]
+
+    def sql(stmt, parameters=None, bulk_parameters=None):
+        statements.append(stmt)
+        if stmt.startswith("FETCH FORWARD 2"):
+            offset = 2 * (sum(1 for s in statements if s.startswith("FETCH")) - 1)
+            page = rows[offset : offset + 2]
+            return {"cols": ["id", "kind"], "col_types": [9, 4], "rows": page, "rowcount": 1}
+        return {"cols": [], "rows": [], "rowcount": 1}
+
+    with patch.object(Client, "sql", side_effect=sql), engine.connect() as conn:
+        frames = list(read_frame(conn, sa.text("SELECT id, kind FROM testdrive"), chunksize=2))
+    assert [len(frame) for frame in frames] == [2, 2, 1]
+    assert pd.concat(frames)["id"].tolist() == list(range(5))
+    assert frames[0]["id"].dtype == "Int32"
+    assert statements[0].startswith("DECLARE ")
+    assert statements[-1].startswith("CLOSE ")
+
+
+def test_read_frame_chunks_parameters(engine):
+    """
+    Validate `read_frame` renders and processes bind parameters, when using `chunksize`.
+    """
+    calls = []
+
+    def sql(stmt, parameters=None, bulk_parameters=None):
+        calls.append((stmt, parameters))
+        return {"cols": ["id"], "col_types": [9], "rows": [], "rowcount": 0}
+
+    table = sa.table("testdrive", sa.column("id", sa.Integer), sa.column("ts", sa.DateTime))
+    statement = sa.select(table.c.id).where(
+        sa.and_(table.c.id.in_([1, 2]), table.c.ts > dt.datetime(2009, 5, 13, 19, 0, 30))
+    )
+    with patch.object(Client, "sql", side_effect=sql), engine.connect() as conn:
+        frames = list(read_frame(conn, statement, chunksize=10))
+    assert len(frames) == 1
+    assert "POSTCOMPILE" not in calls[0][0]
+    if SA_VERSION >= SA_1_4:
+        assert calls[0][0].endswith("WHERE testdrive.id IN ($2, $3) AND testdrive.ts > $1")
+        assert calls[0][1] == ["2009-05-13T19:00:30.000000", 1, 2]
+    else:
+        assert calls[0][0].endswith("WHERE testdrive.id IN ($1, $2) AND testdrive.ts > $3")
+        assert calls[0][1] == [1, 2, "2009-05-13T19:00:30.000000"]
+
+
+@pytest.mark.skipif(
+    SA_VERSION < SA_2_0, reason="Feature not supported on SQLAlchemy 1.4 and earlier"
+)
+def test_insert_bulk_timestamps_epoch(engine_factory):
+    """
+    Validate `insert_bulk` sends timestamps as epoch milliseconds, with `bind_timestamps="epoch"`.
+    """
+    frame = pd.DataFrame(
+        {
+            "id": [1, 2],
+            "ts": pd.to_datetime(["2009-05-13 19:00:30.123", None]),
+        }
+    )
+    engine = engine_factory("crate://", bind_timestamps="epoch")
+    with patch.object(
+        Client, "sql", return_value={"cols": [], "rows": [], "rowcount": 0, "results": []}
+    ) as sql:
+        frame.to_sql("testdrive", engine, if_exists="append", index=False, method=insert_bulk)
+    bulk_parameters = sql.call_args[0][2]
+    assert [list(row) for row in bulk_parameters] == [[1, 1242241230123], [2, None]]
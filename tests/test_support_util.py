@@ -1,6 +1,11 @@
+from unittest.mock import MagicMock
+
 import pytest
+import sqlalchemy as sa
 
-from sqlalchemy_cratedb.support import quote_relation_name
+from sqlalchemy_cratedb.dialect import CrateDialect
+from sqlalchemy_cratedb.sa_version import SA_1_4, SA_VERSION
+from sqlalchemy_cratedb.support import iterate_keyset, quote_relation_name
 
 
 def test_quote_relation_name_once():
@@ -49,3 +54,109 @@ def test_quote_relation_name_with_invalid_fqn():
     """
     with pytest.raises(ValueError):
         quote_relation_name("too-many.my-db.my-schema.my-table")
+
+
+@pytest.fixture
+def items():
+    """
+    Provide a table with 25 items, using SQLite, because keyset pagination is dialect-agnostic.
+    """
+    engine = sa.create_engine("sqlite://")
+    metadata = sa.MetaData()
+    table = sa.Table(
+        "items",
+        metadata,
+        sa.Column("id", sa.Integer, primary_key=True),
+        sa.Column("kind", sa.String),
+        sa.Column("name", sa.String),
+    )
+    metadata.create_all(engine)
+    with engine.begin() as conn:
+        conn.execute(
+            table.insert(),
+            [{"id": i, "kind": "ab"[i % 2], "name": "item-%02d" % i} for i in range(25)],
+        )
+    return engine, table
+
+
+@pytest.mark.skipif(SA_VERSION < SA_1_4, reason="Keyset pagination requires SQLAlchemy 1.4")
+def test_iterate_keyset(items):
+    engine, table = items
+    statements = []
+    sa.event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    with engine.connect() as conn:
+        rows = list(iterate_keyset(conn, sa.select(table.c.name, table.c.id), table.c.id, 10))
+    assert [row.id for row in rows] == list(range(25))
+    assert list(rows[0]._mapping) == ["name", "id"]
+    assert len(statements) == 3
+    assert "WHERE items.id > ? ORDER BY items.id" in statements[2]
+
+
+@pytest.mark.skipif(SA_VERSION < SA_1_4, reason="Keyset pagination requires SQLAlchemy 1.4")
+def test_iterate_keyset_crate_sql(items):
+    _, table = items
+    conn = MagicMock()
+    conn.execute.return_value.all.return_value = [(i,) for i in range(10)]
+    iterator = iterate_keyset(conn, sa.select(table.c.id), table.c.id, 10)
+    for _ in range(11):
+        next(iterator)
+    sql = str(conn.execute.call_args.args[0].compile(dialect=CrateDialect()))
+    assert sql == (
+        "SELECT items.id \nFROM items \n"
+        "WHERE items.id > %(id_1)s ORDER BY items.id \n LIMIT %(param_1)s"
+    )
+
+
+@pytest.mark.skipif(SA_VERSION < SA_1_4, reason="Keyset pagination requires SQLAlchemy 1.4")
+def test_iterate_keyset_filtered_and_unselected_key(items):
+    engine, table = items
+    statement = sa.select(table.c.name).where(table.c.kind == "a")
+    with engine.connect() as conn:
+        rows = list(iterate_keyset(conn, statement, key=table.c.id, page_size=5))
+    assert [row.name for row in rows] == ["item-%02d" % i for i in range(0, 25, 2)]
+    assert all(row._fields == ("name",) for row in rows)
+
+
+@pytest.mark.skipif(SA_VERSION < SA_1_4, reason="Keyset pagination requires SQLAlchemy 1.4")
+def test_iterate_keyset_composite_key(items):
+    engine, table = items
+    with engine.connect() as conn:
+        rows = list(iterate_keyset(conn, sa.select(table), [table.c.kind, table.c.id], 4))
+    expected = sorted(range(25), key=lambda i: ("ab"[i % 2], i))
+    assert [row.id for row in rows] == expected
+
+
+@pytest.mark.skipif(SA_VERSION < SA_1_4, reason="Keyset pagination requires SQLAlchemy 1.4")
+def test_iterate_keyset_session_entities(items):
+    engine, table = items
+
+    Base = sa.orm.declarative_base()
+
+    class Item(Base):
+        __table__ = table
+
+    with sa.orm.Session(engine) as session:
+        statement = sa.select(Item).where(Item.kind == "b")
+        rows = list(iterate_keyset(session, statement, key=Item.id, page_size=5))
+    assert all(row._fields == ("Item",) for row in rows)
+    assert [row.Item.id for row in rows] == list(range(1, 25, 2))
+
+
+@pytest.mark.skipif(SA_VERSION < SA_1_4, reason="Keyset pagination requires SQLAlchemy 1.4")
+def test_iterate_keyset_session_columns(items):
+    engine, table = items
+    statements = []
+    sa.event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+    with sa.orm.Session(engine) as session:
+        statement = sa.select(table.c.id, table.c.name)
+        rows = list(iterate_keyset(session, statement, key=table.c.id, page_size=10))
+    assert all(row._fields == ("id", "name") for row in rows)
+    assert [row.id for row in rows] == list(range(25))
+    assert statements[0].startswith("SELECT items.id, items.name \nFROM items ORDER BY items.id")
+
+
+@pytest.mark.skipif(SA_VERSION < SA_1_4, reason="Keyset pagination requires SQLAlchemy 1.4")
+def test_iterate_keyset_invalid_page_size(items):
+    engine, table = items
+    with pytest.raises(ValueError):
+        next(iterate_keyset(None, sa.select(table), table.c.id, page_size=0))
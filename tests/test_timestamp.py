@@ -0,0 +1,215 @@
+import datetime as dt
+import logging
+import zoneinfo
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+import sqlalchemy as sa
+from sqlalchemy.exc import SQLAlchemyError
+
+from sqlalchemy_cratedb.dialect import Date, DateTime
+from sqlalchemy_cratedb.driver.client import Client
+from sqlalchemy_cratedb.type.timestamp import (
+    AwareTimestampDecoder,
+    DateDecoder,
+    TimestampDecoder,
+    to_epoch_ms,
+    to_epoch_ms_many,
+)
+
+
+def test_timestamp_from_integer():
+    decode = TimestampDecoder()
+    assert decode(1242241230123) == dt.datetime(2009, 5, 13, 19, 0, 30, 123000)
+    assert decode(0) == dt.datetime(1970, 1, 1)
+    assert decode(-1) == dt.datetime(1969, 12, 31, 23, 59, 59, 999000)
+    assert decode(1242241230123.0) == dt.datetime(2009, 5, 13, 19, 0, 30, 123000)
+    assert decode(None) is None
+
+
+def test_date_from_integer():
+    decode = DateDecoder()
+    assert decode(1242241230123) == dt.date(2009, 5, 13)
+    assert decode(0) == dt.date(1970, 1, 1)
+    assert decode(-1) == dt.date(1969, 12, 31)
+    assert decode(None) is None
+
+
+def test_timestamp_from_string_warns_once(caplog):
+    decode = TimestampDecoder()
+    with caplog.at_level(logging.WARNING):
+        assert decode("2013-07-16T00:00:00.000Z") == dt.datetime(2013, 7, 16)
+        assert decode("2013-07-17T12:00:00.000Z") == dt.datetime(2013, 7, 17, 12)
+        assert decode("2013-07-18") == dt.datetime(2013, 7, 18)
+    assert len(caplog.records) == 1
+    assert "%Y-%m-%dT%H:%M:%S.%fZ" in caplog.records[0].getMessage()
+
+
+def test_date_from_string():
+    decode = DateDecoder()
+    assert decode("2013-07-16") == dt.date(2013, 7, 16)
+    assert decode("2013-07-16T00:00:00.000Z") == dt.date(2013, 7, 16)
+    assert decode("") is None
+
+
+def test_timestamp_invalid():
+    decode = TimestampDecoder()
+    with pytest.raises(ValueError):
+        decode("yesterday")
+    with pytest.raises(TypeError):
+        decode(["2013-07-16"])
+
+
+@pytest.mark.parametrize("numpy", [True, False])
+def test_decode_many(numpy):
+    values = [1242241230123, None, 0, -86400001]
+    with patch.dict("sys.modules", {} if numpy else {"numpy": None}):
+        assert TimestampDecoder().decode_many(values) == [
+            dt.datetime(2009, 5, 13, 19, 0, 30, 123000),
+            None,
+            dt.datetime(1970, 1, 1),
+            dt.datetime(1969, 12, 30, 23, 59, 59, 999000),
+        ]
+        assert DateDecoder().decode_many(values) == [
+            dt.date(2009, 5, 13),
+            None,
+            dt.date(1970, 1, 1),
+            dt.date(1969, 12, 30),
+        ]
+
+
+def test_decode_many_mixed():
+    decode = TimestampDecoder()
+    assert decode.decode_many([0, "2013-07-16T00:00:00.000Z"]) == [
+        dt.datetime(1970, 1, 1),
+        dt.datetime(2013, 7, 16),
+    ]
+    with pytest.raises(OverflowError):
+        decode.decode_many([2**62])
+
+
+def test_result_processor(engine):
+    response = {
+        "cols": ["day", "ts"],
+        "col_types": [11, 11],
+        "rows": [[0, 0], [1242241230123, 1242241230123], [None, None]],
+        "rowcount": 3,
+    }
+    statement = sa.select(
+        sa.column("day", Date),
+        sa.column("ts", DateTime),
+    ).select_from(sa.table("testdrive"))
+    with patch.object(Client, "sql", return_value=response), engine.connect() as conn:
+        rows = conn.execute(statement).fetchall()
+    assert [tuple(row) for row in rows] == [
+        (dt.date(1970, 1, 1), dt.datetime(1970, 1, 1)),
+        (dt.date(2009, 5, 13), dt.datetime(2009, 5, 13, 19, 0, 30, 123000)),
+        (None, None),
+    ]
+
+
+def test_to_epoch_ms():
+    kyiv = zoneinfo.ZoneInfo("Europe/Kyiv")
+    assert to_epoch_ms(dt.datetime(2009, 5, 13, 19, 0, 30, 123456)) == 1242241230123
+    assert to_epoch_ms(dt.datetime(2009, 5, 13, 19, 0, 30, 123456, tzinfo=kyiv)) == 1242230430123
+    assert to_epoch_ms(dt.datetime(1969, 12, 31, 23, 59, 59, 999999)) == -1
+    assert to_epoch_ms(dt.date(2009, 5, 13)) == 1242172800000
+    assert to_epoch_ms(np.datetime64("2009-05-13T19:00:30.123456")) == 1242241230123
+    assert to_epoch_ms(np.datetime64("NaT")) is None
+    assert to_epoch_ms(1242241230123) == 1242241230123
+    assert to_epoch_ms(None) is None
+
+
+def test_to_epoch_ms_pandas():
+    pd = pytest.importorskip("pandas")
+    stamp = pd.Timestamp("2009-05-13 19:00:30.123456", tz="Europe/Kyiv")
+    assert to_epoch_ms(stamp) == 1242230430123
+    assert to_epoch_ms(pd.NaT) is None
+    assert to_epoch_ms_many(pd.Series([stamp, pd.NaT])) == [1242230430123, None]
+
+
+def test_to_epoch_ms_many():
+    values = np.array(["1970-01-01T00:00:01", "NaT"], dtype="datetime64[s]")
+    assert to_epoch_ms_many(values) == [1000, None]
+    assert to_epoch_ms_many([dt.date(1970, 1, 2), None]) == [86400000, None]
+
+
+def test_bind_timestamps_epoch(engine_factory):
+    engine = engine_factory("crate://", bind_timestamps="epoch")
+    table = sa.Table(
+        "testdrive",
+        sa.MetaData(),
+        sa.Column("day", sa.Date),
+        sa.Column("ts", sa.DateTime),
+    )
+    with (
+        patch.object(Client, "sql", return_value={"cols": [], "rows": [], "rowcount": 1}) as sql,
+        engine.connect() as conn,
+    ):
+        conn.execute(
+            table.insert(),
+            {"day": dt.date(2009, 5, 13), "ts": np.datetime64("2009-05-13T19:00:30.123")},
+        )
+    assert sql.call_args[0][1] == [1242172800000, 1242241230123]
+
+
+def test_bind_timestamps_invalid():
+    with pytest.raises(SQLAlchemyError) as ex:
+        sa.create_engine("crate://", bind_timestamps="unix")
+    assert ex.match("`bind_timestamps` parameter must be one of: iso, epoch")
+
+
+def test_aware_timestamp():
+    decode = AwareTimestampDecoder()
+    assert decode(1242241230123) == dt.datetime(
+        2009, 5, 13, 19, 0, 30, 123000, tzinfo=dt.timezone.utc
+    )
+    assert decode("2013-07-16T00:00:00.000Z") == dt.datetime(2013, 7, 16, tzinfo=dt.timezone.utc)
+    assert decode(None) is None
+
+
+@pytest.mark.parametrize(
+    "zone",
+    [dt.timezone(dt.timedelta(hours=-5)), zoneinfo.ZoneInfo("Europe/Kyiv")],
+)
+def test_aware_timestamp_zone(zone):
+    decode = AwareTimestampDecoder(zone)
+    # Before and after the change to daylight saving time in Kyiv.
+    for value in [1238288399999, 1238288400000, -1]:
+        expected = (
+            dt.datetime(1970, 1, 1, tzinfo=dt.timezone.utc) + dt.timedelta(milliseconds=value)
+        ).astimezone(zone)
+        result = decode(value)
+        assert result == expected
+        assert result.tzinfo is zone
+        assert result.utcoffset() == expected.utcoffset()
+    assert decode.decode_many([0, None]) == [dt.datetime(1970, 1, 1, tzinfo=dt.timezone.utc), None]
+
+
+RESPONSE_TZ = {
+    "cols": ["ts", "ts_tz"],
+    "col_types": [15, 11],
+    "rows": [[1242241230123, 1242241230123]],
+    "rowcount": 1,
+}
+
+
+def test_result_timezone(engine_factory):
+    engine = engine_factory("crate://", result_timezone="Europe/Kyiv")
+    statement = sa.select(
+        sa.column("ts", sa.DateTime),
+        sa.column("ts_tz", sa.DateTime(timezone=True)),
+    ).select_from(sa.table("testdrive"))
+    with patch.object(Client, "sql", return_value=RESPONSE_TZ), engine.connect() as conn:
+        ts, ts_tz = conn.execute(statement).fetchone()
+    assert ts == dt.datetime(2009, 5, 13, 19, 0, 30, 123000)
+    assert ts_tz == dt.datetime(
+        2009, 5, 13, 22, 0, 30, 123000, tzinfo=zoneinfo.ZoneInfo("Europe/Kyiv")
+    )
+
+
+def test_result_timezone_invalid():
+    with pytest.raises(SQLAlchemyError) as ex:
+        sa.create_engine("crate://", result_timezone="Mars/Olympus_Mons")
+    assert ex.match("`result_timezone` parameter must be a time zone: Mars/Olympus_Mons")
@@ -0,0 +1,83 @@
+from unittest.mock import MagicMock, patch
+
+import sqlalchemy as sa
+from sqlalchemy.orm import Session
+
+from sqlalchemy_cratedb import LazyObjectArray, ObjectArray, ReadOnlyObjectArray
+from sqlalchemy_cratedb.driver.client import Client
+from sqlalchemy_cratedb.type.array import LazyMutableList, MutableList
+
+try:
+    from sqlalchemy.orm import declarative_base
+except ImportError:
+    from sqlalchemy.ext.declarative import declarative_base
+
+
+def test_lazy_mutable_list_wraps_without_copying():
+    value = [{"x": 1}]
+    data = LazyMutableList.coerce("data", value)
+    assert data.tolist() is value
+    assert data == [{"x": 1}]
+    assert data == LazyMutableList([{"x": 1}])
+    assert {"x": 1} in data
+    assert len(data) == 1
+    assert LazyMutableList.coerce("data", None) is None
+    assert LazyMutableList.coerce("data", data) is data
+    assert LazyMutableList.coerce("data", 1) == [1]
+
+
+def test_lazy_mutable_list_tracks_changes():
+    value = [3, 1]
+    data = LazyMutableList(value)
+    data.changed = MagicMock()
+
+    data.append(2)
+    data.extend([5, 4])
+    data.insert(0, 0)
+    data[0] = 6
+    del data[0]
+    assert data.pop() == 4
+    data.remove(5)
+    data.sort()
+    data.reverse()
+    data += [0]
+    assert value == [3, 2, 1, 0]
+    assert data.changed.call_count == 10
+
+    data.clear()
+    assert value == []
+    assert data.changed.call_count == 11
+
+
+def test_object_array_types(engine):
+    Base = declarative_base()
+
+    class Character(Base):
+        __tablename__ = "characters"
+        name = sa.Column(sa.String, primary_key=True)
+        tracked = sa.Column(ObjectArray)
+        lazy = sa.Column(LazyObjectArray)
+        details = sa.Column(ReadOnlyObjectArray)
+
+    response = {
+        "cols": ["name", "tracked", "lazy", "details"],
+        "col_types": [4, [100, 12], [100, 12], [100, 12]],
+        "rows": [["Trillian", [{"x": 1}], [{"x": 1}], [{"x": 1}]]],
+        "rowcount": 1,
+    }
+    session = Session(bind=engine)
+    with patch.object(Client, "sql", return_value=response):
+        character = session.query(Character).one()
+    assert isinstance(character.tracked, MutableList)
+    assert isinstance(character.lazy, LazyMutableList)
+    assert type(character.details) is list
+
+    character.details.append({"x": 2})
+    assert not session.dirty
+    character.lazy.append({"x": 2})
+    assert session.dirty
+
+    update = {"cols": [], "rows": [], "rowcount": 1}
+    with patch.object(Client, "sql", return_value=update) as sql:
+        session.commit()
+    assert sql.call_args[0][1] == [[{"x": 1}, {"x": 2}], "Trillian"]
@@ -0,0 +1,179 @@
+import struct
+from unittest.mock import patch
+
+import geojson
+import pytest
+import sqlalchemy as sa
+
+from sqlalchemy_cratedb import Geopoint, Geoshape
+from sqlalchemy_cratedb.driver.client import Client
+from sqlalchemy_cratedb.driver.codec import get_codec
+from sqlalchemy_cratedb.sa_version import SA_2_0, SA_VERSION
+from sqlalchemy_cratedb.type import LazyGeoShape
+
+POLYGON = {
+    "type": "Polygon",
+    "coordinates": [[[139.806, 35.515], [139.919, 35.703], [139.768, 35.817], [139.806, 35.515]]],
+}
+
+
+def fetch(engine, type_):
+    response = {"cols": ["area"], "col_types": [14], "rows": [[POLYGON], [None]], "rowcount": 2}
+    statement = sa.select(sa.column("area", type_)).select_from(sa.table("cities"))
+    with patch.object(Client, "sql", return_value=response), engine.connect() as conn:
+        rows = [row[0] for row in conn.execute(statement)]
+    return rows
+
+
+def test_lazy_geoshape():
+    shape = LazyGeoShape(POLYGON)
+    assert shape.type == "Polygon"
+    assert shape["coordinates"] is POLYGON["coordinates"]
+    assert shape.__geo_interface__ is POLYGON
+    assert shape.bounds == (139.768, 35.515, 139.919, 35.817)
+    assert shape._geojson is None
+    assert shape.is_valid
+    assert isinstance(shape.to_geojson(), geojson.Polygon)
+    assert shape.to_geojson() is shape.to_geojson()
+    assert shape == geojson.Polygon(POLYGON["coordinates"])
+    assert repr(shape) == repr(geojson.Polygon(POLYGON["coordinates"]))
+
+
+def test_lazy_geoshape_bounds():
+    collection = {
+        "type": "GeometryCollection",
+        "geometries": [
+            {"type": "Point", "coordinates": [1.0, 2.0]},
+            {"type": "LineString", "coordinates": [[-3.0, 4.0], [5.0, -6.0]]},
+        ],
+    }
+    assert LazyGeoShape(collection).bounds == (-3.0, -6.0, 5.0, 4.0)
+    assert LazyGeoShape({"type": "MultiPoint", "coordinates": []}).bounds is None
+
+
+def test_lazy_geoshape_shapely():
+    pytest.importorskip("shapely")
+    assert LazyGeoShape(POLYGON).to_shapely().bounds == (139.768, 35.515, 139.919, 35.817)
+
+
+@pytest.mark.parametrize(
+    "result_type, expected_type",
+    [("lazy", LazyGeoShape), ("geojson", geojson.Polygon), ("raw", dict)],
+)
+def test_geoshape_result_type(engine, result_type, expected_type):
+    shape, empty = fetch(engine, Geoshape(result_type=result_type))
+    assert type(shape) is expected_type
+    assert shape == POLYGON
+    assert empty is None
+
+
+def test_geoshape_result_type_invalid():
+    with pytest.raises(ValueError) as ex:
+        Geoshape(result_type="wkt")
+    assert ex.match("`result_type` parameter must be one of: lazy, geojson, raw")
+
+
+def test_geoshape_bind_lazy():
+    process = Geoshape().bind_processor(None)
+    assert process(LazyGeoShape(POLYGON)) is POLYGON
+    assert process(POLYGON) is POLYGON
+
+
+def test_geopoint_bind():
+    process = Geopoint().bind_processor(None)
+    assert process(geojson.Point((9.74, 47.41))) == [9.74, 47.41]
+    assert process(LazyGeoShape({"type": "Point", "coordinates": [9.74, 47.41]})) == [9.74, 47.41]
+    assert process("POINT (9.74 47.41)") == "POINT (9.74 47.41)"
+    assert process((9.74, 47.41)) == (9.74, 47.41)
+    assert process(None) is None
+
+
+def test_geopoint_bind_array(engine):
+    np = pytest.importorskip("numpy")
+    positions = np.array([[9.74, 47.41], [-122.42, 37.77]])
+    table = sa.Table("devices", sa.MetaData(), sa.Column("position", Geopoint))
+    response = {"cols": [], "rows": [], "results": [{"rowcount": 1}] * 2}
+    with patch.object(Client, "sql", return_value=response) as sql, engine.connect() as conn:
+        conn.execute(table.insert(), [{"position": row} for row in positions])
+    if SA_VERSION >= SA_2_0:
+        # SQLAlchemy 2.0 renders one multi-row INSERT statement, using "insertmanyvalues".
+        parameters = sql.call_args[0][1]
+    else:
+        parameters = [row[0] for row in sql.call_args[0][2]]
+    assert [parameter.tolist() for parameter in parameters] == positions.tolist()
+    assert get_codec().dumps(parameters) == b"[[9.74,47.41],[-122.42,37.77]]"
+
+
+@pytest.mark.parametrize(
+    "result_type, expected", [("tuple", (9.74, 47.41)), ("raw", [9.74, 47.41])]
+)
+def test_geopoint_result_type(engine, result_type, expected):
+    response = {"cols": ["position"], "col_types": [13], "rows": [[[9.74, 47.41]], [None]]}
+    statement = sa.select(sa.column("position", Geopoint(result_type=result_type))).select_from(
+        sa.table("devices")
+    )
+    with patch.object(Client, "sql", return_value=response), engine.connect() as conn:
+        rows = [row[0] for row in conn.execute(statement)]
+    assert rows == [expected, None]
+
+
+def test_geoshape_bind():
+    process = Geoshape().bind_processor(None)
+    polygon = geojson.Polygon(POLYGON["coordinates"])
+    assert process(polygon) == POLYGON
+    assert process("POLYGON ((0 0, 1 0, 1 1, 0 0))") == "POLYGON ((0 0, 1 0, 1 1, 0 0))"
+    assert process(None) is None
+
+
+def test_geoshape_bind_wkb():
+    process = Geoshape().bind_processor(None)
+    point = struct.pack("<BIdd", 1, 1, 9.74, 47.41)
+    assert process(point) == {"type": "Point", "coordinates": [9.74, 47.41]}
+    # Big-endian `MultiPoint`.
+    multipoint = struct.pack(">BII", 0, 4, 2) + struct.pack(">BIdd", 0, 1, 1, 2) * 2
+    assert process(multipoint) == {"type": "MultiPoint", "coordinates": [[1, 2], [1, 2]]}
+    # Polygon with one ring.
+    polygon = struct.pack("<BIII", 1, 3, 1, 4) + struct.pack("<8d", 0, 0, 1, 0, 1, 1, 0, 0)
+    assert process(memoryview(polygon)) == {
+        "type": "Polygon",
+        "coordinates": [[[0, 0], [1, 0], [1, 1], [0, 0]]],
+    }
+    # EWKB point with Z coordinate and SRID, within a collection.
+    ewkb = struct.pack("<BIIddd", 1, 0xA0000001, 4326, 1, 2, 3)
+    collection = struct.pack("<BII", 1, 7, 1) + ewkb
+    assert process(collection) == {
+        "type": "GeometryCollection",
+        "geometries": [{"type": "Point", "coordinates": [1, 2, 3]}],
+    }
+    with pytest.raises(ValueError):
+        process(struct.pack("<BIddd", 1, 2001, 1, 2, 3))
+
+
+def test_geoshape_bind_precision():
+    process = Geoshape(precision=2).bind_processor(None)
+    polygon = {
+        "type": "Polygon",
+        "coordinates": [[[0.0012, 0.0], [1.0001, 0.0], [0.9999, 0.0001], [1.0, 1.0], [0.0, 0.0]]],
+    }
+    assert process(polygon) == {
+        "type": "Polygon",
+        "coordinates": [[[0.0, 0.0], [1.0, 0.0], [1.0, 1.0], [0.0, 0.0]]],
+    }
+    # Rings which would degenerate keep their duplicates.
+    ring = [[0.0, 0.0], [0.0001, 0.0], [0.0, 0.0001], [0.0, 0.0]]
+    assert process({"type": "Polygon", "coordinates": [ring]})["coordinates"] == [[[0.0, 0.0]] * 4]
+    assert process({"type": "Point", "coordinates": [9.741234, 47.414321]}) == {
+        "type": "Point",
+        "coordinates": [9.74, 47.41],
+    }
+
+
+def test_geoshape_bind_shapely():
+    shapely = pytest.importorskip("shapely")
+    polygon = shapely.geometry.shape(POLYGON)
+    assert Geoshape().bind_processor(None)(polygon)["type"] == "Polygon"
+    process = Geoshape(simplify=0.5, precision=1).bind_processor(None)
+    assert process("LINESTRING (0 0, 1 0.01, 2 0)") == {
+        "type": "LineString",
+        "coordinates": [[0.0, 0.0], [2.0, 0.0]],
+    }
@@ -0,0 +1,74 @@
+from unittest.mock import MagicMock, patch
+
+import sqlalchemy as sa
+from sqlalchemy.orm import Session
+
+from sqlalchemy_cratedb import ObjectType, ReadOnlyObjectType
+from sqlalchemy_cratedb.driver.client import Client
+from sqlalchemy_cratedb.type.object import MutableDict
+
+try:
+    from sqlalchemy.orm import declarative_base
+except ImportError:
+    from sqlalchemy.ext.declarative import declarative_base
+
+
+def test_mutable_dict_wraps_lazily():
+    value = {"nested": {"x": 1, "y": {"z": 2}}}
+    data = MutableDict(value)
+    assert type(dict.__getitem__(data, "nested")) is dict
+    assert value == {"nested": {"x": 1, "y": {"z": 2}}}
+    assert type(value["nested"]) is dict
+
+    nested = data["nested"]
+    assert isinstance(nested, MutableDict)
+    assert data["nested"] is nested
+    assert type(dict.__getitem__(nested, "y")) is dict
+    assert not hasattr(nested, "_changed_keys")
+
+
+def test_mutable_dict_tracks_lazily_wrapped_values():
+    data = MutableDict({"a": {"x": 1}, "b": {"y": {"z": 2}}, "c": {"w": 3}, "d": 4})
+    data.changed = MagicMock()
+
+    data.get("a")["x"] = 2
+    assert data._changed_keys == {"a"}
+
+    for key, value in data.items():
+        if key == "b":
+            value["y"]["z"] = 3
+    assert data._changed_keys == {"a", "b"}
+
+    for value in data.values():
+        if isinstance(value, dict) and "w" in value:
+            del value["w"]
+    assert data._changed_keys == {"a", "b", "c"}
+    assert data == {"a": {"x": 2}, "b": {"y": {"z": 3}}, "c": {}, "d": 4}
+    assert data.changed.call_count == 3
+
+    data.setdefault("e", {})["v"] = 5
+    assert data._changed_keys == {"a", "b", "c", "e"}
+    assert data.get("missing") is None
+
+
+def test_read_only_object_type(engine):
+    Base = declarative_base()
+
+    class Character(Base):
+        __tablename__ = "characters"
+        name = sa.Column(sa.String, primary_key=True)
+        data = sa.Column(ObjectType)
+        details = sa.Column(ReadOnlyObjectType)
+
+    response = {
+        "cols": ["name", "data", "details"],
+        "col_types": [4, 12, 12],
+        "rows": [["Trillian", {"nested": {"x": 1}}, {"nested": {"x": 1}}]],
+        "rowcount": 1,
+    }
+    session = Session(bind=engine)
+    with patch.object(Client, "sql", return_value=response):
+        character = session.query(Character).one()
+    assert isinstance(character.data, MutableDict)
+    assert type(character.details) is dict
+    assert type(character.details["nested"]) is dict
@@ -44,3 +44,12 @@ class ParametrizedTestCase(unittest.TestCase):
         for name in testnames:
             suite.addTest(testcase_klass(name, param=param))
         return suite
+
+
+def untag(statement: str) -> str:
+    """
+    Remove the job tag, prefixed to statements in order to kill them on cancellation.
+    """
+    if statement.startswith("/* job "):
+        return statement.split("*/", 1)[1].lstrip()
+    return statement
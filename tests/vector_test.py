@@ -161,7 +161,8 @@ def test_to_db_success():
     assert to_db(42) == 42
     assert to_db(42.42) == 42.42
     assert to_db([42.42, 43.43]) == [42.42, 43.43]
-    assert to_db(np.array([42.42, 43.43])) == [42.42, 43.43]
+    assert np.array_equal(to_db(np.array([42.42, 43.43])), np.array([42.42, 43.43]))
+    assert isinstance(to_db(np.array([42.42, 43.43])), np.ndarray)
     assert to_db("42.42") == "42.42"
     assert to_db("foo") == "foo"
     assert to_db(["foo"]) == ["foo"]